@@ -0,0 +1,227 @@
+"""Split OpenSCAD assemblies into per-part sources."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+from pathlib import Path
+import re
+
+from scad_mcp.models import AssemblyPart
+
+LOGGER = logging.getLogger("scad_mcp.assembly")
+
+# "// @part name" on the line before a top-level statement names it as a part.
+PART_TAG = re.compile(r"//\s*@part\s+([A-Za-z0-9_.-]+)")
+IDENTIFIER = re.compile(r"\$?[A-Za-z_][A-Za-z0-9_]*")
+CALL_OPEN = re.compile(r"\s*\(")
+DIRECTIVE = re.compile(r"(include|use)\s*<([^>]*)>")
+ASSIGNMENT = re.compile(r"\$?[A-Za-z_][A-Za-z0-9_]*\s*=(?!=)")
+FILE_ARGUMENT = re.compile(r"\b(import|surface)(\s*\(\s*(?:file\s*=\s*)?)\"([^\"]*)\"")
+DEFINITIONS = {"module", "function"}
+# Control keywords that look like calls but never name the instantiated object.
+KEYWORDS = {"if", "else", "for", "intersection_for", "let", "assert", "echo", "each"}
+
+
+@dataclass(frozen=True)
+class _Statement:
+    """Span of one top-level statement."""
+    start: int
+    end: int
+    kind: str
+    tag: str | None
+    callee: str | None
+
+
+def _classify(text: str) -> str:
+    """Return the kind of a top-level statement.
+
+    Args:
+        text: Statement source.
+
+    Returns:
+        One of "definition", "directive", "assignment", "continuation", "diagnostic",
+        "disabled", "object", or "empty".
+    """
+    word = IDENTIFIER.match(text)
+    if text.startswith(";"):
+        return "empty"
+    if text.startswith("*"):
+        return "disabled"
+    if word and word.group() in DEFINITIONS:
+        return "definition"
+    if word and word.group() == "else":
+        return "continuation"
+    if word and word.group() in {"echo", "assert"}:
+        return "diagnostic"
+    if DIRECTIVE.match(text):
+        return "directive"
+    if ASSIGNMENT.match(text):
+        return "assignment"
+    return "object"
+
+
+def scan_statements(source: str) -> list[_Statement]:
+    """Find the top-level statements of a SCAD source.
+
+    Comments and strings are skipped; a statement ends at a semicolon or at
+    the closing brace of a block at nesting depth zero.
+
+    Args:
+        source: SCAD source code.
+
+    Returns:
+        Statements in source order. "else" branches are merged into their "if".
+    """
+    statements: list[_Statement] = []
+    length = len(source)
+    depth = 0
+    start: int | None = None
+    tag: str | None = None
+    pending_tag: str | None = None
+    callee: str | None = None
+    index = 0
+
+    def finish(end: int) -> None:
+        nonlocal start, callee
+        assert start is not None
+        kind = _classify(source[start:end])
+        if kind == "continuation" and statements:
+            previous = statements.pop()
+            statements.append(_Statement(previous.start, end, previous.kind, previous.tag, previous.callee))
+        else:
+            statements.append(_Statement(start, end, kind, tag, callee))
+        start = None
+        callee = None
+
+    while index < length:
+        char = source[index]
+        if source.startswith("//", index):
+            end = source.find("\n", index)
+            end = length if end < 0 else end
+            match = PART_TAG.match(source, index)
+            if match and start is None:
+                pending_tag = match.group(1)
+            index = end
+            continue
+        if source.startswith("/*", index):
+            end = source.find("*/", index + 2)
+            index = length if end < 0 else end + 2
+            continue
+        if char.isspace():
+            index += 1
+            continue
+        if start is None:
+            start = index
+            tag, pending_tag = pending_tag, None
+            directive = DIRECTIVE.match(source, index)
+            if directive:
+                index = directive.end()
+                finish(index)
+                continue
+        if char == '"':
+            index += 1
+            while index < length and source[index] != '"':
+                index += 2 if source[index] == "\\" else 1
+            index += 1
+            continue
+        if depth == 0 and (char.isalpha() or char in "_$"):
+            match = IDENTIFIER.match(source, index)
+            assert match is not None
+            index = match.end()
+            if CALL_OPEN.match(source, index) and match.group() not in KEYWORDS:
+                callee = match.group()
+            continue
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth = max(depth - 1, 0)
+            if char == "}" and depth == 0:
+                finish(index + 1)
+        elif char == ";" and depth == 0:
+            finish(index + 1)
+        index += 1
+
+    if start is not None:
+        finish(length)
+    return statements
+
+
+def _absolute_paths(source: str, base_dir: Path) -> str:
+    """Point relative include/use and import/surface paths at base_dir.
+
+    Part sources are compiled from another directory, so relative references
+    that exist next to the original file are made absolute. Other paths are
+    left for OpenSCAD's library search.
+
+    Args:
+        source: SCAD source code.
+        base_dir: Directory of the original file.
+
+    Returns:
+        Source with relative references resolved.
+    """
+    def directive(match: re.Match[str]) -> str:
+        target = base_dir / match.group(2)
+        if Path(match.group(2)).is_absolute() or not target.exists():
+            return match.group(0)
+        return f"{match.group(1)} <{target.resolve().as_posix()}>"
+
+    def file_argument(match: re.Match[str]) -> str:
+        target = base_dir / match.group(3)
+        if Path(match.group(3)).is_absolute() or not target.exists():
+            return match.group(0)
+        return f'{match.group(1)}{match.group(2)}"{target.resolve().as_posix()}"'
+
+    return FILE_ARGUMENT.sub(file_argument, DIRECTIVE.sub(directive, source))
+
+
+def split_assembly(source: str, base_dir: Path | None = None) -> list[AssemblyPart]:
+    """Split an assembly into one source per top-level object.
+
+    Every part keeps all module and function definitions, assignments and
+    include/use directives, but only its own top-level object. When any object
+    is tagged with "// @part name", only tagged objects become parts.
+
+    Args:
+        source: SCAD source code.
+        base_dir: Directory of the original file, used to resolve relative paths.
+
+    Returns:
+        Parts in source order.
+
+    Raises:
+        ValueError: When the source has no top-level objects.
+    """
+    statements = scan_statements(source)
+    objects = [statement for statement in statements if statement.kind == "object"]
+    if any(statement.tag for statement in objects):
+        selected = [statement for statement in objects if statement.tag]
+    else:
+        selected = objects
+    if not selected:
+        raise ValueError("No top-level objects found to split.")
+
+    parts = []
+    used: set[str] = set()
+    for position, part in enumerate(selected):
+        name = part.tag or f"{position:02d}_{part.callee or 'object'}"
+        if name in used:
+            raise ValueError(f"Duplicate part name: {name}")
+        used.add(name)
+        pieces = []
+        cursor = 0
+        for statement in objects:
+            if statement is part:
+                continue
+            # Blank other objects but keep line numbers for OpenSCAD messages.
+            pieces.append(source[cursor:statement.start])
+            pieces.append("\n" * source.count("\n", statement.start, statement.end))
+            cursor = statement.end
+        pieces.append(source[cursor:])
+        text = "".join(pieces)
+        if base_dir is not None:
+            text = _absolute_paths(text, base_dir)
+        parts.append(AssemblyPart(name=name, source=text))
+    LOGGER.debug("Split assembly into %d parts", len(parts))
+    return parts
@@ -0,0 +1,83 @@
+"""In-memory result cache for OpenSCAD artifacts."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import json
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """Cached artifact and the command that produced it."""
+    path: Path
+    command: list[str]
+
+
+class ResultCache:
+    """Least-recently-used index of artifacts keyed by request digest."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+
+    @staticmethod
+    def key(*parts: object) -> str:
+        """Build a cache key from request parts.
+
+        Args:
+            parts: JSON-serializable values describing the request.
+
+        Returns:
+            Hex digest identifying the request.
+        """
+        payload = json.dumps(parts, default=str, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Return the entry for key if its artifact still exists.
+
+        Args:
+            key: Cache key from ResultCache.key.
+
+        Returns:
+            Cached entry or None on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not entry.path.exists():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        """Record an artifact, evicting the oldest entries when full.
+
+        Entries whose artifact path was rewritten by a different command are
+        dropped, since the file on disk no longer holds their result.
+
+        Args:
+            key: Cache key from ResultCache.key.
+            entry: Artifact to record.
+        """
+        stale = [
+            other for other, cached in self._entries.items()
+            if cached.path == entry.path and cached.command != entry.command
+        ]
+        for other in stale:
+            del self._entries[other]
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+
+RESULT_CACHE = ResultCache()
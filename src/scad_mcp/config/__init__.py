@@ -1,6 +1,6 @@
 """Configuration utilities and models."""
 
 from scad_mcp.config.loader import load_config
-from scad_mcp.config.models import AppConfig, LoggingConfig, OpenScadConfig, RenderConfig, ServerConfig
+from scad_mcp.config.models import AppConfig, CacheConfig, ExecutionConfig, HistoryConfig, LibrariesConfig, LoggingConfig, OpenScadConfig, RenderConfig, ServerConfig, WorkspaceConfig
 
-__all__ = ["load_config", "AppConfig", "LoggingConfig", "OpenScadConfig", "RenderConfig", "ServerConfig"]
+__all__ = ["load_config", "AppConfig", "CacheConfig", "ExecutionConfig", "HistoryConfig", "LibrariesConfig", "LoggingConfig", "OpenScadConfig", "RenderConfig", "ServerConfig", "WorkspaceConfig"]
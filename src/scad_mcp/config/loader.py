@@ -2,23 +2,248 @@
 
 from __future__ import annotations
 
+from dataclasses import fields, replace
 from pathlib import Path
+import logging
 import os
+from typing import Any, Mapping
 
-from scad_mcp.config.models import AppConfig, OpenScadConfig
+from scad_mcp.config.models import AppConfig
+from scad_mcp.validation import (
+    validate_backend,
+    validate_cpu_affinity,
+    validate_fov,
+    validate_framing,
+    validate_image_format,
+    validate_ionice,
+    validate_projection,
+    validate_quality,
+)
 
+ENV_PREFIX = "SCAD_MCP_"
+CONFIG_ENV = "SCAD_MCP_CONFIG"
+DEFAULT_CONFIG_FILE = Path("scad-mcp.toml")
+LOG_LEVELS = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
 
-def load_config(openscad_path: str | None = None) -> AppConfig:
+LOGGER = logging.getLogger("scad_mcp.config.loader")
+
+
+def _coerce(value: Any, hint: str, key: str) -> Any:
+    """Convert a raw setting to the type declared on the config model.
+
+    Args:
+        value: Raw value from TOML, the environment, or the command line.
+        hint: Declared field type, e.g. "int", "Path | None" or "tuple[Path, ...]".
+        key: Dotted setting name used in error messages.
+
+    Returns:
+        Value converted to the declared type.
+
+    Raises:
+        ValueError: When the value cannot be converted.
+    """
+    optional = hint.endswith("| None")
+    base = hint.removesuffix("| None").strip()
+    if optional and (value is None or (isinstance(value, str) and value.strip().lower() in {"", "none"})):
+        return None
+    try:
+        if base == "bool":
+            if isinstance(value, str):
+                lowered = value.strip().lower()
+                if lowered not in {"1", "0", "true", "false", "yes", "no", "on", "off"}:
+                    raise ValueError(value)
+                return lowered in {"1", "true", "yes", "on"}
+            return bool(value)
+        if base == "int":
+            if isinstance(value, float) and not value.is_integer():
+                raise ValueError(value)
+            return int(value)
+        if base == "float":
+            return float(value)
+        if base == "Path":
+            return Path(value).expanduser()
+        if base == "tuple[Path, ...]":
+            # Lists come from TOML; strings are separated like OPENSCADPATH.
+            items = value.split(os.pathsep) if isinstance(value, str) else list(value)
+            return tuple(Path(item).expanduser() for item in items if str(item).strip())
+        return str(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid value for {key}: {value!r} (expected {hint}).") from exc
+
+
+def _apply(config: AppConfig, settings: Mapping[str, Mapping[str, Any]], origin: str) -> AppConfig:
+    """Overlay section/field settings onto a configuration.
+
+    Args:
+        config: Configuration to update.
+        settings: Mapping of section name to field values.
+        origin: Description of the settings source for error messages.
+
+    Returns:
+        Updated configuration.
+
+    Raises:
+        ValueError: When a section or field is unknown or a value is invalid.
+    """
+    sections = {item.name for item in fields(AppConfig)}
+    for section, values in settings.items():
+        if section not in sections:
+            raise ValueError(f"Unknown config section {section!r} in {origin}.")
+        if not isinstance(values, Mapping):
+            raise ValueError(f"Config section {section!r} in {origin} must be a table.")
+        current = getattr(config, section)
+        # Models use postponed annotations, so field types are their source text.
+        declared = {item.name: str(item.type) for item in fields(current)}
+        updates = {}
+        for name, value in values.items():
+            if name not in declared:
+                raise ValueError(f"Unknown config setting {section}.{name} in {origin}.")
+            updates[name] = _coerce(value, declared[name], f"{section}.{name}")
+        config = replace(config, **{section: replace(current, **updates)})
+    return config
+
+
+def _env_settings(environ: Mapping[str, str]) -> dict[str, dict[str, str]]:
+    """Collect SCAD_MCP_<SECTION>_<FIELD> environment overrides.
+
+    The environment is shared with other tools, so unknown names are logged
+    and skipped rather than rejected like unknown settings in a config file.
+
+    Args:
+        environ: Environment mapping.
+
+    Returns:
+        Mapping of section name to field values.
+    """
+    defaults = AppConfig()
+    known = {item.name: {entry.name for entry in fields(getattr(defaults, item.name))} for item in fields(defaults)}
+    settings: dict[str, dict[str, str]] = {}
+    for name, value in environ.items():
+        if not name.startswith(ENV_PREFIX) or name == CONFIG_ENV:
+            continue
+        section, _, field_name = name[len(ENV_PREFIX):].lower().partition("_")
+        if field_name not in known.get(section, ()):
+            LOGGER.warning("Ignoring unknown config environment variable %s.", name)
+            continue
+        settings.setdefault(section, {})[field_name] = value
+    return settings
+
+
+def _cli_settings(overrides: list[str]) -> dict[str, dict[str, str]]:
+    """Parse section.field=value overrides from the command line.
+
+    Args:
+        overrides: Override strings.
+
+    Returns:
+        Mapping of section name to field values.
+
+    Raises:
+        ValueError: When an override is malformed.
+    """
+    settings: dict[str, dict[str, str]] = {}
+    for override in overrides:
+        key, sep, value = override.partition("=")
+        section, dot, field_name = key.strip().partition(".")
+        if not sep or not dot:
+            raise ValueError(f"Override must look like section.field=value: {override!r}.")
+        settings.setdefault(section, {})[field_name] = value.strip()
+    return settings
+
+
+def validate_config(config: AppConfig) -> None:
+    """Validate all configuration values.
+
+    Args:
+        config: Configuration to validate.
+
+    Raises:
+        ValueError: When any value is out of range.
+    """
+    if config.logging.level.upper() not in LOG_LEVELS:
+        raise ValueError(f"logging.level must be one of {', '.join(sorted(LOG_LEVELS))}.")
+    validate_backend(config.openscad.backend)
+    render = config.render
+    if not (1 <= render.img_width <= 16384 and 1 <= render.img_height <= 16384):
+        raise ValueError("render.img_width and render.img_height must be between 1 and 16384.")
+    validate_projection(render.projection)
+    validate_fov(render.fov)
+    validate_quality(render.quality)
+    validate_framing(render.framing)
+    validate_image_format(render.image_format)
+    if not 0 <= render.png_compress_level <= 9:
+        raise ValueError("render.png_compress_level must be between 0 and 9.")
+    if not 1 <= render.webp_quality <= 100:
+        raise ValueError("render.webp_quality must be between 1 and 100.")
+    execution = config.execution
+    if execution.max_workers < 1:
+        raise ValueError("execution.max_workers must be at least 1.")
+    if execution.timeout is not None and execution.timeout <= 0:
+        raise ValueError("execution.timeout must be positive.")
+    if execution.max_queue_depth is not None and execution.max_queue_depth < 1:
+        raise ValueError("execution.max_queue_depth must be at least 1.")
+    if execution.max_wait is not None and execution.max_wait <= 0:
+        raise ValueError("execution.max_wait must be positive.")
+    if execution.output_head_lines < 0 or execution.output_tail_lines < 0:
+        raise ValueError("execution.output_head_lines and execution.output_tail_lines must not be negative.")
+    validate_cpu_affinity(execution.cpu_affinity)
+    if execution.cpus_per_worker < 1:
+        raise ValueError("execution.cpus_per_worker must be at least 1.")
+    if not (-20 <= execution.interactive_nice <= 19 and -20 <= execution.batch_nice <= 19):
+        raise ValueError("execution.interactive_nice and execution.batch_nice must be between -20 and 19.")
+    validate_ionice(execution.interactive_ionice)
+    validate_ionice(execution.batch_ionice)
+    if config.cache.max_entries < 1:
+        raise ValueError("cache.max_entries must be at least 1.")
+    scratch_dir = config.workspace.scratch_dir
+    if scratch_dir is not None and scratch_dir.exists() and not scratch_dir.is_dir():
+        raise ValueError("workspace.scratch_dir must be a directory.")
+
+
+def load_config(
+    openscad_path: str | None = None,
+    config_file: str | None = None,
+    overrides: list[str] | None = None,
+    environ: Mapping[str, str] | None = None,
+) -> AppConfig:
     """Load application configuration.
 
+    Layers are applied in order: defaults, TOML config file, SCAD_MCP_*
+    environment variables, then command-line arguments. The config file is
+    config_file, else $SCAD_MCP_CONFIG, else ./scad-mcp.toml when present.
+
     Args:
         openscad_path: Optional path to OpenSCAD executable from CLI args.
+        config_file: Optional path to a TOML config file from CLI args.
+        overrides: Optional section.field=value overrides from CLI args.
+        environ: Environment mapping, defaulting to os.environ.
 
     Returns:
         Parsed application configuration.
+
+    Raises:
+        FileNotFoundError: When an explicitly requested config file is missing.
+        ValueError: When a setting is unknown or invalid.
     """
-    openscad_cfg = OpenScadConfig(
-        path=Path(openscad_path) if openscad_path else None,
-    )
-    
-    return AppConfig(openscad=openscad_cfg)
+    environ = os.environ if environ is None else environ
+    config = AppConfig()
+
+    explicit = config_file or environ.get(CONFIG_ENV)
+    path = Path(explicit).expanduser() if explicit else DEFAULT_CONFIG_FILE
+    if path.exists():
+        import tomllib
+
+        with path.open("rb") as handle:
+            config = _apply(config, tomllib.load(handle), str(path))
+        LOGGER.debug("Loaded config file %s", path)
+    elif explicit:
+        raise FileNotFoundError(f"Config file not found: {path}")
+
+    config = _apply(config, _env_settings(environ), "environment")
+    cli = _cli_settings(overrides or [])
+    if openscad_path:
+        cli.setdefault("openscad", {})["path"] = openscad_path
+    config = _apply(config, cli, "command line")
+
+    validate_config(config)
+    return config
@@ -16,6 +16,7 @@ class LoggingConfig:
 class OpenScadConfig:
     """OpenSCAD configuration."""
     path: Path | None = None
+    backend: str = "auto"
 
 
 @dataclass(frozen=True)
@@ -26,6 +27,57 @@ class RenderConfig:
     projection: str = "perspective"
     fov: float = 45.0
     output_dir: Path = Path("renders")
+    quality: str = "standard"
+    framing: str = "auto"
+    image_format: str = "png"
+    png_compress_level: int = 6
+    webp_quality: int = 80
+
+
+@dataclass(frozen=True)
+class ExecutionConfig:
+    """OpenSCAD process scheduling configuration."""
+    max_workers: int = 1
+    timeout: float | None = None
+    max_queue_depth: int | None = None
+    max_wait: float | None = None
+    output_head_lines: int = 200
+    output_tail_lines: int = 200
+    output_log_dir: Path | None = None
+    cpu_affinity: str = "off"
+    cpus_per_worker: int = 1
+    interactive_nice: int = 0
+    batch_nice: int = 0
+    interactive_ionice: str = "none"
+    batch_ionice: str = "none"
+
+
+@dataclass(frozen=True)
+class WorkspaceConfig:
+    """Scratch space for intermediate files."""
+    scratch_dir: Path | None = None
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    """Inline source storage and result cache configuration."""
+    directory: Path = Path(".scad-mcp")
+    max_entries: int = 256
+
+
+@dataclass(frozen=True)
+class HistoryConfig:
+    """Job history database configuration."""
+    enabled: bool = True
+    path: Path | None = None
+
+
+@dataclass(frozen=True)
+class LibrariesConfig:
+    """Installed OpenSCAD libraries such as BOSL2 or MCAD."""
+    paths: tuple[Path, ...] = ()
+    flatten: bool = False
+    prewarm: bool = True
 
 
 @dataclass(frozen=True)
@@ -41,3 +93,8 @@ class AppConfig:
     logging: LoggingConfig = LoggingConfig()
     openscad: OpenScadConfig = OpenScadConfig()
     render: RenderConfig = RenderConfig()
+    execution: ExecutionConfig = ExecutionConfig()
+    workspace: WorkspaceConfig = WorkspaceConfig()
+    cache: CacheConfig = CacheConfig()
+    history: HistoryConfig = HistoryConfig()
+    libraries: LibrariesConfig = LibrariesConfig()
@@ -0,0 +1,416 @@
+"""Scheduling of OpenSCAD processes across worker slots."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import itertools
+import logging
+import os
+from pathlib import Path
+import sys
+import time
+from typing import AsyncIterator
+
+from scad_mcp.validation import parse_cpu_list, validate_priority
+
+LOGGER = logging.getLogger("scad_mcp.execution")
+
+# Lower rank is served first.
+PRIORITY_RANKS = {"high": 0, "normal": 1, "low": 2}
+
+
+class OverloadedError(RuntimeError):
+    """Raised when admission control turns a request away.
+
+    Attributes:
+        retry_after: Suggested seconds to wait before retrying.
+    """
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(f"{message} Retry after {retry_after:.1f} seconds.")
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Waiter:
+    """A queued caller."""
+    future: asyncio.Future[None]
+    estimate: float | None
+
+
+class WorkerPool:
+    """Limit concurrent OpenSCAD processes to a resizable number of slots.
+
+    Waiters are served by priority, then first in, first out. Resizing never
+    cancels queued or running work; growing the pool immediately admits
+    waiters. With admission limits set, requests that would exceed the queue
+    depth or the estimated wait are rejected with a retry-after hint, and
+    low-priority work is shed first: it is only queued while the queue is
+    under half full, and a full queue drops its newest lower-priority waiter
+    to make room.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        max_queue_depth: int | None = None,
+        max_wait: float | None = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.max_wait = max_wait
+        self.active = 0
+        self._queues: dict[int, deque[_Waiter]] = {rank: deque() for rank in PRIORITY_RANKS.values()}
+        self._running: dict[object, tuple[float, float | None]] = {}
+        self._slots_in_use: set[int] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def waiting(self) -> int:
+        """Number of callers queued for a slot."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def resize(self, max_workers: int) -> None:
+        """Change the number of slots.
+
+        Safe to call from signal handlers: waiters are woken on the event loop.
+
+        Args:
+            max_workers: New slot count, at least 1.
+        """
+        if max_workers < 1:
+            raise ValueError("Worker pool needs at least one slot.")
+        if max_workers != self.max_workers:
+            LOGGER.info("Resizing worker pool from %s to %s slots", self.max_workers, max_workers)
+        self.max_workers = max_workers
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake)
+
+    def estimated_wait(self, priority: str = "normal") -> float:
+        """Estimate how long a new request would queue before it runs.
+
+        Jobs without a runtime estimate count as finishing immediately.
+
+        Args:
+            priority: Priority of the new request.
+
+        Returns:
+            Estimated seconds until a slot is free for the request.
+        """
+        rank = PRIORITY_RANKS[priority]
+        ahead = [waiter for r, queue in self._queues.items() if r <= rank for waiter in queue]
+        if self.active < self.max_workers and not ahead:
+            return 0.0
+        now = time.monotonic()
+        remaining = sum(max((estimate or 0.0) - (now - started), 0.0) for started, estimate in self._running.values())
+        queued = sum(waiter.estimate or 0.0 for waiter in ahead)
+        return (remaining + queued) / self.max_workers
+
+    def _wake(self) -> None:
+        """Hand free slots to queued waiters."""
+        while self.active < self.max_workers:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            if not waiter.future.done():
+                self.active += 1
+                waiter.future.set_result(None)
+
+    def _next_waiter(self) -> _Waiter | None:
+        for rank in sorted(self._queues):
+            if self._queues[rank]:
+                return self._queues[rank].popleft()
+        return None
+
+    def _reject(self, reason: str, priority: str) -> OverloadedError:
+        """Build the rejection for a request that cannot be queued."""
+        retry_after = max(self.estimated_wait(priority), 1.0)
+        LOGGER.warning("Rejecting %s priority request: %s", priority, reason)
+        return OverloadedError(f"Server overloaded: {reason}.", retry_after)
+
+    def _admit(self, priority: str, rank: int) -> None:
+        """Apply the queue depth and wait limits to a request about to queue.
+
+        Every check runs before a lower priority waiter is displaced, so a
+        request that is rejected anyway never costs another its place.
+
+        Raises:
+            OverloadedError: When the request must be rejected.
+        """
+        depth = self.max_queue_depth
+        full = depth is not None and self.waiting >= depth
+        if depth is not None:
+            if rank == PRIORITY_RANKS["low"] and self.waiting >= max(depth // 2, 1):
+                raise self._reject(f"{self.waiting} requests queued, shedding low priority work", priority)
+            if full and self._victim_rank(rank) is None:
+                raise self._reject(f"queue is full ({depth} requests)", priority)
+        if self.max_wait is not None:
+            estimated = self.estimated_wait(priority)
+            if estimated > self.max_wait:
+                raise self._reject(f"estimated wait {estimated:.1f}s exceeds {self.max_wait:.1f}s", priority)
+        if full:
+            self._shed(rank)
+
+    def _victim_rank(self, rank: int) -> int | None:
+        """Return the lowest priority queue below rank that has waiters."""
+        for lower in sorted(self._queues, reverse=True):
+            if lower > rank and self._queues[lower]:
+                return lower
+        return None
+
+    def _shed(self, rank: int) -> _Waiter | None:
+        """Reject the newest waiter with a lower priority than rank."""
+        lower = self._victim_rank(rank)
+        if lower is None:
+            return None
+        victim = self._queues[lower].pop()
+        priority = next(name for name, value in PRIORITY_RANKS.items() if value == lower)
+        if not victim.future.done():
+            victim.future.set_exception(self._reject("displaced by higher priority work", priority))
+        return victim
+
+    async def _acquire(self, priority: str, estimate: float | None) -> None:
+        self._loop = asyncio.get_running_loop()
+        rank = PRIORITY_RANKS[priority]
+        if self.active < self.max_workers and not self.waiting:
+            self.active += 1
+            return
+        self._admit(priority, rank)
+        waiter = _Waiter(self._loop.create_future(), estimate)
+        self._queues[rank].append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            granted = waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None
+            if granted:
+                self._release()
+            elif waiter in self._queues[rank]:
+                self._queues[rank].remove(waiter)
+            raise
+
+    def _release(self) -> None:
+        self.active -= 1
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self, priority: str = "normal", estimate: float | None = None) -> AsyncIterator[Placement]:
+        """Hold one worker slot for the duration of the block.
+
+        OpenSCAD processes started within the block are placed according to
+        PLACEMENT for this slot.
+
+        Args:
+            priority: "high", "normal", or "low".
+            estimate: Optional expected run time in seconds, used for wait estimates.
+
+        Yields:
+            Placement of the slot.
+
+        Raises:
+            OverloadedError: When admission control rejects the request.
+        """
+        validate_priority(priority)
+        await self._acquire(priority, estimate)
+        token = object()
+        self._running[token] = (time.monotonic(), estimate)
+        index = next(number for number in itertools.count() if number not in self._slots_in_use)
+        self._slots_in_use.add(index)
+        placement = PLACEMENT.place(index, priority)
+        context = CURRENT_PLACEMENT.set(placement)
+        try:
+            yield placement
+        finally:
+            CURRENT_PLACEMENT.reset(context)
+            self._slots_in_use.discard(index)
+            del self._running[token]
+            self._release()
+
+
+# Shared by all tools; one slot by default since each OpenSCAD process is single-threaded.
+WORKER_POOL = WorkerPool()
+
+
+@dataclass
+class OutputLimits:
+    """How much of each OpenSCAD output stream is kept in memory.
+
+    Attributes:
+        head_lines: Lines kept from the start of a stream.
+        tail_lines: Lines kept from the end of a stream.
+        log_dir: Optional directory receiving the full stream whenever lines
+            are dropped.
+    """
+    head_lines: int = 200
+    tail_lines: int = 200
+    log_dir: Path | None = None
+
+
+OUTPUT_LIMITS = OutputLimits()
+
+
+@dataclass(frozen=True)
+class Placement:
+    """Where and how a worker slot runs its OpenSCAD processes.
+
+    Attributes:
+        slot: Index of the worker slot.
+        priority_class: "interactive" or "batch" (low priority requests).
+        cpus: CPUs the processes are pinned to, or None when unpinned.
+        node: NUMA node of those CPUs, or None when unknown.
+        nice: Niceness added to the server's own.
+        ionice: I/O scheduling class, "none", "idle", or "best-effort:N".
+    """
+    slot: int
+    priority_class: str
+    cpus: tuple[int, ...] | None = None
+    node: int | None = None
+    nice: int = 0
+    ionice: str = "none"
+
+
+@dataclass
+class PlacementPolicy:
+    """Map worker slots to CPU sets and scheduling priorities.
+
+    Slots are dealt round-robin across NUMA nodes, so slot 0 runs on the
+    first node, slot 1 on the second, and so on; within a node, consecutive
+    slots take consecutive groups of cpus_per_worker CPUs. Low priority
+    requests form the batch class, all others the interactive class.
+
+    Attributes:
+        nodes: (node, CPUs) pairs available to workers; empty disables pinning.
+        cpus_per_worker: CPUs each slot is pinned to.
+        nice: Niceness increment per class.
+        ionice: I/O scheduling class per class.
+    """
+    nodes: list[tuple[int | None, tuple[int, ...]]] = field(default_factory=list)
+    cpus_per_worker: int = 1
+    nice: dict[str, int] = field(default_factory=lambda: {"interactive": 0, "batch": 0})
+    ionice: dict[str, str] = field(default_factory=lambda: {"interactive": "none", "batch": "none"})
+
+    def configure(
+        self,
+        cpu_affinity: str = "off",
+        cpus_per_worker: int = 1,
+        nice: dict[str, int] | None = None,
+        ionice: dict[str, str] | None = None,
+        node_root: Path = Path("/sys/devices/system/node"),
+    ) -> None:
+        """Apply placement settings.
+
+        Args:
+            cpu_affinity: "off", "auto" for every CPU the server may use, or a
+                CPU list such as "0-7,16-23".
+            cpus_per_worker: CPUs each slot is pinned to.
+            nice: Niceness increment for "interactive" and "batch".
+            ionice: I/O scheduling class for "interactive" and "batch".
+            node_root: sysfs directory describing NUMA nodes.
+        """
+        self.cpus_per_worker = cpus_per_worker
+        self.nice = {"interactive": 0, "batch": 0, **(nice or {})}
+        self.ionice = {"interactive": "none", "batch": "none", **(ionice or {})}
+        if cpu_affinity == "off":
+            self.nodes = []
+            return
+        if not hasattr(os, "sched_getaffinity"):
+            LOGGER.warning("CPU affinity is not supported on this platform; workers are not pinned.")
+            self.nodes = []
+            return
+        allowed = tuple(sorted(os.sched_getaffinity(0)))
+        if cpu_affinity != "auto":
+            allowed = tuple(cpu for cpu in parse_cpu_list(cpu_affinity) if cpu in allowed)
+            if not allowed:
+                LOGGER.warning("No CPU in %s is available to the server; workers are not pinned.", cpu_affinity)
+        self.nodes = numa_nodes(allowed, node_root) if allowed else []
+        LOGGER.info(
+            "Pinning workers to %d CPUs on %d NUMA nodes, %d per worker",
+            len(allowed), len(self.nodes), cpus_per_worker,
+        )
+
+    def place(self, slot: int, priority: str) -> Placement:
+        """Return the placement of a slot for a request.
+
+        Args:
+            slot: Worker slot index.
+            priority: Priority of the request holding the slot.
+
+        Returns:
+            Placement of the slot.
+        """
+        priority_class = "batch" if priority == "low" else "interactive"
+        cpus = node = None
+        if self.nodes:
+            node, node_cpus = self.nodes[slot % len(self.nodes)]
+            start = slot // len(self.nodes) * self.cpus_per_worker
+            count = min(self.cpus_per_worker, len(node_cpus))
+            cpus = tuple(sorted(node_cpus[(start + offset) % len(node_cpus)] for offset in range(count)))
+        return Placement(
+            slot=slot,
+            priority_class=priority_class,
+            cpus=cpus,
+            node=node,
+            nice=self.nice[priority_class],
+            ionice=self.ionice[priority_class],
+        )
+
+
+def numa_nodes(
+    cpus: tuple[int, ...],
+    node_root: Path = Path("/sys/devices/system/node"),
+) -> list[tuple[int | None, tuple[int, ...]]]:
+    """Group CPUs by NUMA node.
+
+    Args:
+        cpus: CPUs to group.
+        node_root: sysfs directory describing NUMA nodes.
+
+    Returns:
+        (node, CPUs) pairs for nodes with at least one of the CPUs, or a
+        single (None, cpus) pair when the topology is unknown.
+    """
+    nodes = []
+    for path in sorted(node_root.glob("node[0-9]*"), key=lambda item: int(item.name[4:])):
+        try:
+            node_cpus = parse_cpu_list((path / "cpulist").read_text(encoding="utf-8").strip())
+        except (OSError, ValueError):
+            continue
+        members = tuple(cpu for cpu in node_cpus if cpu in cpus)
+        if members:
+            nodes.append((int(path.name[4:]), members))
+    return nodes or [(None, cpus)]
+
+
+def placed_command(command: list[str], placement: Placement) -> list[str]:
+    """Prefix a command so it starts with a slot's placement applied.
+
+    The launcher pins and renices itself, then execs the command, so the
+    settings are in place before the process runs and are inherited by all
+    of its threads. Setting them from the server after the process starts
+    would race it and reach only its main thread, while a preexec_fn is
+    unsafe in a threaded server.
+
+    Args:
+        command: Command to run.
+        placement: Placement of the slot running the command.
+
+    Returns:
+        The command unchanged when the placement is a no-op, else the
+        command behind the launcher.
+    """
+    if placement.cpus is None and not placement.nice and placement.ionice == "none":
+        return command
+    cpus = ",".join(map(str, placement.cpus)) if placement.cpus is not None else "-"
+    return [
+        sys.executable, "-I", "-S", str(LAUNCHER), cpus, str(placement.nice), placement.ionice, "--", *command,
+    ]
+
+
+# Stand-alone script applying a placement before exec; see placed_command().
+LAUNCHER = Path(__file__).with_name("launcher.py")
+PLACEMENT = PlacementPolicy()
+# Placement of the worker slot held by the current task, read when spawning OpenSCAD.
+CURRENT_PLACEMENT: ContextVar[Placement | None] = ContextVar("scad_mcp_placement", default=None)
@@ -0,0 +1,442 @@
+"""Persistent job ledger backed by SQLite.
+
+Records are queued by the request path and written by a background thread,
+so a slow disk never delays a render. sqlite3 is imported on that thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager
+from dataclasses import asdict
+import json
+import logging
+from pathlib import Path
+import queue
+import threading
+import time
+from typing import Any, Iterator, Mapping
+
+from scad_mcp.execution import OverloadedError, Placement
+from scad_mcp.models import JobRecord
+from scad_mcp.sources import source_digest
+
+LOGGER = logging.getLogger("scad_mcp.history")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    source TEXT NOT NULL,
+    source_hash TEXT,
+    parameters TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    queue_seconds REAL NOT NULL,
+    run_seconds REAL NOT NULL,
+    cpu_seconds REAL,
+    status TEXT NOT NULL,
+    cached INTEGER NOT NULL,
+    output_path TEXT,
+    output_bytes INTEGER,
+    command TEXT,
+    error TEXT,
+    placement TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_source_hash ON jobs (source_hash);
+CREATE INDEX IF NOT EXISTS jobs_started_at ON jobs (started_at);
+"""
+
+QUERIES = {
+    "slowest": """
+        SELECT source, source_hash, kind, COUNT(*) AS runs,
+               AVG(run_seconds) AS mean_seconds, MAX(run_seconds) AS max_seconds
+        FROM jobs WHERE status = 'ok' AND cached = 0 AND kind LIKE :kind AND started_at >= :since
+        GROUP BY source_hash, kind ORDER BY mean_seconds DESC LIMIT :limit
+    """,
+    "failures": """
+        SELECT source, source_hash, kind, COUNT(*) AS failures,
+               MAX(started_at) AS last_failed_at, error AS last_error
+        FROM jobs WHERE status IN ('error', 'timeout') AND kind LIKE :kind AND started_at >= :since
+        GROUP BY source_hash, kind ORDER BY failures DESC, last_failed_at DESC LIMIT :limit
+    """,
+    "cache": """
+        SELECT kind, COUNT(*) AS requests, SUM(cached) AS hits,
+               CAST(SUM(cached) AS REAL) / COUNT(*) AS hit_rate,
+               AVG(CASE WHEN cached = 0 AND status = 'ok' THEN run_seconds END) AS mean_miss_seconds
+        FROM jobs WHERE status != 'rejected' AND kind LIKE :kind AND started_at >= :since
+        GROUP BY kind ORDER BY kind LIMIT :limit
+    """,
+    "capacity": """
+        SELECT kind, SUM(status != 'rejected') AS jobs,
+               SUM(CASE WHEN status != 'rejected' THEN run_seconds END) AS busy_seconds,
+               AVG(CASE WHEN status != 'rejected' THEN run_seconds END) AS mean_seconds,
+               AVG(CASE WHEN status != 'rejected' THEN queue_seconds END) AS mean_queue_seconds,
+               MAX(CASE WHEN status != 'rejected' THEN queue_seconds END) AS max_queue_seconds,
+               SUM(CASE WHEN status != 'rejected' THEN cpu_seconds END) AS cpu_seconds,
+               SUM(status = 'rejected') AS rejected
+        FROM jobs WHERE cached = 0 AND kind LIKE :kind AND started_at >= :since
+        GROUP BY kind ORDER BY kind LIMIT :limit
+    """,
+    "recent": """
+        SELECT kind, source, source_hash, started_at, queue_seconds, run_seconds, cpu_seconds,
+               status, cached, output_path, output_bytes, error, placement
+        FROM jobs WHERE kind LIKE :kind AND started_at >= :since ORDER BY started_at DESC LIMIT :limit
+    """,
+}
+
+
+def _children_cpu_seconds() -> float | None:
+    """Return the CPU seconds used by finished child processes.
+
+    Returns:
+        User plus system time, or None where the resource module is
+        unavailable (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class JobTracker:
+    """Collects the timings of one job while it runs."""
+
+    def __init__(self, kind: str, source: Path, source_hash: str | None, parameters: Mapping[str, Any]) -> None:
+        self.kind = kind
+        self.source = source
+        self.source_hash = source_hash
+        self.parameters = parameters
+        self.started_at = time.time()
+        self._created = time.perf_counter()
+        self._running: float | None = None
+        self._cpu_seconds = _children_cpu_seconds()
+        self.output_path: Path | None = None
+        self.command: list[str] | None = None
+        self.placement: Placement | None = None
+
+    def running(self, placement: Placement | None = None) -> None:
+        """Mark the end of the queue wait.
+
+        Args:
+            placement: Placement of the worker slot running the job.
+        """
+        self._running = time.perf_counter()
+        self.placement = placement
+
+    def finish(self, output_path: Path, command: list[str]) -> None:
+        """Record the job's output.
+
+        Args:
+            output_path: File the job produced.
+            command: OpenSCAD command that produced it.
+        """
+        self.output_path = output_path
+        self.command = command
+
+    def record(self, status: str, error: str | None, cached: bool = False) -> JobRecord:
+        """Build the ledger record for the finished job.
+
+        Args:
+            status: "ok", "error", "timeout", "rejected", or "cancelled".
+            error: Error text for failed jobs.
+            cached: Whether the result came from the cache.
+
+        Returns:
+            JobRecord describing the job.
+        """
+        now = time.perf_counter()
+        running = self._running if self._running is not None else now
+        cpu_seconds = None
+        total = None if cached else _children_cpu_seconds()
+        if total is not None and self._cpu_seconds is not None:
+            # Children reaped while this job ran; approximate when jobs overlap.
+            cpu_seconds = total - self._cpu_seconds
+        output_bytes = None
+        if self.output_path is not None and self.output_path.exists():
+            output_bytes = self.output_path.stat().st_size
+        return JobRecord(
+            kind=self.kind,
+            source=str(self.source),
+            source_hash=self.source_hash,
+            parameters=json.dumps(self.parameters, sort_keys=True, default=str),
+            started_at=self.started_at,
+            queue_seconds=running - self._created,
+            run_seconds=now - running,
+            cpu_seconds=cpu_seconds,
+            status=status,
+            cached=cached,
+            output_path=str(self.output_path) if self.output_path else None,
+            output_bytes=output_bytes,
+            command=json.dumps(self.command) if self.command else None,
+            error=error,
+            placement=json.dumps(asdict(self.placement)) if self.placement else None,
+        )
+
+
+class JobHistory:
+    """Asynchronously written job ledger with a runtime estimator.
+
+    Until a database path is configured, records only feed the in-memory
+    runtime estimates.
+    """
+
+    def __init__(self) -> None:
+        self._path: Path | None = None
+        self._queue: queue.Queue[tuple[str, Any]] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._estimates: dict[tuple[str, str | None], tuple[float, int]] = {}
+
+    @property
+    def path(self) -> Path | None:
+        """Database path, or None when the ledger is disabled."""
+        return self._path
+
+    def configure(self, path: Path | None) -> None:
+        """Open the ledger at path, or disable it with None.
+
+        Args:
+            path: SQLite database path.
+        """
+        if path == self._path:
+            return
+        self._path = path
+        self._send("open", path)
+
+    def record(self, record: JobRecord) -> None:
+        """Queue a finished job for the ledger and update the estimates.
+
+        Args:
+            record: Job to record.
+        """
+        if record.status == "ok" and not record.cached:
+            self._observe(record.kind, record.source_hash, record.run_seconds)
+        if self._path is not None:
+            self._send("insert", record)
+
+    def flush(self) -> None:
+        """Block until queued records are written."""
+        if self._thread is not None:
+            self._queue.join()
+
+    @contextmanager
+    def track(
+        self,
+        kind: str,
+        source: Path,
+        source_hash: str | None,
+        parameters: Mapping[str, Any],
+    ) -> Iterator[JobTracker]:
+        """Record a job run within the block, including failures.
+
+        Args:
+            kind: "render" or "convert".
+            source: SCAD file the job reads.
+            source_hash: Digest of the source; computed from the file when None.
+            parameters: Request parameters.
+
+        Yields:
+            Tracker on which the block marks the queue wait and output.
+        """
+        if source_hash is None:
+            source_hash = _file_digest(source)
+        tracker = JobTracker(kind, source, source_hash, parameters)
+        try:
+            yield tracker
+        except TimeoutError as exc:
+            self.record(tracker.record("timeout", str(exc)))
+            raise
+        except OverloadedError as exc:
+            self.record(tracker.record("rejected", str(exc)))
+            raise
+        except asyncio.CancelledError:
+            self.record(tracker.record("cancelled", None))
+            raise
+        except Exception as exc:
+            self.record(tracker.record("error", str(exc)))
+            raise
+        self.record(tracker.record("ok", None))
+
+    def record_cache_hit(
+        self,
+        kind: str,
+        source: Path,
+        source_hash: str | None,
+        parameters: Mapping[str, Any],
+        output_path: Path,
+    ) -> None:
+        """Record a request served from the result cache.
+
+        Args:
+            kind: "render" or "convert".
+            source: SCAD file of the request.
+            source_hash: Digest of the source.
+            parameters: Request parameters.
+            output_path: Cached output.
+        """
+        tracker = JobTracker(kind, source, source_hash, parameters)
+        tracker.running()
+        tracker.output_path = output_path
+        self.record(tracker.record("ok", None, cached=True))
+
+    def estimate(self, kind: str, source_hash: str | None) -> float | None:
+        """Estimate the run time of a job from past runs.
+
+        Args:
+            kind: "render" or "convert".
+            source_hash: Digest of the source.
+
+        Returns:
+            Mean run seconds of past uncached runs of this source, else of all
+            sources of this kind, else None.
+        """
+        with self._lock:
+            known = self._estimates.get((kind, source_hash)) or self._estimates.get((kind, None))
+        return known[0] if known else None
+
+    async def query(
+        self,
+        name: str,
+        limit: int = 10,
+        kind: str | None = None,
+        since: float = 0.0,
+    ) -> list[dict[str, Any]]:
+        """Run a named report against the ledger.
+
+        Args:
+            name: "slowest", "failures", "cache", "capacity", or "recent".
+            limit: Maximum rows.
+            kind: Optional job kind filter.
+            since: Only include jobs started at or after this Unix time.
+
+        Returns:
+            Report rows.
+
+        Raises:
+            ValueError: When the report name or limit is invalid.
+            RuntimeError: When the ledger is disabled.
+        """
+        if name not in QUERIES:
+            raise ValueError(f"Query must be one of {', '.join(sorted(QUERIES))}.")
+        if limit < 1:
+            raise ValueError("limit must be at least 1.")
+        if self._path is None:
+            raise RuntimeError("Job history is disabled.")
+        path = self._path
+        await asyncio.to_thread(self.flush)
+        parameters = {"limit": limit, "kind": kind or "%", "since": since}
+        return await asyncio.to_thread(_select, path, QUERIES[name], parameters)
+
+    def _observe(self, kind: str, source_hash: str | None, seconds: float) -> None:
+        """Fold a run time into the per-source and per-kind means."""
+        with self._lock:
+            for key in ((kind, source_hash), (kind, None)):
+                mean, count = self._estimates.get(key, (0.0, 0))
+                self._estimates[key] = (mean + (seconds - mean) / (count + 1), count + 1)
+
+    def _send(self, action: str, payload: Any) -> None:
+        """Queue a message for the writer thread, starting it if needed."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._writer, name="scad-mcp-history", daemon=True)
+            self._thread.start()
+        self._queue.put((action, payload))
+
+    def _writer(self) -> None:
+        """Write queued records; errors are logged and never reach requests."""
+        import sqlite3
+
+        connection: sqlite3.Connection | None = None
+        while True:
+            action, payload = self._queue.get()
+            try:
+                if action == "open":
+                    if connection is not None:
+                        connection.close()
+                        connection = None
+                    if payload is not None:
+                        connection = _connect(payload)
+                        self._load_estimates(connection)
+                elif action == "insert" and connection is not None:
+                    fields = asdict(payload)
+                    connection.execute(
+                        f"INSERT INTO jobs ({', '.join(fields)}) VALUES ({', '.join(':' + name for name in fields)})",
+                        fields,
+                    )
+                # Commit once the queue drains, so bursts share a transaction.
+                if connection is not None and connection.in_transaction and self._queue.empty():
+                    connection.commit()
+            except Exception:
+                LOGGER.exception("Job history %s failed.", action)
+            finally:
+                self._queue.task_done()
+
+    def _load_estimates(self, connection: Any) -> None:
+        """Seed the runtime estimates from past uncached runs."""
+        rows = connection.execute(
+            "SELECT kind, source_hash, AVG(run_seconds), COUNT(*) FROM jobs"
+            " WHERE status = 'ok' AND cached = 0 GROUP BY kind, source_hash"
+        ).fetchall()
+        with self._lock:
+            for kind, source_hash, mean, count in rows:
+                self._estimates[(kind, source_hash)] = (mean, count)
+                total_mean, total_count = self._estimates.get((kind, None), (0.0, 0))
+                merged = total_count + count
+                self._estimates[(kind, None)] = ((total_mean * total_count + mean * count) / merged, merged)
+        LOGGER.debug("Loaded runtime estimates for %d sources", len(rows))
+
+
+def _connect(path: Path) -> Any:
+    """Open the ledger database and create its schema.
+
+    Args:
+        path: SQLite database path.
+
+    Returns:
+        sqlite3 connection.
+    """
+    import sqlite3
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    # WAL lets reports read while the writer thread appends.
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.executescript(SCHEMA)
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+    if "placement" not in columns:
+        # Ledgers written before placements were recorded.
+        connection.execute("ALTER TABLE jobs ADD COLUMN placement TEXT")
+    return connection
+
+
+def _select(path: Path, sql: str, parameters: Mapping[str, Any]) -> list[dict[str, Any]]:
+    """Run a read-only query on a fresh connection.
+
+    Args:
+        path: SQLite database path.
+        sql: Query text.
+        parameters: Named query parameters.
+
+    Returns:
+        Rows as dicts.
+    """
+    import sqlite3
+
+    connection = _connect(path)
+    try:
+        connection.row_factory = sqlite3.Row
+        return [dict(row) for row in connection.execute(sql, parameters).fetchall()]
+    finally:
+        connection.close()
+
+
+def _file_digest(path: Path) -> str | None:
+    """Return the content digest of a source file, or None if unreadable."""
+    try:
+        return source_digest(path.read_bytes())
+    except OSError:
+        return None
+
+
+JOB_HISTORY = JobHistory()
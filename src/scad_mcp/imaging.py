@@ -0,0 +1,217 @@
+"""Image encoding helpers for rendered artifacts."""
+
+from __future__ import annotations
+
+import logging
+import math
+from pathlib import Path
+from types import ModuleType
+
+from scad_mcp.models import ImageDiff
+from scad_mcp.workspace import partial_file
+
+LOGGER = logging.getLogger("scad_mcp.imaging")
+
+IMAGE_MIME_TYPES = {
+    "png": "image/png",
+    "webp": "image/webp",
+}
+
+
+def load_pillow() -> ModuleType:
+    """Import Pillow's Image module on first use.
+
+    Returns:
+        The PIL.Image module.
+
+    Raises:
+        RuntimeError: When Pillow is not installed.
+    """
+    try:
+        from PIL import Image
+    except ImportError as exc:
+        raise RuntimeError("Image encoding requires Pillow. Install scad-mcp[images].") from exc
+    return Image
+
+
+def load_numpy() -> ModuleType:
+    """Import NumPy on first use.
+
+    Returns:
+        The numpy module.
+
+    Raises:
+        RuntimeError: When NumPy is not installed.
+    """
+    try:
+        import numpy
+    except ImportError as exc:
+        raise RuntimeError("Image comparison requires NumPy. Install scad-mcp[images].") from exc
+    return numpy
+
+
+def variant_path(
+    image_path: Path,
+    max_size: int | None,
+    image_format: str,
+    png_compress_level: int,
+    webp_quality: int,
+) -> Path:
+    """Return the cache path of an encoded image variant.
+
+    Args:
+        image_path: Source image rendered by OpenSCAD.
+        max_size: Longest edge of the variant in pixels, or None for full size.
+        image_format: Target format, "png" or "webp".
+        png_compress_level: zlib compression level for PNG output.
+        webp_quality: Quality for WebP output.
+
+    Returns:
+        Path next to the source image identifying the variant.
+    """
+    size_part = f"thumb{max_size}" if max_size else "full"
+    quality_part = f"z{png_compress_level}" if image_format == "png" else f"q{webp_quality}"
+    return image_path.with_name(f"{image_path.stem}.{size_part}.{quality_part}.{image_format}")
+
+
+def encode_variant(
+    image_path: Path,
+    max_size: int | None = None,
+    image_format: str = "png",
+    png_compress_level: int = 6,
+    webp_quality: int = 80,
+) -> Path:
+    """Encode a downscaled or re-compressed variant of a rendered image.
+
+    Variants are cached next to the source image and reused while they are
+    newer than the source.
+
+    Args:
+        image_path: Source image rendered by OpenSCAD.
+        max_size: Longest edge of the variant in pixels, or None for full size.
+        image_format: Target format, "png" or "webp".
+        png_compress_level: zlib compression level for PNG output.
+        webp_quality: Quality for WebP output.
+
+    Returns:
+        Path of the encoded variant.
+    """
+    target = variant_path(image_path, max_size, image_format, png_compress_level, webp_quality)
+    if target.exists() and target.stat().st_mtime_ns >= image_path.stat().st_mtime_ns:
+        return target
+
+    image_module = load_pillow()
+    with image_module.open(image_path) as image:
+        image.load()
+        if max_size and max(image.size) > max_size:
+            image.thumbnail((max_size, max_size), image_module.Resampling.LANCZOS)
+        with partial_file(target) as partial:
+            if image_format == "png":
+                image.save(partial, format="PNG", optimize=False, compress_level=png_compress_level)
+            else:
+                image.save(partial, format="WEBP", quality=webp_quality, method=4)
+    LOGGER.debug("Encoded image variant %s", target)
+    return target
+
+
+def diff_images(image_a: Path, image_b: Path, heatmap_path: Path, threshold: int = 0) -> ImageDiff:
+    """Compare two renders pixel by pixel and write a diff heatmap.
+
+    Args:
+        image_a: Baseline render.
+        image_b: Render to compare against the baseline.
+        heatmap_path: Destination of the heatmap PNG.
+        threshold: Per-channel difference (0-255) at or below which pixels count as unchanged.
+
+    Returns:
+        ImageDiff with changed pixel count, similarity score, and changed-region bounding box.
+
+    Raises:
+        ValueError: When the images differ in size.
+    """
+    np = load_numpy()
+    image_module = load_pillow()
+    with image_module.open(image_a) as first, image_module.open(image_b) as second:
+        if first.size != second.size:
+            raise ValueError(f"Image sizes differ: {first.size} vs {second.size}.")
+        pixels_a = np.asarray(first.convert("RGB"), dtype=np.int16)
+        pixels_b = np.asarray(second.convert("RGB"), dtype=np.int16)
+
+    delta = np.abs(pixels_a - pixels_b).max(axis=2)
+    changed = delta > threshold
+    changed_pixels = int(np.count_nonzero(changed))
+    similarity = 1.0 - float(delta.mean()) / 255.0
+
+    bbox = None
+    if changed_pixels:
+        rows = np.flatnonzero(changed.any(axis=1))
+        cols = np.flatnonzero(changed.any(axis=0))
+        bbox = (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+
+    # Dimmed grayscale baseline with changes highlighted in red.
+    gray = (pixels_a.mean(axis=2) * 0.3).astype(np.uint8)
+    heat = np.stack([np.maximum(gray, delta.astype(np.uint8)), gray, gray], axis=2)
+    heat[changed, 0] = np.maximum(heat[changed, 0], 128)
+    heatmap_path.parent.mkdir(parents=True, exist_ok=True)
+    image_module.fromarray(heat).save(heatmap_path, format="PNG")
+
+    return ImageDiff(
+        changed_pixels=changed_pixels,
+        total_pixels=int(changed.size),
+        similarity=similarity,
+        bbox=bbox,
+        heatmap_path=heatmap_path,
+    )
+
+
+def assemble_animation(
+    frames: list[Path],
+    target: Path,
+    output_format: str = "gif",
+    frame_duration: int = 100,
+    webp_quality: int = 80,
+) -> Path:
+    """Combine rendered frames into an animated image or a sprite sheet.
+
+    Args:
+        frames: Frame images in playback order, all of the same size.
+        target: Destination path.
+        output_format: "gif" or "webp" for a looping animation, or "sprite"
+            for a PNG grid read left to right, top to bottom.
+        frame_duration: Display time of each frame in milliseconds.
+        webp_quality: Quality for WebP output.
+
+    Returns:
+        The target path.
+    """
+    image_module = load_pillow()
+    images = []
+    for frame in frames:
+        with image_module.open(frame) as image:
+            images.append(image.convert("RGB"))
+    with partial_file(target) as partial:
+        if output_format == "sprite":
+            columns = math.ceil(math.sqrt(len(images)))
+            rows = math.ceil(len(images) / columns)
+            width, height = images[0].size
+            sheet = image_module.new("RGB", (columns * width, rows * height), "white")
+            for index, image in enumerate(images):
+                sheet.paste(image, ((index % columns) * width, (index // columns) * height))
+            sheet.save(partial, format="PNG")
+        elif output_format == "gif":
+            palette = [image.quantize(colors=256) for image in images]
+            palette[0].save(
+                partial, format="GIF", save_all=True, append_images=palette[1:], duration=frame_duration, loop=0,
+            )
+        else:
+            images[0].save(
+                partial,
+                format="WEBP",
+                save_all=True,
+                append_images=images[1:],
+                duration=frame_duration,
+                loop=0,
+                quality=webp_quality,
+            )
+    LOGGER.debug("Assembled %s frames into %s", len(frames), target)
+    return target
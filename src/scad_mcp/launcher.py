@@ -0,0 +1,79 @@
+"""Apply a worker slot's placement to this process, then exec a command.
+
+Run as a script in front of OpenSCAD, so CPU affinity, niceness and I/O
+priority are in place before OpenSCAD starts and every thread it creates
+inherits them. Only the standard library is imported to keep startup fast.
+
+Usage:
+    python launcher.py <cpus|-> <nice> <ionice> -- command [args...]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+# ioprio_set has no libc wrapper or Python binding; syscall numbers per architecture.
+_IOPRIO_SYSCALLS = {"x86_64": 251, "aarch64": 30, "riscv64": 30}
+_IOPRIO_CLASSES = {"best-effort": 2, "idle": 3}
+
+
+def _set_io_priority(ionice: str) -> None:
+    import ctypes
+    import platform
+
+    number = _IOPRIO_SYSCALLS.get(platform.machine())
+    if not sys.platform.startswith("linux") or number is None:
+        return
+    name, _, level = ionice.partition(":")
+    value = _IOPRIO_CLASSES[name] << 13 | int(level or 4)
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.syscall(number, 1, 0, value) != 0:  # IOPRIO_WHO_PROCESS, this process
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+
+def apply(cpus: str, nice: int, ionice: str) -> None:
+    """Pin this process and set its CPU and I/O priority.
+
+    Failures are reported on stderr; placement never fails a job.
+
+    Args:
+        cpus: Comma-separated CPUs to pin to, or "-" to leave affinity alone.
+        nice: Niceness increment.
+        ionice: I/O scheduling class, "none", "idle", or "best-effort:N".
+    """
+    try:
+        if cpus != "-":
+            os.sched_setaffinity(0, [int(cpu) for cpu in cpus.split(",")])
+        if nice and hasattr(os, "nice"):
+            os.nice(nice)
+        if ionice != "none":
+            _set_io_priority(ionice)
+    except (AttributeError, OSError) as exc:
+        print(f"scad-mcp: could not apply worker placement: {exc}", file=sys.stderr)
+
+
+def main(argv: list[str]) -> int:
+    """Apply the placement given on the command line and exec the command.
+
+    Args:
+        argv: Arguments after the script name.
+
+    Returns:
+        Exit status, only when the command could not be started.
+    """
+    cpus, nice, ionice, separator, *command = argv
+    if separator != "--" or not command:
+        print("usage: launcher.py <cpus|-> <nice> <ionice> -- command [args...]", file=sys.stderr)
+        return 2
+    apply(cpus, int(nice), ionice)
+    try:
+        os.execvp(command[0], command)
+    except OSError as exc:
+        print(f"scad-mcp: could not start {command[0]}: {exc}", file=sys.stderr)
+    return 127
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
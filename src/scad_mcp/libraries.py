@@ -0,0 +1,422 @@
+"""Index of installed OpenSCAD libraries and of the files a model uses."""
+
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+import re
+import sys
+from typing import Iterable, Sequence
+
+from scad_mcp.assembly import FILE_ARGUMENT
+from scad_mcp.config.models import AppConfig
+from scad_mcp.models import LibraryFile
+from scad_mcp.sources import source_digest
+from scad_mcp.workspace import partial_file
+
+LOGGER = logging.getLogger("scad_mcp.libraries")
+
+LIBRARY_PATH_ENV = "OPENSCADPATH"
+# Comments and strings are matched first so that directives and calls inside them are skipped.
+_TOKENS = re.compile(
+    r"//[^\n]*|/\*.*?\*/|\"(?:\\.|[^\"\\])*\""
+    r"|\b(?P<directive>use|include)\s*<(?P<target>[^>\n]*)>"
+    r"|\b(?P<kind>module|function)\s+(?P<name>\$?[A-Za-z_]\w*)\s*\("
+    r"|(?<![\w$.])(?P<call>\$?[A-Za-z_]\w*)\s*\("
+    r"|(?P<brace>[{}])",
+    re.S,
+)
+# Words followed by "(" that are not calls of user-defined modules or functions.
+KEYWORDS = {"if", "else", "for", "intersection_for", "let", "each", "function", "module"}
+BUILTINS = frozenset({
+    "abs", "acos", "asin", "assert", "atan", "atan2", "ceil", "children", "chr", "circle", "color",
+    "concat", "cos", "cross", "cube", "cylinder", "difference", "echo", "exp", "fill", "floor",
+    "fontmetrics", "group", "has_key", "hull", "import", "intersection", "is_bool", "is_function",
+    "is_list", "is_num", "is_string", "is_undef", "len", "linear_extrude", "ln", "log", "lookup",
+    "max", "min", "minkowski", "mirror", "multmatrix", "norm", "object", "offset", "ord",
+    "parent_module", "polygon", "polyhedron", "pow", "projection", "rands", "render", "resize",
+    "roof", "rotate", "rotate_extrude", "round", "scale", "search", "sign", "sin", "sphere", "sqrt",
+    "square", "str", "surface", "tan", "text", "textmetrics", "translate", "union", "version",
+    "version_num",
+})
+
+
+def default_library_dir() -> Path:
+    """Return OpenSCAD's per-user library directory for this platform."""
+    if sys.platform.startswith("linux"):
+        return Path.home() / ".local" / "share" / "OpenSCAD" / "libraries"
+    return Path.home() / "Documents" / "OpenSCAD" / "libraries"
+
+
+def library_roots(paths: Sequence[Path] = ()) -> list[Path]:
+    """Return the directories OpenSCAD searches for libraries, in order.
+
+    Args:
+        paths: Configured library directories, searched first.
+
+    Returns:
+        Existing directories from paths, OPENSCADPATH and the user library
+        directory, without duplicates.
+    """
+    candidates = [*paths, *(Path(item) for item in os.environ.get(LIBRARY_PATH_ENV, "").split(os.pathsep) if item)]
+    candidates.append(default_library_dir())
+    roots: list[Path] = []
+    for candidate in candidates:
+        resolved = candidate.expanduser().resolve()
+        if resolved.is_dir() and resolved not in roots:
+            roots.append(resolved)
+    return roots
+
+
+def parse_scad(text: str, path: Path, digest: str) -> LibraryFile:
+    """Extract definitions, use/include references and calls from SCAD source.
+
+    Args:
+        text: SCAD source code.
+        path: Path of the source.
+        digest: Content digest of the source.
+
+    Returns:
+        Parsed file. Nested definitions are local and not listed.
+    """
+    modules: set[str] = set()
+    functions: set[str] = set()
+    defined: set[str] = set()
+    calls: set[str] = set()
+    references: list[tuple[str, str]] = []
+    depth = 0
+    for match in _TOKENS.finditer(text):
+        if match.group("directive"):
+            references.append((match.group("directive"), match.group("target").strip()))
+        elif match.group("name"):
+            name = match.group("name")
+            defined.add(name)
+            if depth == 0:
+                (modules if match.group("kind") == "module" else functions).add(name)
+        elif match.group("call"):
+            if match.group("call") not in KEYWORDS:
+                calls.add(match.group("call"))
+        elif match.group("brace"):
+            depth = depth + 1 if match.group("brace") == "{" else max(depth - 1, 0)
+    return LibraryFile(
+        path=path,
+        digest=digest,
+        modules=frozenset(modules),
+        functions=frozenset(functions),
+        references=tuple(references),
+        calls=frozenset(calls - defined),
+    )
+
+
+class LibraryIndex:
+    """Parsed SCAD files, reparsed only when their size or mtime changes."""
+
+    def __init__(self) -> None:
+        self._files: dict[Path, tuple[tuple[int, int], LibraryFile]] = {}
+
+    def load(self, path: Path) -> LibraryFile:
+        """Return the parsed form of a file.
+
+        Args:
+            path: SCAD file.
+
+        Returns:
+            Parsed file.
+        """
+        path = path.resolve()
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        data = path.read_bytes()
+        parsed = parse_scad(data.decode("utf-8", "replace"), path, source_digest(data))
+        self._files[path] = (stamp, parsed)
+        return parsed
+
+    @staticmethod
+    def resolve(target: str, base_dir: Path, roots: Sequence[Path]) -> Path | None:
+        """Find the file a use/include target refers to, as OpenSCAD does.
+
+        Args:
+            target: Path between the angle brackets.
+            base_dir: Directory of the referencing file, searched first.
+            roots: Library directories searched next.
+
+        Returns:
+            Resolved file or None when it cannot be found.
+        """
+        for directory in (base_dir, *roots):
+            candidate = directory / target
+            if candidate.is_file():
+                return candidate.resolve()
+        return None
+
+    def dependencies(self, path: Path, roots: Sequence[Path]) -> tuple[list[LibraryFile], list[str]]:
+        """Return every file a model uses or includes, directly or indirectly.
+
+        Args:
+            path: SCAD file of the model.
+            roots: Library directories.
+
+        Returns:
+            Tuple of the dependencies sorted by path, and descriptions of
+            references that could not be resolved.
+        """
+        start = self.load(path)
+        seen = {start.path: start}
+        pending = [start]
+        unresolved: list[str] = []
+        while pending:
+            current = pending.pop()
+            for kind, target in current.references:
+                resolved = self.resolve(target, current.path.parent, roots)
+                if resolved is None:
+                    unresolved.append(f"{kind} <{target}> in {current.path}")
+                elif resolved not in seen:
+                    seen[resolved] = self.load(resolved)
+                    pending.append(seen[resolved])
+        del seen[start.path]
+        return sorted(seen.values(), key=lambda item: str(item.path)), unresolved
+
+    def dependency_digest(self, path: Path, roots: Sequence[Path]) -> str | None:
+        """Return a digest of the contents of every file a model depends on.
+
+        Args:
+            path: SCAD file of the model.
+            roots: Library directories.
+
+        Returns:
+            Digest, or None when the model references no files.
+        """
+        files, _ = self.dependencies(path, roots)
+        return _combined_digest(files) if files else None
+
+    def _included(self, path: Path, roots: Sequence[Path]) -> list[LibraryFile]:
+        """Return a file and everything it includes; include is textual, so they share a scope."""
+        unit = [self.load(path)]
+        seen = {unit[0].path}
+        for current in unit:
+            for kind, target in current.references:
+                resolved = self.resolve(target, current.path.parent, roots) if kind == "include" else None
+                if resolved is not None and resolved not in seen:
+                    seen.add(resolved)
+                    unit.append(self.load(resolved))
+        return unit
+
+    def undefined_calls(self, path: Path, roots: Sequence[Path]) -> list[str]:
+        """Return names a model calls that no visible file defines.
+
+        Only calls in the model itself are checked, against its own
+        definitions, the files it includes, the files those use, and the
+        OpenSCAD built-ins. Calls of function-valued variables are reported too.
+
+        Args:
+            path: SCAD file of the model.
+            roots: Library directories.
+
+        Returns:
+            Sorted undefined names.
+        """
+        unit = self._included(path, roots)
+        visible = set(BUILTINS)
+        for current in unit:
+            visible |= current.modules | current.functions
+            for kind, target in current.references:
+                resolved = self.resolve(target, current.path.parent, roots) if kind == "use" else None
+                if resolved is not None:
+                    for used in self._included(resolved, roots):
+                        visible |= used.modules | used.functions
+        return sorted(unit[0].calls - visible)
+
+    def catalog(self, roots: Sequence[Path]) -> dict[str, list[tuple[str, Path]]]:
+        """Index the top-level modules and functions of every library file.
+
+        Args:
+            roots: Library directories.
+
+        Returns:
+            Mapping of name to ("module" or "function", file) pairs.
+        """
+        names: dict[str, list[tuple[str, Path]]] = {}
+        for root in roots:
+            for path in sorted(root.rglob("*.scad")):
+                try:
+                    parsed = self.load(path)
+                except OSError:
+                    continue
+                for name in parsed.modules:
+                    names.setdefault(name, []).append(("module", parsed.path))
+                for name in parsed.functions:
+                    names.setdefault(name, []).append(("function", parsed.path))
+        return names
+
+    def flatten(self, path: Path, roots: Sequence[Path], directory: Path) -> Path:
+        """Write a library file with its includes inlined into one file.
+
+        OpenSCAD then opens and tokenizes one file instead of one per include.
+        Used files are flattened separately and referenced by absolute path,
+        as are relative import() and surface() files. Outputs are named by
+        content, so they are only written once per library version.
+
+        Args:
+            path: Library entry point such as BOSL2/std.scad.
+            roots: Library directories.
+            directory: Directory for flattened files.
+
+        Returns:
+            Path of the flattened file.
+
+        Raises:
+            ValueError: When includes are recursive.
+        """
+        parsed = self.load(path)
+        if parsed.path.parent == directory.resolve():
+            return parsed.path
+        files, _ = self.dependencies(parsed.path, roots)
+        version = _combined_digest([parsed, *files])
+        target = directory / f"{parsed.path.stem}-{version}.scad"
+        if target.exists():
+            return target
+        text = self._inline(parsed.path, roots, directory, (parsed.path,))
+        directory.mkdir(parents=True, exist_ok=True)
+        with partial_file(target) as partial:
+            partial.write_text(text, encoding="utf-8")
+        LOGGER.info("Flattened library %s into %s", parsed.path, target)
+        return target
+
+    def _inline(self, path: Path, roots: Sequence[Path], directory: Path, stack: tuple[Path, ...]) -> str:
+        def file_argument(match: re.Match[str]) -> str:
+            file = path.parent / match.group(3)
+            if Path(match.group(3)).is_absolute() or not file.exists():
+                return match.group(0)
+            return f'{match.group(1)}{match.group(2)}"{file.resolve().as_posix()}"'
+
+        def directive(match: re.Match[str]) -> str:
+            if not match.group("directive"):
+                return match.group(0)
+            resolved = self.resolve(match.group("target").strip(), path.parent, roots)
+            if resolved is None:
+                return match.group(0)
+            if match.group("directive") == "use":
+                return f"use <{self.flatten(resolved, roots, directory).as_posix()}>"
+            if resolved in stack:
+                raise ValueError(f"Recursive include of {resolved}.")
+            body = self._inline(resolved, roots, directory, (*stack, resolved))
+            return f"// include <{match.group('target')}>\n{body}\n"
+
+        text = path.read_text(encoding="utf-8", errors="replace")
+        return _TOKENS.sub(directive, FILE_ARGUMENT.sub(file_argument, text))
+
+    def flatten_references(self, path: Path, roots: Sequence[Path], directory: Path) -> str:
+        """Return a model's source with use/include targets replaced by flattened libraries.
+
+        Args:
+            path: SCAD file of the model.
+            roots: Library directories.
+            directory: Directory for flattened files.
+
+        Returns:
+            Rewritten source text.
+        """
+        def directive(match: re.Match[str]) -> str:
+            if not match.group("directive"):
+                return match.group(0)
+            resolved = self.resolve(match.group("target").strip(), path.parent, roots)
+            if resolved is None:
+                return match.group(0)
+            return f"{match.group('directive')} <{self.flatten(resolved, roots, directory).as_posix()}>"
+
+        return _TOKENS.sub(directive, path.read_text(encoding="utf-8"))
+
+
+LIBRARY_INDEX = LibraryIndex()
+
+
+def prepare_source(config: AppConfig, path: Path) -> tuple[Path, str]:
+    """Key a stored inline source by its library dependencies and optionally flatten them.
+
+    Args:
+        config: Application configuration.
+        path: Stored inline source, named by its content digest.
+
+    Returns:
+        Tuple of the path to run OpenSCAD on and the digest for cache keys,
+        which also covers every used or included file.
+    """
+    roots = library_roots(config.libraries.paths)
+    files, unresolved = LIBRARY_INDEX.dependencies(path, roots)
+    for reference in unresolved:
+        LOGGER.warning("Unresolved library reference: %s", reference)
+    if not files:
+        return path, path.stem
+    digest = source_digest(f"{path.stem}:{_combined_digest(files)}".encode("utf-8"))
+    if config.libraries.flatten:
+        library_dir = config.cache.directory / "libraries"
+        text = LIBRARY_INDEX.flatten_references(path, roots, library_dir)
+        # Same name in a sibling directory, so output file names do not change.
+        flat = path.parent / "flat" / path.name
+        if not flat.exists() or flat.read_text(encoding="utf-8") != text:
+            flat.parent.mkdir(parents=True, exist_ok=True)
+            with partial_file(flat) as partial:
+                partial.write_text(text, encoding="utf-8")
+        path = flat
+    return path, digest
+
+
+def model_digest(config: AppConfig, path: Path) -> str:
+    """Digest a model file together with every file it uses or includes.
+
+    Composed like the digest prepare_source gives inline sources, so keys
+    built from it change when the model or any of its libraries changes.
+
+    Args:
+        config: Application configuration.
+        path: SCAD file of the model.
+
+    Returns:
+        Digest for cache keys.
+    """
+    digest = source_digest(path.read_bytes())
+    dependencies = LIBRARY_INDEX.dependency_digest(path, library_roots(config.libraries.paths))
+    if dependencies is None:
+        return digest
+    return source_digest(f"{digest}:{dependencies}".encode("utf-8"))
+
+
+def prewarm(config: AppConfig, path: Path) -> int:
+    """Pull the files a model depends on into the OS page cache.
+
+    Meant to run once before a batch of OpenSCAD processes that all parse
+    the same libraries.
+
+    Args:
+        config: Application configuration.
+        path: SCAD file of the model.
+
+    Returns:
+        Number of files warmed.
+    """
+    files, _ = LIBRARY_INDEX.dependencies(path, library_roots(config.libraries.paths))
+    return _read_ahead(item.path for item in files)
+
+
+def _combined_digest(files: Iterable[LibraryFile]) -> str:
+    return source_digest("\n".join(sorted(item.digest for item in files)).encode("utf-8"))
+
+
+def _read_ahead(paths: Iterable[Path]) -> int:
+    count = 0
+    for path in paths:
+        try:
+            with path.open("rb") as handle:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(handle.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                else:
+                    while handle.read(1 << 20):
+                        pass
+        except OSError:
+            continue
+        count += 1
+    return count
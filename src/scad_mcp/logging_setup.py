@@ -6,6 +6,8 @@ import logging
 def configure_logging(level: str) -> None:
     """Configure the root logger with the specified level and a standard format.
 
+    Calling again updates the level, which lets a config reload change verbosity.
+
     Args:
         level: Logging level as a string (e.g., 'info', 'debug', 'warning').
     """
@@ -13,3 +15,4 @@ def configure_logging(level: str) -> None:
         level=level.upper(),
         format="%(asctime)s %(levelname)s %(name)s %(message)s",
     )
+    logging.getLogger().setLevel(level.upper())
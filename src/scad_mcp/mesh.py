@@ -0,0 +1,447 @@
+"""Triangle mesh loading and comparison for exported STL files."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import re
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+from xml.sax.saxutils import quoteattr
+import zipfile
+
+from scad_mcp.models import MeshStats
+from scad_mcp.normalize import zip_entry
+
+LOGGER = logging.getLogger("scad_mcp.mesh")
+
+VERTEX_PATTERN = re.compile(rb"vertex\s+(\S+)\s+(\S+)\s+(\S+)")
+
+
+def load_numpy() -> ModuleType:
+    """Import NumPy on first use.
+
+    Returns:
+        The numpy module.
+
+    Raises:
+        RuntimeError: When NumPy is not installed.
+    """
+    try:
+        import numpy
+    except ImportError as exc:
+        raise RuntimeError("Mesh analysis requires NumPy. Install scad-mcp[mesh].") from exc
+    return numpy
+
+
+def load_kdtree() -> type:
+    """Import SciPy's KD-tree on first use.
+
+    Returns:
+        The scipy.spatial.cKDTree class.
+
+    Raises:
+        RuntimeError: When SciPy is not installed.
+    """
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError as exc:
+        raise RuntimeError("Mesh distance requires SciPy. Install scad-mcp[mesh].") from exc
+    return cKDTree
+
+
+def load_stl(path: Path) -> Any:
+    """Load an ASCII or binary STL file.
+
+    Args:
+        path: STL file path.
+
+    Returns:
+        Float64 array of shape (triangles, 3, 3).
+
+    Raises:
+        ValueError: When the file is not a readable STL.
+    """
+    np = load_numpy()
+    data = path.read_bytes()
+    if len(data) >= 84:
+        count = int.from_bytes(data[80:84], "little")
+        if len(data) == 84 + 50 * count:
+            record = np.dtype([("normal", "<f4", 3), ("vertices", "<f4", (3, 3)), ("attr", "<u2")])
+            return np.frombuffer(data, dtype=record, count=count, offset=84)["vertices"].astype(np.float64)
+    if data.lstrip()[:5].lower() != b"solid":
+        raise ValueError(f"Not an STL file: {path}")
+    vertices = np.array(VERTEX_PATTERN.findall(data), dtype=np.float64)
+    if len(vertices) % 3:
+        raise ValueError(f"Malformed ASCII STL: {path}")
+    return vertices.reshape(-1, 3, 3)
+
+
+def mesh_stats(triangles: Any) -> MeshStats:
+    """Compute triangle count, enclosed volume, and bounding box.
+
+    Args:
+        triangles: Array of shape (triangles, 3, 3).
+
+    Returns:
+        MeshStats for the mesh.
+    """
+    np = load_numpy()
+    if len(triangles) == 0:
+        return MeshStats(triangles=0, volume=0.0, bbox_min=(0.0, 0.0, 0.0), bbox_max=(0.0, 0.0, 0.0))
+    v0, v1, v2 = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    volume = abs(float(np.einsum("ij,ij->i", v0, np.cross(v1, v2)).sum()) / 6.0)
+    points = triangles.reshape(-1, 3)
+    return MeshStats(
+        triangles=len(triangles),
+        volume=volume,
+        bbox_min=tuple(float(value) for value in points.min(axis=0)),
+        bbox_max=tuple(float(value) for value in points.max(axis=0)),
+    )
+
+
+def sample_surface(triangles: Any, count: int, seed: int = 0) -> Any:
+    """Sample points on a mesh surface, weighted by triangle area.
+
+    Vertices are always included so small features are not missed.
+
+    Args:
+        triangles: Array of shape (triangles, 3, 3).
+        count: Number of random surface samples.
+        seed: Random seed, fixed so repeated comparisons agree.
+
+    Returns:
+        Array of shape (points, 3).
+    """
+    np = load_numpy()
+    vertices = np.unique(triangles.reshape(-1, 3), axis=0)
+    areas = np.linalg.norm(np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]), axis=1)
+    if count <= 0 or areas.sum() == 0:
+        return vertices
+    rng = np.random.default_rng(seed)
+    chosen = rng.choice(len(triangles), size=count, p=areas / areas.sum())
+    u, v = rng.random((2, count))
+    flip = u + v > 1.0
+    u[flip], v[flip] = 1.0 - u[flip], 1.0 - v[flip]
+    picked = triangles[chosen]
+    samples = picked[:, 0] + u[:, None] * (picked[:, 1] - picked[:, 0]) + v[:, None] * (picked[:, 2] - picked[:, 0])
+    return np.concatenate([vertices, samples])
+
+
+def _triangle_distance(points: Any, a: Any, b: Any, c: Any) -> Any:
+    """Distance from each point to its paired triangle.
+
+    Follows the Voronoi-region walk from Ericson, Real-Time Collision
+    Detection 5.1.5, evaluated for all pairs at once.
+
+    Args:
+        points: Array of shape (pairs, 3).
+        a: First triangle corners, shape (pairs, 3).
+        b: Second triangle corners, shape (pairs, 3).
+        c: Third triangle corners, shape (pairs, 3).
+
+    Returns:
+        Array of shape (pairs,); NaN for degenerate triangles.
+    """
+    np = load_numpy()
+
+    def dot(left: Any, right: Any) -> Any:
+        return np.einsum("ij,ij->i", left, right)
+
+    ab, ac, ap, bp, cp = b - a, c - a, points - a, points - b, points - c
+    d1, d2, d3, d4, d5, d6 = dot(ab, ap), dot(ac, ap), dot(ab, bp), dot(ac, bp), dot(ab, cp), dot(ac, cp)
+    va, vb, vc = d3 * d6 - d5 * d4, d5 * d2 - d1 * d6, d1 * d4 - d3 * d2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total = va + vb + vc
+        closest = a + ab * (vb / total)[:, None] + ac * (vc / total)[:, None]
+        # Later regions take precedence, matching the order of Ericson's early returns.
+        regions = [
+            ((va <= 0) & (d4 >= d3) & (d5 >= d6), b + (c - b) * ((d4 - d3) / ((d4 - d3) + (d5 - d6)))[:, None]),
+            ((vb <= 0) & (d2 >= 0) & (d6 <= 0), a + ac * (d2 / (d2 - d6))[:, None]),
+            ((d6 >= 0) & (d5 <= d6), c),
+            ((vc <= 0) & (d1 >= 0) & (d3 <= 0), a + ab * (d1 / (d1 - d3))[:, None]),
+            ((d3 >= 0) & (d4 <= d3), b),
+            ((d1 <= 0) & (d2 <= 0), a),
+        ]
+        for mask, point in regions:
+            closest = np.where(mask[:, None], point, closest)
+    return np.linalg.norm(points - closest, axis=1)
+
+
+def _subdivide(triangles: Any, radius: float) -> Any:
+    """Split triangles along their longest edge until each fits a radius.
+
+    The split triangles cover the same surface, so distances to them are
+    unchanged, but every triangle lies within radius of its centroid.
+
+    Args:
+        triangles: Array of shape (triangles, 3, 3).
+        radius: Largest allowed centroid-to-corner distance.
+
+    Returns:
+        Array of shape (triangles, 3, 3).
+    """
+    np = load_numpy()
+    done = []
+    pending = triangles
+    while len(pending):
+        centroids = pending.mean(axis=1)
+        spread = np.linalg.norm(pending - centroids[:, None], axis=2).max(axis=1)
+        large = spread > radius
+        done.append(pending[~large])
+        pending = pending[large]
+        if not len(pending):
+            break
+        # Rotate each triangle so its longest edge runs from corner 0 to corner 1.
+        edges = np.linalg.norm(pending - np.roll(pending, -1, axis=1), axis=2)
+        order = (np.argmax(edges, axis=1)[:, None] + np.arange(3)) % 3
+        pending = np.take_along_axis(pending, order[:, :, None], axis=1)
+        middle = (pending[:, 0] + pending[:, 1]) / 2.0
+        pending = np.concatenate(
+            [
+                np.stack([pending[:, 0], middle, pending[:, 2]], axis=1),
+                np.stack([middle, pending[:, 1], pending[:, 2]], axis=1),
+            ]
+        )
+    return np.concatenate(done)
+
+
+def point_mesh_distance(points: Any, triangles: Any, chunk: int = 4096) -> Any:
+    """Compute the distance from each point to the nearest mesh triangle.
+
+    Distances are exact for points near the surface. Points farther away
+    than twice the subdivision radius are measured against the triangles
+    around their nearest centroids only, which can overestimate by at
+    most that radius.
+
+    Args:
+        points: Array of shape (points, 3).
+        triangles: Array of shape (triangles, 3, 3).
+        chunk: Points processed per batch, bounding memory use.
+
+    Returns:
+        Array of shape (points,).
+    """
+    np = load_numpy()
+    kdtree = load_kdtree()
+    area = float(np.linalg.norm(np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]), axis=1).sum())
+    extent = float(np.ptp(triangles.reshape(-1, 3), axis=0).max())
+    # Cut the mesh to roughly the point spacing so each point has a handful of
+    # candidate triangles; the extent floor keeps degenerate meshes bounded.
+    pieces = _subdivide(triangles, max((area / max(len(points), 1)) ** 0.5, extent * 1e-3, 1e-9))
+    centroids = pieces.mean(axis=1)
+    radius = float(np.linalg.norm(pieces - centroids[:, None], axis=2).max()) * (1.0 + 1e-9)
+    tree = kdtree(centroids)
+
+    def nearest(batch: Any, found: list[Any]) -> Any:
+        counts = np.fromiter(map(len, found), dtype=np.intp, count=len(found))
+        candidates = pieces[np.fromiter(itertools.chain.from_iterable(found), dtype=np.intp, count=int(counts.sum()))]
+        pair_distances = _triangle_distance(
+            np.repeat(batch, counts, axis=0), candidates[:, 0], candidates[:, 1], candidates[:, 2]
+        )
+        pair_distances = np.where(np.isnan(pair_distances), np.inf, pair_distances)
+        return np.minimum.reduceat(pair_distances, np.concatenate([[0], np.cumsum(counts)[:-1]]))
+
+    centroid_distances, closest = tree.query(points, k=min(4, len(pieces)))
+    centroid_distances = centroid_distances.reshape(len(points), -1)
+    closest = closest.reshape(len(points), -1)
+    candidates = pieces[closest.ravel()]
+    bounds = _triangle_distance(
+        np.repeat(points, closest.shape[1], axis=0), candidates[:, 0], candidates[:, 1], candidates[:, 2]
+    )
+    bounds = np.where(np.isnan(bounds), np.inf, bounds).reshape(closest.shape).min(axis=1)
+    distances = np.minimum(bounds, centroid_distances[:, 0])
+    near = np.flatnonzero(distances <= 2.0 * radius)
+    for start in range(0, len(near), chunk):
+        rows = near[start:start + chunk]
+        # Any triangle closer than the current bound has its centroid inside this ball.
+        found = tree.query_ball_point(points[rows], distances[rows] + radius)
+        distances[rows] = np.minimum(distances[rows], nearest(points[rows], found))
+    return distances
+
+
+def surface_distance(triangles_a: Any, triangles_b: Any, count: int, seed: int = 0) -> tuple[float, float]:
+    """Compute symmetric Hausdorff and mean surface distances of two meshes.
+
+    Points sampled on each mesh are measured against the other mesh's
+    triangles rather than its samples, so two triangulations of the same
+    surface are at distance zero.
+
+    Args:
+        triangles_a: Array of shape (triangles, 3, 3) for the first mesh.
+        triangles_b: Array of shape (triangles, 3, 3) for the second mesh.
+        count: Random surface samples per mesh.
+        seed: Random seed, fixed so repeated comparisons agree.
+
+    Returns:
+        Tuple of Hausdorff distance and mean point-to-surface distance.
+    """
+    np = load_numpy()
+    if len(triangles_a) == 0 or len(triangles_b) == 0:
+        return (0.0, 0.0) if len(triangles_a) == len(triangles_b) else (float("inf"), float("inf"))
+    a_to_b = point_mesh_distance(sample_surface(triangles_a, count, seed), triangles_b)
+    b_to_a = point_mesh_distance(sample_surface(triangles_b, count, seed), triangles_a)
+    hausdorff = max(float(a_to_b.max()), float(b_to_a.max()))
+    mean = float(np.concatenate([a_to_b, b_to_a]).mean())
+    return hausdorff, mean
+
+
+def index_vertices(triangles: Any) -> tuple[Any, Any]:
+    """Convert a triangle soup into shared vertices and face indices.
+
+    Args:
+        triangles: Array of shape (triangles, 3, 3).
+
+    Returns:
+        Tuple of vertex array (vertices, 3) and face index array (triangles, 3).
+    """
+    np = load_numpy()
+    vertices, inverse = np.unique(triangles.reshape(-1, 3), axis=0, return_inverse=True)
+    return vertices, inverse.reshape(-1, 3)
+
+
+def _format_number(precision: int | None) -> str:
+    return f"{{:.{precision}f}}" if precision is not None else "{:.9g}"
+
+
+def write_stl(path: Path, triangles: Any, binary: bool = True, precision: int | None = None) -> None:
+    """Write an STL file.
+
+    Args:
+        path: Destination path.
+        triangles: Array of shape (triangles, 3, 3).
+        binary: Write binary STL when True, ASCII otherwise.
+        precision: Decimal places for ASCII coordinates, or None for shortest round-trip.
+    """
+    np = load_numpy()
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+    if binary:
+        record = np.dtype([("normal", "<f4", 3), ("vertices", "<f4", (3, 3)), ("attr", "<u2")])
+        data = np.zeros(len(triangles), dtype=record)
+        data["normal"] = normals
+        data["vertices"] = triangles
+        header = b"scad-mcp binary STL".ljust(80, b" ")
+        path.write_bytes(header + len(triangles).to_bytes(4, "little") + data.tobytes())
+        return
+    number = _format_number(precision)
+    vertex_line = f"      vertex {number} {number} {number}\n"
+    normal_line = f"  facet normal {number} {number} {number}\n"
+    with path.open("w", encoding="ascii", newline="\n") as handle:
+        handle.write("solid OpenSCAD_Model\n")
+        for normal, triangle in zip(normals.tolist(), triangles.tolist()):
+            handle.write(normal_line.format(*normal))
+            handle.write("    outer loop\n")
+            for vertex in triangle:
+                handle.write(vertex_line.format(*vertex))
+            handle.write("    endloop\n  endfacet\n")
+        handle.write("endsolid OpenSCAD_Model\n")
+
+
+def write_off(path: Path, triangles: Any, precision: int | None = None) -> None:
+    """Write an OFF file.
+
+    Args:
+        path: Destination path.
+        triangles: Array of shape (triangles, 3, 3).
+        precision: Decimal places for coordinates, or None for shortest round-trip.
+    """
+    vertices, faces = index_vertices(triangles)
+    number = _format_number(precision)
+    vertex_line = f"{number} {number} {number}\n"
+    with path.open("w", encoding="ascii", newline="\n") as handle:
+        handle.write(f"OFF\n{len(vertices)} {len(faces)} 0\n")
+        handle.writelines(vertex_line.format(*vertex) for vertex in vertices.tolist())
+        handle.writelines(f"3 {a} {b} {c}\n" for a, b, c in faces.tolist())
+
+
+THREE_MF_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+    "</Types>\n"
+)
+THREE_MF_RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+    'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+    "</Relationships>\n"
+)
+
+
+def write_3mf(
+    path: Path,
+    objects: list[tuple[str, Any]],
+    compression: int | None = None,
+    precision: int | None = None,
+) -> None:
+    """Write a 3MF package with one mesh object per entry.
+
+    Args:
+        path: Destination path.
+        objects: List of (name, triangles) pairs.
+        compression: Deflate level 0-9, where 0 stores entries uncompressed.
+        precision: Decimal places for coordinates, or None for shortest round-trip.
+    """
+    number = _format_number(precision)
+    vertex_tag = f'<vertex x="{number}" y="{number}" z="{number}"/>'
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<model unit="millimeter" xml:lang="en-US" '
+        'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02"><resources>'
+    ]
+    for object_id, (name, triangles) in enumerate(objects, start=1):
+        vertices, faces = index_vertices(triangles)
+        parts.append(f'<object id="{object_id}" name={quoteattr(name)} type="model"><mesh><vertices>')
+        parts.extend(vertex_tag.format(*vertex) for vertex in vertices.tolist())
+        parts.append("</vertices><triangles>")
+        parts.extend(f'<triangle v1="{a}" v2="{b}" v3="{c}"/>' for a, b, c in faces.tolist())
+        parts.append("</triangles></mesh></object>")
+    parts.append("</resources><build>")
+    parts.extend(f'<item objectid="{object_id}"/>' for object_id in range(1, len(objects) + 1))
+    parts.append("</build></model>\n")
+
+    method = zipfile.ZIP_STORED if compression == 0 else zipfile.ZIP_DEFLATED
+    # Fixed entry metadata keeps identical meshes byte-identical.
+    level = compression or None
+    with zipfile.ZipFile(path, "w") as package:
+        package.writestr(zip_entry("[Content_Types].xml", method), THREE_MF_CONTENT_TYPES, compresslevel=level)
+        package.writestr(zip_entry("_rels/.rels", method), THREE_MF_RELS, compresslevel=level)
+        package.writestr(zip_entry("3D/3dmodel.model", method), "".join(parts), compresslevel=level)
+
+
+MESH_WRITERS = {"stl", "off", "3mf"}
+
+
+def write_mesh(
+    path: Path,
+    triangles: Any,
+    stl_encoding: str = "binary",
+    compression: int | None = None,
+    precision: int | None = None,
+) -> None:
+    """Write triangles in the format given by the path suffix.
+
+    Args:
+        path: Destination path ending in .stl, .off, or .3mf.
+        triangles: Array of shape (triangles, 3, 3).
+        stl_encoding: "binary" or "ascii" for STL output.
+        compression: Deflate level for 3MF output.
+        precision: Decimal places for text coordinates.
+
+    Raises:
+        ValueError: When the format has no writer.
+    """
+    fmt = path.suffix.lstrip(".").lower()
+    if fmt == "stl":
+        write_stl(path, triangles, binary=stl_encoding == "binary", precision=precision)
+    elif fmt == "off":
+        write_off(path, triangles, precision=precision)
+    elif fmt == "3mf":
+        write_3mf(path, [(path.stem, triangles)], compression=compression, precision=precision)
+    else:
+        raise ValueError(f"No mesh writer for format: {fmt}")
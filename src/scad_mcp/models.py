@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Sequence
+from typing import Mapping, Sequence
+
+DefineValue = bool | int | float | str
 
 
 @dataclass(frozen=True)
@@ -16,6 +18,13 @@ class OpenScadInfo:
     details: str
 
 
+@dataclass(frozen=True)
+class BoundingBox:
+    """Axis-aligned bounds of a model's geometry."""
+    minimum: tuple[float, float, float]
+    maximum: tuple[float, float, float]
+
+
 @dataclass(frozen=True)
 class RenderRequest:
     """Input parameters for a render request."""
@@ -24,6 +33,11 @@ class RenderRequest:
     fov: float
     angles: Sequence[str]
     output_dir: Path
+    defines: Mapping[str, DefineValue] = field(default_factory=dict)
+    quality: str = "standard"
+    azimuth: float | None = None
+    elevation: float = 0.0
+    bounds: BoundingBox | None = None
 
 
 @dataclass(frozen=True)
@@ -33,11 +47,30 @@ class RenderResult:
     command: list[str]
 
 
+@dataclass(frozen=True)
+class OpenScadCapabilities:
+    """Command-line features supported by an OpenSCAD build."""
+    export_format: bool = False
+    backend_option: bool = False
+    manifold: bool = False
+    summary: bool = False
+
+
+@dataclass(frozen=True)
+class ExportOptions:
+    """Format options for an export."""
+    stl_encoding: str | None = None
+    compression: int | None = None
+    decimal_precision: int | None = None
+
+
 @dataclass(frozen=True)
 class ConvertRequest:
     """Input parameters for a convert request."""
     scad_file: Path
     output_file: Path
+    defines: Mapping[str, DefineValue] = field(default_factory=dict)
+    options: ExportOptions = ExportOptions()
 
 
 @dataclass(frozen=True)
@@ -45,3 +78,69 @@ class ConvertResult:
     """Result of a convert operation."""
     output_path: Path
     command: list[str]
+
+
+@dataclass(frozen=True)
+class ImageDiff:
+    """Pixel comparison of two renders."""
+    changed_pixels: int
+    total_pixels: int
+    similarity: float
+    bbox: tuple[int, int, int, int] | None
+    heatmap_path: Path
+
+
+@dataclass(frozen=True)
+class MeshStats:
+    """Summary statistics of a triangle mesh."""
+    triangles: int
+    volume: float
+    bbox_min: tuple[float, float, float]
+    bbox_max: tuple[float, float, float]
+
+
+@dataclass(frozen=True)
+class AssemblyPart:
+    """One top-level object of an assembly with the source that builds it alone."""
+    name: str
+    source: str
+
+
+@dataclass(frozen=True)
+class LibraryFile:
+    """Definitions and references of one SCAD file.
+
+    Attributes:
+        path: Resolved file path.
+        digest: Content digest of the file.
+        modules: Top-level module names.
+        functions: Top-level function names.
+        references: ("use" or "include", target) pairs in source order.
+        calls: Names called in the file but not defined in it.
+    """
+    path: Path
+    digest: str
+    modules: frozenset[str]
+    functions: frozenset[str]
+    references: tuple[tuple[str, str], ...]
+    calls: frozenset[str]
+
+
+@dataclass(frozen=True)
+class JobRecord:
+    """One render or convert job as stored in the job history."""
+    kind: str
+    source: str
+    source_hash: str | None
+    parameters: str
+    started_at: float
+    queue_seconds: float
+    run_seconds: float
+    cpu_seconds: float | None
+    status: str
+    cached: bool
+    output_path: str | None
+    output_bytes: int | None
+    command: str | None
+    error: str | None
+    placement: str | None = None
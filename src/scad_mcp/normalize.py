@@ -0,0 +1,115 @@
+"""Strip nondeterministic metadata so identical inputs give identical bytes."""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+import struct
+import zipfile
+
+from scad_mcp.workspace import partial_file
+
+LOGGER = logging.getLogger("scad_mcp.normalize")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Timestamps and free-form text such as "Creation Time" or "Software".
+PNG_VOLATILE_CHUNKS = {b"tIME", b"tEXt", b"zTXt", b"iTXt"}
+# Earliest timestamp a zip entry can hold.
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+def zip_entry(name: str, compress_type: int) -> zipfile.ZipInfo:
+    """Return zip entry metadata that does not depend on time or platform.
+
+    Args:
+        name: Entry name.
+        compress_type: zipfile compression constant.
+
+    Returns:
+        ZipInfo with a fixed timestamp, permissions and creator system.
+    """
+    info = zipfile.ZipInfo(name, date_time=ZIP_EPOCH)
+    info.compress_type = compress_type
+    info.create_system = 3
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def _zip_order(name: str) -> tuple[bool, str]:
+    """Sort key placing the OPC content types part first, then by name."""
+    return name != "[Content_Types].xml", name
+
+
+def normalize_zip(path: Path, compression: int | None = None) -> None:
+    """Rewrite a zip package such as 3MF with deterministic entries.
+
+    Entries are sorted, timestamps and attributes fixed, and extra fields and
+    comments dropped.
+
+    Args:
+        path: Zip file to rewrite in place.
+        compression: Optional deflate level 0-9, where 0 stores entries. By
+            default each entry keeps its compression method.
+    """
+    with partial_file(path) as partial:
+        with zipfile.ZipFile(path) as source, zipfile.ZipFile(partial, "w") as target:
+            for info in sorted(source.infolist(), key=lambda item: _zip_order(item.filename)):
+                if compression is None:
+                    method = info.compress_type
+                else:
+                    method = zipfile.ZIP_STORED if compression == 0 else zipfile.ZIP_DEFLATED
+                target.writestr(zip_entry(info.filename, method), source.read(info), compresslevel=compression or None)
+
+
+def normalize_png(path: Path) -> bool:
+    """Remove timestamp and text chunks from a PNG file.
+
+    Args:
+        path: PNG file to rewrite in place when needed.
+
+    Returns:
+        Whether any chunk was removed.
+    """
+    data = path.read_bytes()
+    if not data.startswith(PNG_SIGNATURE):
+        LOGGER.warning("Not a PNG file, leaving it unchanged: %s", path)
+        return False
+    kept = [PNG_SIGNATURE]
+    offset = len(PNG_SIGNATURE)
+    removed = False
+    while offset + 8 <= len(data):
+        (length,) = struct.unpack(">I", data[offset:offset + 4])
+        chunk_type = data[offset + 4:offset + 8]
+        end = offset + 12 + length
+        if end > len(data):
+            LOGGER.warning("Truncated PNG chunk, leaving file unchanged: %s", path)
+            return False
+        if chunk_type in PNG_VOLATILE_CHUNKS:
+            removed = True
+        else:
+            kept.append(data[offset:end])
+        offset = end
+        if chunk_type == b"IEND":
+            break
+    if removed:
+        with partial_file(path) as partial:
+            partial.write_bytes(b"".join(kept))
+    return removed
+
+
+def normalize_output(path: Path, compression: int | None = None) -> None:
+    """Normalize a render or export in place according to its format.
+
+    PNG images lose timestamp and text chunks; 3MF packages get fixed entry
+    order and timestamps. Other formats are written deterministically by
+    OpenSCAD and left unchanged.
+
+    Args:
+        path: Output file.
+        compression: Optional deflate level for zip packages.
+    """
+    fmt = path.suffix.lstrip(".").lower()
+    if fmt == "png":
+        normalize_png(path)
+    elif fmt == "3mf":
+        normalize_zip(path, compression)
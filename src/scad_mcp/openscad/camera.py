@@ -0,0 +1,231 @@
+"""Camera placement and bounding-box probes for OpenSCAD renders."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+from scad_mcp.mesh import load_stl, mesh_stats
+from scad_mcp.models import BoundingBox, DefineValue, OpenScadCapabilities
+from scad_mcp.openscad.cli import backend_args, define_args, run_openscad
+
+LOGGER = logging.getLogger("scad_mcp.openscad.camera")
+
+ANGLE_VECTORS = {
+    "top": (0.0, 0.0, 1.0),
+    "bottom": (0.0, 0.0, -1.0),
+    "front": (0.0, -1.0, 0.0),
+    "back": (0.0, 1.0, 0.0),
+    "left": (-1.0, 0.0, 0.0),
+    "right": (1.0, 0.0, 0.0),
+}
+
+# Elevation at which the three axes are foreshortened equally.
+ISOMETRIC_ELEVATION = math.degrees(math.atan(1 / math.sqrt(2)))
+VIEW_PRESETS = {
+    "isometric": (45.0, ISOMETRIC_ELEVATION),
+    "isometric_front_left": (315.0, ISOMETRIC_ELEVATION),
+    "isometric_back_right": (135.0, ISOMETRIC_ELEVATION),
+    "isometric_back_left": (225.0, ISOMETRIC_ELEVATION),
+}
+
+# Empty space kept around the bounding sphere when framing.
+FRAME_MARGIN = 1.1
+# Vertical field of view of OpenSCAD's camera in degrees. The command line
+# offers no way to change it, so framing is computed for this lens.
+OPENSCAD_FOV = 22.5
+# Degrees kept when canonicalizing orbits, so float noise maps to one cache entry.
+ORBIT_DECIMALS = 2
+
+
+def orbit_from_angles(angles: list[str]) -> tuple[float, float]:
+    """Convert named view angles to an orbit, averaging combined angles.
+
+    Args:
+        angles: Normalized view angles, e.g. ["top", "front"].
+
+    Returns:
+        (azimuth, elevation) in degrees. Conflicting angles fall back to the front.
+    """
+    x = sum(ANGLE_VECTORS[angle][0] for angle in angles)
+    y = sum(ANGLE_VECTORS[angle][1] for angle in angles)
+    z = sum(ANGLE_VECTORS[angle][2] for angle in angles)
+    if not (x or y or z):
+        return 0.0, 0.0
+    return math.degrees(math.atan2(x, -y)), math.degrees(math.atan2(z, math.hypot(x, y)))
+
+
+def canonical_orbit(azimuth: float, elevation: float) -> tuple[float, float]:
+    """Normalize an orbit so equivalent views compare equal.
+
+    Args:
+        azimuth: Degrees around the Z axis; 0 looks from the front, 90 from the right.
+        elevation: Degrees above the XY plane.
+
+    Returns:
+        Azimuth in [0, 360) and elevation, both rounded. Straight up or down
+        views have azimuth 0.
+    """
+    elevation = round(elevation, ORBIT_DECIMALS) + 0.0
+    azimuth = round(azimuth % 360.0, ORBIT_DECIMALS) % 360.0 + 0.0
+    if abs(elevation) == 90.0:
+        azimuth = 0.0
+    return azimuth, elevation
+
+
+def _eye_direction(azimuth: float, elevation: float) -> tuple[float, float, float]:
+    azimuth_rad = math.radians(azimuth)
+    elevation_rad = math.radians(elevation)
+    return (
+        math.cos(elevation_rad) * math.sin(azimuth_rad),
+        -math.cos(elevation_rad) * math.cos(azimuth_rad),
+        math.sin(elevation_rad),
+    )
+
+
+def _vector_camera(eye: tuple[float, float, float], center: tuple[float, float, float]) -> str:
+    # Rounding removes float noise such as -9e-15 so equal views give equal strings.
+    return ",".join(f"{round(value, 6) + 0.0:g}" for value in (*eye, *center))
+
+
+def orbit_camera(azimuth: float, elevation: float, fov: float) -> str:
+    """Build a vector camera string orbiting the origin at a fixed distance.
+
+    OpenSCAD's --autocenter and --viewall then frame the model.
+
+    Args:
+        azimuth: Degrees around the Z axis; 0 looks from the front, 90 from the right.
+        elevation: Degrees above the XY plane, -90 to 90.
+        fov: Field of view in degrees.
+
+    Returns:
+        Camera parameter string for OpenSCAD in format:
+        eye_x,eye_y,eye_z,center_x,center_y,center_z
+    """
+    dist = max(30.0, 200.0 - fov)
+    direction = _eye_direction(azimuth, elevation)
+    return _vector_camera(tuple(dist * value for value in direction), (0.0, 0.0, 0.0))
+
+
+def framed_camera(
+    azimuth: float,
+    elevation: float,
+    bounds: BoundingBox,
+    aspect: float = 1.0,
+) -> str:
+    """Build a vector camera string that frames a bounding box.
+
+    The camera looks at the box center from far enough away that the box's
+    bounding sphere fits the narrower side of the image through OpenSCAD's
+    lens, so framing no longer depends on OpenSCAD's --autocenter and
+    --viewall passes and stays steady as the camera orbits.
+
+    Args:
+        azimuth: Degrees around the Z axis; 0 looks from the front, 90 from the right.
+        elevation: Degrees above the XY plane, -90 to 90.
+        bounds: Bounding box of the model.
+        aspect: Image width divided by height.
+
+    Returns:
+        Camera parameter string for OpenSCAD in the format of orbit_camera.
+    """
+    center = tuple((low + high) / 2 for low, high in zip(bounds.minimum, bounds.maximum))
+    radius = max(math.dist(bounds.minimum, bounds.maximum) / 2, 0.5)
+    half_vertical = math.radians(OPENSCAD_FOV) / 2
+    half_horizontal = math.atan(math.tan(half_vertical) * aspect)
+    dist = radius * FRAME_MARGIN / math.sin(min(half_vertical, half_horizontal))
+    direction = _eye_direction(azimuth, elevation)
+    eye = tuple(origin + dist * value for origin, value in zip(center, direction))
+    return _vector_camera(eye, center)
+
+
+def union_bounds(boxes: Sequence[BoundingBox]) -> BoundingBox:
+    """Return the smallest box containing all of the given boxes.
+
+    Args:
+        boxes: One or more bounding boxes.
+
+    Returns:
+        Bounding box enclosing every input box.
+    """
+    return BoundingBox(
+        minimum=tuple(min(values) for values in zip(*(box.minimum for box in boxes))),
+        maximum=tuple(max(values) for values in zip(*(box.maximum for box in boxes))),
+    )
+
+
+def _find_bounds(summary: Any) -> BoundingBox | None:
+    """Search an OpenSCAD JSON summary for its bounding box."""
+    if isinstance(summary, dict):
+        box = summary.get("bounding_box")
+        if isinstance(box, dict) and "min" in box and "max" in box:
+            return BoundingBox(
+                minimum=tuple(float(value) for value in box["min"]),
+                maximum=tuple(float(value) for value in box["max"]),
+            )
+        for value in summary.values():
+            found = _find_bounds(value)
+            if found:
+                return found
+    return None
+
+
+async def probe_bounds(
+    scad_file: Path,
+    defines: Mapping[str, DefineValue],
+    openscad_path: Path,
+    scratch_dir: Path,
+    timeout: float | None = None,
+    backend: str | None = None,
+    capabilities: OpenScadCapabilities | None = None,
+) -> BoundingBox:
+    """Evaluate a model's geometry and return its bounding box.
+
+    Builds with --summary-file report the box directly; otherwise the
+    exported binary STL is measured, which requires NumPy.
+
+    Args:
+        scad_file: Model to measure.
+        defines: SCAD variable overrides.
+        openscad_path: OpenSCAD executable.
+        scratch_dir: Job workspace for the throwaway export.
+        timeout: Optional limit in seconds for the OpenSCAD process.
+        backend: Optional geometry backend, "manifold" or "cgal".
+        capabilities: Features of the OpenSCAD build.
+
+    Returns:
+        Bounding box of the evaluated geometry.
+
+    Raises:
+        RuntimeError: When OpenSCAD fails.
+        TimeoutError: When OpenSCAD exceeds the timeout.
+    """
+    capabilities = capabilities or OpenScadCapabilities()
+    mesh_path = scratch_dir / f"{scad_file.stem}.bounds.stl"
+    summary_path = scratch_dir / f"{scad_file.stem}.summary.json"
+    command = [
+        str(openscad_path),
+        "-o",
+        str(mesh_path),
+        str(scad_file),
+        *define_args(defines),
+        *(["--export-format", "binstl"] if capabilities.export_format else []),
+        *backend_args(backend, capabilities),
+    ]
+    if capabilities.summary:
+        command.extend(["--summary", "bounding-box", "--summary-file", str(summary_path)])
+    exit_code, stdout, stderr = await run_openscad(command, timeout=timeout)
+    if exit_code != 0:
+        message = stderr.strip() or stdout.strip() or "OpenSCAD bounding box probe failed."
+        LOGGER.error("Bounding box probe failed: %s", message)
+        raise RuntimeError(message)
+    if summary_path.exists():
+        bounds = _find_bounds(json.loads(summary_path.read_text(encoding="utf-8")))
+        if bounds:
+            return bounds
+    stats = mesh_stats(await asyncio.to_thread(load_stl, mesh_path))
+    return BoundingBox(minimum=stats.bbox_min, maximum=stats.bbox_max)
@@ -3,30 +3,161 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
 import logging
 from pathlib import Path
+from typing import Mapping
+
+from scad_mcp.execution import CURRENT_PLACEMENT, OUTPUT_LIMITS, placed_command
+from scad_mcp.models import DefineValue, OpenScadCapabilities
+from scad_mcp.openscad.output import OutputCapture
 
 
 LOGGER = logging.getLogger("scad_mcp.openscad.cli")
 
+READ_CHUNK_BYTES = 64 * 1024
+
 
-async def run_openscad(command: list[str]) -> tuple[int, str, str]:
+async def run_openscad(command: list[str], timeout: float | None = None) -> tuple[int, str, str]:
     """Run an OpenSCAD subprocess and capture output.
 
+    Both streams are drained as they are produced and kept within
+    OUTPUT_LIMITS, so a model that echoes millions of lines cannot exhaust
+    memory; the middle of a long stream is replaced by an omission marker.
+    Within a worker slot, the process is pinned and prioritized according
+    to the slot's placement.
+
     Args:
         command: Command list passed to the OpenSCAD executable.
+        timeout: Optional limit in seconds after which the process is killed.
 
     Returns:
         Tuple of exit code, stdout, and stderr.
+
+    Raises:
+        TimeoutError: When the process exceeds the timeout.
     """
     LOGGER.debug("Running OpenSCAD command: %s", " ".join(command))
+    placement = CURRENT_PLACEMENT.get()
     process = await asyncio.create_subprocess_exec(
-        *command,
+        *(placed_command(command, placement) if placement is not None else command),
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
     )
-    stdout, stderr = await process.communicate()
-    return process.returncode or 0, stdout.decode("utf-8", "ignore"), stderr.decode("utf-8", "ignore")
+    limits = OUTPUT_LIMITS
+    captures: list[OutputCapture] = []
+    try:
+        # Created once the process runs, so a failed exec leaves no spill files behind.
+        for name in ("stdout", "stderr"):
+            captures.append(OutputCapture(limits.head_lines, limits.tail_lines, limits.log_dir, name))
+        await asyncio.wait_for(
+            asyncio.gather(
+                _drain(process.stdout, captures[0]),
+                _drain(process.stderr, captures[1]),
+                process.wait(),
+            ),
+            timeout,
+        )
+    except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+        process.kill()
+        await process.wait()
+        if isinstance(exc, asyncio.CancelledError):
+            raise
+        LOGGER.error("OpenSCAD timed out after %s seconds", timeout)
+        raise TimeoutError(f"OpenSCAD timed out after {timeout} seconds.") from exc
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        for capture in captures:
+            capture.close()
+    for capture in captures:
+        if capture.dropped:
+            LOGGER.warning("Dropped %s lines of OpenSCAD output%s", capture.dropped,
+                           f"; full output in {capture.spill_path}" if capture.spill_path else "")
+    return process.returncode or 0, captures[0].text(), captures[1].text()
+
+
+async def _drain(stream: asyncio.StreamReader | None, capture: OutputCapture) -> None:
+    if stream is None:
+        return
+    while chunk := await stream.read(READ_CHUNK_BYTES):
+        capture.feed(chunk)
+
+
+def define_args(defines: Mapping[str, DefineValue]) -> list[str]:
+    """Build -D arguments overriding SCAD variables.
+
+    Args:
+        defines: Mapping of SCAD variable names to values.
+
+    Returns:
+        Flat argument list, sorted by variable name.
+    """
+    args: list[str] = []
+    for name in sorted(defines):
+        value = defines[name]
+        if isinstance(value, bool):
+            literal = "true" if value else "false"
+        elif isinstance(value, str):
+            literal = json.dumps(value)
+        else:
+            literal = repr(value)
+        args.extend(["-D", f"{name}={literal}"])
+    return args
+
+
+def select_backend(requested: str, capabilities: OpenScadCapabilities) -> str:
+    """Resolve a requested geometry backend against an OpenSCAD build.
+
+    Args:
+        requested: "auto", "manifold", or "cgal".
+        capabilities: Features of the OpenSCAD build.
+
+    Returns:
+        "manifold" or "cgal". Auto picks Manifold whenever the build has it.
+
+    Raises:
+        ValueError: When Manifold is requested but the build lacks it.
+    """
+    if requested == "auto":
+        return "manifold" if capabilities.manifold else "cgal"
+    if requested == "manifold" and not capabilities.manifold:
+        raise ValueError("This OpenSCAD build has no Manifold backend.")
+    return requested
+
+
+def backend_args(backend: str | None, capabilities: OpenScadCapabilities) -> list[str]:
+    """Build arguments selecting the geometry backend.
+
+    Args:
+        backend: "manifold", "cgal", or None to leave OpenSCAD's default.
+        capabilities: Features of the OpenSCAD build.
+
+    Returns:
+        Arguments to append to the OpenSCAD command.
+    """
+    if backend is None:
+        return []
+    if capabilities.backend_option:
+        return [f"--backend={backend}"]
+    return ["--enable=manifold"] if backend == "manifold" else []
+
+
+def defines_suffix(defines: Mapping[str, DefineValue]) -> str:
+    """Return a filename suffix identifying a set of variable overrides.
+
+    Args:
+        defines: Mapping of SCAD variable names to values.
+
+    Returns:
+        Empty string without overrides, otherwise "_d" plus a short hash.
+    """
+    if not defines:
+        return ""
+    payload = json.dumps(defines, sort_keys=True).encode("utf-8")
+    return f"_d{hashlib.sha256(payload).hexdigest()[:8]}"
 
 
 def resolve_openscad_path(candidates: list[Path]) -> Path | None:
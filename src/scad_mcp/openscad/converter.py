@@ -2,55 +2,132 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from pathlib import Path
 
-from scad_mcp.models import ConvertRequest, ConvertResult
-from scad_mcp.openscad.cli import run_openscad
-from scad_mcp.validation import validate_scad_file
+from scad_mcp.mesh import load_stl, write_mesh
+from scad_mcp.models import ConvertRequest, ConvertResult, OpenScadCapabilities
+from scad_mcp.normalize import normalize_output
+from scad_mcp.openscad.cli import backend_args, define_args, run_openscad
+from scad_mcp.validation import validate_defines, validate_export_options, validate_scad_file
+from scad_mcp.workspace import promote
 
 LOGGER = logging.getLogger("scad_mcp.openscad.converter")
 
 
+def export_format_args(output_format: str, stl_encoding: str | None, capabilities: OpenScadCapabilities) -> list[str]:
+    """Select explicit export format arguments for OpenSCAD.
+
+    Binary STL is preferred because it is much faster to write and parse
+    than ASCII STL; builds without --export-format keep their default.
+
+    Args:
+        output_format: Target file extension without the dot.
+        stl_encoding: Requested STL encoding, or None for the fastest.
+        capabilities: Features of the OpenSCAD build.
+
+    Returns:
+        Arguments to append to the OpenSCAD command.
+    """
+    if output_format != "stl" or not capabilities.export_format:
+        return []
+    return ["--export-format", "asciistl" if stl_encoding == "ascii" else "binstl"]
+
+
 async def convert_scad(
     request: ConvertRequest,
     openscad_path: Path,
+    timeout: float | None = None,
+    scratch_dir: Path | None = None,
+    capabilities: OpenScadCapabilities | None = None,
+    backend: str | None = None,
+    fallback: bool = True,
 ) -> ConvertResult:
     """Convert a SCAD file to another format using OpenSCAD.
 
     Args:
         request: Convert request parameters.
         openscad_path: Path to the OpenSCAD executable.
+        timeout: Optional limit in seconds for the OpenSCAD process.
+        scratch_dir: Optional job workspace OpenSCAD writes into; the finished
+            file is then moved atomically to the output path.
+        capabilities: Features of the OpenSCAD build, used to pick export and backend options.
+        backend: Optional geometry backend, "manifold" or "cgal".
+        fallback: Whether to retry a failed Manifold export with CGAL.
 
     Returns:
         ConvertResult with output path and executed command.
 
     Raises:
         FileNotFoundError: When the SCAD file does not exist.
+        ValueError: When defines or export options are invalid.
         RuntimeError: When the OpenSCAD command fails.
+        TimeoutError: When OpenSCAD exceeds the timeout.
     """
     scad_file = request.scad_file
     validate_scad_file(scad_file)
+    validate_defines(request.defines)
+    options = request.options
+    output_format = request.output_file.suffix.lstrip(".").lower()
+    validate_export_options(output_format, options.stl_encoding, options.compression, options.decimal_precision)
 
     output_file = request.output_file
     output_file.parent.mkdir(parents=True, exist_ok=True)
+    write_path = scratch_dir / output_file.name if scratch_dir else output_file
+
+    # OpenSCAD has no precision control, so such exports go through a binary STL intermediate.
+    transcode = options.decimal_precision is not None
+    export_path = write_path.with_name(f"{write_path.stem}.intermediate.stl") if transcode else write_path
+    capabilities = capabilities or OpenScadCapabilities()
+    export_args = export_format_args(
+        "stl" if transcode else output_format,
+        "binary" if transcode else options.stl_encoding,
+        capabilities,
+    )
 
-    command = [
+    base_command = [
         str(openscad_path),
         "-o",
-        str(output_file),
+        str(export_path),
         str(scad_file),
+        *define_args(request.defines),
+        *export_args,
     ]
 
     LOGGER.info("Converting %s to %s", scad_file, output_file)
-    return_code, _, stderr = await run_openscad(command)
+    for attempt in [backend, "cgal"] if backend == "manifold" and fallback else [backend]:
+        command = [*base_command, *backend_args(attempt, capabilities)]
+        return_code, _, stderr = await run_openscad(command, timeout=timeout)
+        if return_code == 0 or attempt != "manifold":
+            break
+        if fallback:
+            LOGGER.warning("Manifold backend failed on %s, retrying with CGAL: %s", scad_file, stderr.strip())
 
     if return_code != 0:
         LOGGER.error("OpenSCAD conversion failed: %s", stderr)
         raise RuntimeError(f"OpenSCAD conversion failed with code {return_code}: {stderr}")
 
-    if not output_file.exists():
+    if not export_path.exists():
         LOGGER.error("OpenSCAD conversion failed: Output file not created.")
         raise RuntimeError("OpenSCAD conversion failed: Output file not created.")
 
+    if transcode:
+        triangles = await asyncio.to_thread(load_stl, export_path)
+        await asyncio.to_thread(
+            write_mesh,
+            write_path,
+            triangles,
+            options.stl_encoding or "binary",
+            options.compression,
+            options.decimal_precision,
+        )
+        export_path.unlink()
+    else:
+        # Strip timestamps so identical inputs give identical bytes.
+        await asyncio.to_thread(normalize_output, write_path, options.compression)
+
+    if write_path != output_file:
+        promote(write_path, output_file)
+
     return ConvertResult(output_path=output_file, command=command)
@@ -5,13 +5,20 @@ from __future__ import annotations
 import logging
 import os
 from pathlib import Path
+import re
 import shutil
 
-from scad_mcp.models import OpenScadInfo
+from scad_mcp.models import OpenScadCapabilities, OpenScadInfo
 from scad_mcp.openscad.cli import resolve_openscad_path, run_openscad
 
 LOGGER = logging.getLogger("scad_mcp.openscad.installer")
 
+# Executables found on first use, keyed by configured path. Misses are not cached.
+_RESOLVED_PATHS: dict[Path | None, Path] = {}
+_CAPABILITIES: dict[Path, OpenScadCapabilities] = {}
+# Start of an option entry in --help output, e.g. "  --backend arg".
+_OPTION_LINE = re.compile(r"^\s*(-{1,2}[\w-]+)")
+
 def default_windows_paths() -> list[Path]:
     """Return default Windows OpenSCAD installation paths.
 
@@ -33,6 +40,9 @@ def find_openscad_executable(configured_path: Path | None) -> Path | None:
     Returns:
         Resolved executable path or None if not found.
     """
+    cached = _RESOLVED_PATHS.get(configured_path)
+    if cached and cached.exists():
+        return cached
     candidates: list[Path] = []
     if configured_path:
         candidates.append(configured_path)
@@ -41,7 +51,10 @@ def find_openscad_executable(configured_path: Path | None) -> Path | None:
         candidates.append(Path(which_path))
     if os.name == "nt":
         candidates.extend(default_windows_paths())
-    return resolve_openscad_path(candidates)
+    resolved = resolve_openscad_path(candidates)
+    if resolved:
+        _RESOLVED_PATHS[configured_path] = resolved
+    return resolved
 
 async def get_openscad_info(configured_path: Path | None) -> OpenScadInfo:
     """Return OpenSCAD installation details and version info.
@@ -78,3 +91,63 @@ async def get_openscad_info(configured_path: Path | None) -> OpenScadInfo:
         version=version_line,
         details="OpenSCAD detected successfully.",
     )
+
+
+def _option_help(help_text: str, option: str) -> str:
+    """Return the description of one option in OpenSCAD's --help output.
+
+    Args:
+        help_text: Output of openscad --help.
+        option: Option name, e.g. "--backend".
+
+    Returns:
+        The option's description with continuation lines joined, or an empty
+        string when the option is not listed.
+    """
+    found = False
+    parts: list[str] = []
+    for line in help_text.splitlines():
+        match = _OPTION_LINE.match(line)
+        if match:
+            if found:
+                break
+            found = match.group(1) == option
+            line = line[match.end():]
+        if found:
+            parts.append(line.strip())
+    return " ".join(parts)
+
+
+async def probe_capabilities(path: Path) -> OpenScadCapabilities:
+    """Detect optional command-line features from OpenSCAD's help text.
+
+    The result is cached per executable for the life of the process.
+
+    Args:
+        path: OpenSCAD executable path.
+
+    Returns:
+        OpenScadCapabilities for the executable; all features are off when
+        the help text cannot be read.
+    """
+    cached = _CAPABILITIES.get(path)
+    if cached is not None:
+        return cached
+    try:
+        _, stdout, stderr = await run_openscad([str(path), "--help"], timeout=30)
+    except (OSError, TimeoutError):
+        LOGGER.warning("Could not probe OpenSCAD capabilities at %s", path)
+        return OpenScadCapabilities()
+    help_text = stdout + stderr
+    # Release builds list Manifold among the --backend choices; older snapshots
+    # expose it as an --enable feature. Mentions elsewhere in the help do not count.
+    choices = f"{_option_help(help_text, '--backend')} {_option_help(help_text, '--enable')}"
+    capabilities = OpenScadCapabilities(
+        export_format="--export-format" in help_text,
+        backend_option="--backend" in help_text,
+        manifold=re.search(r"\bmanifold\b", choices, re.IGNORECASE) is not None,
+        summary="--summary-file" in help_text,
+    )
+    LOGGER.debug("OpenSCAD capabilities for %s: %s", path, capabilities)
+    _CAPABILITIES[path] = capabilities
+    return capabilities
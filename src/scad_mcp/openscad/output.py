@@ -0,0 +1,94 @@
+"""Memory-bounded capture of OpenSCAD process output."""
+
+from __future__ import annotations
+
+import codecs
+from collections import deque
+import itertools
+import os
+from pathlib import Path
+from typing import IO
+
+# Longest line kept; echo() of a huge vector can otherwise be one unbounded line.
+MAX_LINE_CHARS = 8192
+_SPILL_IDS = itertools.count(1)
+
+
+class OutputCapture:
+    """Keep the first and last lines of a stream and count those in between.
+
+    Bytes are decoded incrementally, so multi-byte characters split across
+    reads are preserved, and memory stays bounded by the line limits however
+    much a model prints. With a spill directory, the full stream is also
+    written to a log file, which is kept only when lines were dropped.
+    """
+
+    def __init__(
+        self,
+        head_lines: int = 200,
+        tail_lines: int = 200,
+        spill_dir: Path | None = None,
+        name: str = "output",
+    ) -> None:
+        self.head_lines = head_lines
+        self.head: list[str] = []
+        self.tail: deque[str] = deque(maxlen=tail_lines)
+        self.dropped = 0
+        self.spill_path: Path | None = None
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        self._partial = ""
+        self._spill: IO[str] | None = None
+        if spill_dir is not None:
+            spill_dir.mkdir(parents=True, exist_ok=True)
+            self.spill_path = spill_dir / f"openscad-{os.getpid()}-{next(_SPILL_IDS)}.{name}.log"
+            self._spill = self.spill_path.open("w", encoding="utf-8")
+
+    def feed(self, data: bytes, final: bool = False) -> None:
+        """Add raw bytes read from the stream.
+
+        Args:
+            data: Next chunk of output.
+            final: Whether the stream has ended, flushing any partial line.
+        """
+        text = self._decoder.decode(data, final)
+        if self._spill:
+            self._spill.write(text)
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        if len(self._partial) > MAX_LINE_CHARS:
+            # Keep the start of an overlong line; the rest still reaches the spill file.
+            lines.append(self._partial[:MAX_LINE_CHARS] + " [line truncated]")
+            self._partial = ""
+        if final and self._partial:
+            lines.append(self._partial)
+            self._partial = ""
+        for line in lines:
+            self._add(line[:MAX_LINE_CHARS])
+
+    def _add(self, line: str) -> None:
+        if len(self.head) < self.head_lines:
+            self.head.append(line)
+            return
+        if len(self.tail) == self.tail.maxlen:
+            self.dropped += 1
+        if self.tail.maxlen:
+            self.tail.append(line)
+
+    def close(self) -> None:
+        """Flush the decoder and close the spill file, deleting it if nothing was dropped."""
+        self.feed(b"", final=True)
+        if self._spill:
+            self._spill.close()
+            self._spill = None
+            if not self.dropped and self.spill_path:
+                self.spill_path.unlink(missing_ok=True)
+                self.spill_path = None
+
+    def text(self) -> str:
+        """Return the kept lines, with a marker where lines were dropped."""
+        lines = list(self.head)
+        if self.dropped:
+            where = f"; full output in {self.spill_path}" if self.spill_path else ""
+            lines.append(f"... {self.dropped} lines omitted{where} ...")
+        lines.extend(self.tail)
+        return "\n".join(lines)
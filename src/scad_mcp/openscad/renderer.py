@@ -2,22 +2,41 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import logging
 from pathlib import Path
-
-from scad_mcp.models import RenderRequest, RenderResult
-from scad_mcp.openscad.cli import run_openscad
-from scad_mcp.validation import validate_angles, validate_fov, validate_projection, validate_scad_file
+from typing import Mapping
+
+from scad_mcp.models import BoundingBox, DefineValue, OpenScadCapabilities, RenderRequest, RenderResult
+from scad_mcp.normalize import normalize_png
+from scad_mcp.openscad.camera import (
+    ANGLE_VECTORS,
+    canonical_orbit,
+    framed_camera,
+    orbit_camera,
+    orbit_from_angles,
+)
+from scad_mcp.openscad.cli import backend_args, define_args, defines_suffix, run_openscad
+from scad_mcp.workspace import promote
+from scad_mcp.validation import (
+    validate_angles,
+    validate_defines,
+    validate_elevation,
+    validate_fov,
+    validate_projection,
+    validate_quality,
+    validate_scad_file,
+)
 
 LOGGER = logging.getLogger("scad_mcp.openscad.renderer")
 
-ANGLE_VECTORS = {
-    "top": (0.0, 0.0, 1.0),
-    "bottom": (0.0, 0.0, -1.0),
-    "front": (0.0, -1.0, 0.0),
-    "back": (0.0, 1.0, 0.0),
-    "left": (-1.0, 0.0, 0.0),
-    "right": (1.0, 0.0, 0.0),
+# Draft skips CGAL and captures the preview; high tightens $fa/$fs for models that do not set $fn.
+QUALITY_ARGS = {
+    "draft": [],
+    "standard": ["--render"],
+    "high": ["--render", "-D", "$fa=2", "-D", "$fs=0.2"],
 }
 
 def build_camera(angles: list[str], fov: float) -> str:
@@ -61,20 +80,50 @@ def build_camera(angles: list[str], fov: float) -> str:
     return f"{eye_x},{eye_y},{eye_z},{center_x},{center_y},{center_z}"
 
 
-def output_name(scad_file: Path, projection: str, fov: float, angles: list[str]) -> str:
+def output_name(
+    scad_file: Path,
+    projection: str,
+    fov: float,
+    angles: list[str],
+    defines: Mapping[str, DefineValue] | None = None,
+    quality: str = "standard",
+    orbit: tuple[float, float] | None = None,
+    size: tuple[int, int] | None = None,
+    backend: str | None = None,
+    bounds: BoundingBox | None = None,
+) -> str:
     """Generate a render output filename.
 
+    Every setting that changes the image is part of the name, so concurrent
+    renders of one model with different settings never share a file.
+
     Args:
         scad_file: Source SCAD file path.
         projection: Perspective or orthographic.
         fov: Field of view in degrees.
         angles: One or two normalized view angles.
+        defines: Optional variable overrides, identified by a short hash suffix.
+        quality: Quality tier, appended unless it is "standard".
+        orbit: Optional (azimuth, elevation) replacing the named angles.
+        size: Optional image (width, height) in pixels.
+        backend: Optional geometry backend.
+        bounds: Optional bounding box the camera frames, identified by a short hash suffix.
 
     Returns:
         Output filename for the rendered image.
     """
-    angle_part = "-".join(angles)
-    return f"{scad_file.stem}_{projection}_fov{int(fov)}_{angle_part}.png"
+    angle_part = f"az{orbit[0]:g}_el{orbit[1]:g}" if orbit else "-".join(angles)
+    suffix = defines_suffix(defines or {})
+    if quality != "standard":
+        suffix = f"{suffix}_{quality}"
+    if size:
+        suffix = f"{suffix}_{size[0]}x{size[1]}"
+    if backend:
+        suffix = f"{suffix}_{backend}"
+    if bounds:
+        payload = json.dumps([bounds.minimum, bounds.maximum]).encode("utf-8")
+        suffix = f"{suffix}_b{hashlib.sha256(payload).hexdigest()[:8]}"
+    return f"{scad_file.stem}_{projection}_fov{int(fov)}_{angle_part}{suffix}.png"
 
 
 async def render_scad(
@@ -82,47 +131,86 @@ async def render_scad(
     openscad_path: Path,
     img_width: int,
     img_height: int,
+    timeout: float | None = None,
+    scratch_dir: Path | None = None,
+    backend: str | None = None,
+    capabilities: OpenScadCapabilities | None = None,
 ) -> RenderResult:
     """Render a SCAD file to an image using OpenSCAD.
 
+    When the request carries a bounding box, the camera frames it directly;
+    otherwise OpenSCAD's --autocenter and --viewall frame the model.
+
     Args:
         request: Render request parameters.
         openscad_path: Path to the OpenSCAD executable.
         img_width: Output image width in pixels.
         img_height: Output image height in pixels.
+        timeout: Optional limit in seconds for the OpenSCAD process.
+        scratch_dir: Optional job workspace OpenSCAD writes into; the finished
+            image is then moved atomically into the output directory.
+        backend: Optional geometry backend, "manifold" or "cgal". A failed
+            Manifold render is retried with CGAL.
+        capabilities: Features of the OpenSCAD build, used to select the backend.
 
     Returns:
         RenderResult with image path and executed command.
 
     Raises:
         FileNotFoundError: When the SCAD file does not exist.
-        ValueError: When projection, fov, or angles are invalid.
+        ValueError: When projection, fov, angles, elevation, quality, or defines are invalid.
         RuntimeError: When the OpenSCAD command fails.
+        TimeoutError: When OpenSCAD exceeds the timeout.
     """
     validate_scad_file(request.scad_file)
     validate_projection(request.projection)
     validate_fov(request.fov)
     angles = validate_angles(request.angles)
+    validate_defines(request.defines)
+    validate_quality(request.quality)
+    orbit = None
+    if request.azimuth is not None:
+        validate_elevation(request.elevation)
+        orbit = canonical_orbit(request.azimuth, request.elevation)
 
     request.output_dir.mkdir(parents=True, exist_ok=True)
-    output_path = request.output_dir / output_name(request.scad_file, request.projection, request.fov, angles)
-    camera = build_camera(angles, request.fov)
-    command = [
+    output_path = request.output_dir / output_name(
+        request.scad_file, request.projection, request.fov, angles, request.defines, request.quality, orbit,
+        (img_width, img_height), backend, request.bounds,
+    )
+    write_path = scratch_dir / output_path.name if scratch_dir else output_path
+    if request.bounds:
+        # Framing comes from the known bounds, so OpenSCAD's own centering passes are skipped.
+        camera = framed_camera(*(orbit or orbit_from_angles(angles)), request.bounds, img_width / img_height)
+        framing_args = []
+    else:
+        camera = orbit_camera(*orbit, request.fov) if orbit else build_camera(angles, request.fov)
+        framing_args = ["--autocenter", "--viewall"]
+    base_command = [
         str(openscad_path),
         "-o",
-        str(output_path),
+        str(write_path),
         str(request.scad_file),
-        "--render",
+        *QUALITY_ARGS[request.quality],
         f"--imgsize={img_width},{img_height}",
         f"--projection={request.projection}",
         f"--camera={camera}",
-        "--autocenter",
-        "--viewall",
+        *framing_args,
+        *define_args(request.defines),
     ]
     LOGGER.info("Rendering %s to %s", request.scad_file, output_path)
-    exit_code, stdout, stderr = await run_openscad(command)
+    for attempt in [backend, "cgal"] if backend == "manifold" else [backend]:
+        command = [*base_command, *backend_args(attempt, capabilities or OpenScadCapabilities())]
+        exit_code, stdout, stderr = await run_openscad(command, timeout=timeout)
+        if exit_code == 0 or attempt != "manifold":
+            break
+        LOGGER.warning("Manifold backend failed on %s, retrying with CGAL: %s", request.scad_file, stderr.strip())
     if exit_code != 0:
         message = stderr.strip() or stdout.strip() or "OpenSCAD render failed."
         LOGGER.error("Render failed: %s", message)
         raise RuntimeError(message)
+    # OpenSCAD stamps the creation time into the PNG; drop it so renders are reproducible.
+    await asyncio.to_thread(normalize_png, write_path)
+    if write_path != output_path:
+        promote(write_path, output_path)
     return RenderResult(image_path=output_path, command=command)
@@ -2,68 +2,248 @@
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import json
 import logging
+import os
+from pathlib import Path
+import signal
+from typing import Annotated, Any, Callable, TypeVar
 
 from mcp.server.fastmcp import FastMCP
+from mcp.types import CallToolResult, ImageContent, TextContent
 
-from scad_mcp.config import load_config
+from scad_mcp.cache import RESULT_CACHE
+from scad_mcp.config import AppConfig, ServerConfig, load_config
+from scad_mcp.execution import OUTPUT_LIMITS, PLACEMENT, WORKER_POOL, OverloadedError
+from scad_mcp.history import JOB_HISTORY
 from scad_mcp.logging_setup import configure_logging
-from scad_mcp.tools import check_openscad, render_model
+from scad_mcp.models import DefineValue
 
 LOGGER = logging.getLogger("scad_mcp.server")
 
-app_config = load_config()
-configure_logging(app_config.logging.level)
+# Loaded by main() or on first tool use so importing the server stays cheap.
+# Tool modules and optional dependencies are likewise imported inside each tool.
+app_config: AppConfig | None = None
+# Configured library paths are searched before those the server was started with.
+_INHERITED_LIBRARY_PATH = os.environ.get("OPENSCADPATH", "")
 
-mcp = FastMCP(app_config.server.name)
+# Tool functions in definition order; create_server() registers them on a server.
+TOOLS: list[Callable[..., Any]] = []
+ToolFunction = TypeVar("ToolFunction", bound=Callable[..., Any])
 
-@mcp.tool()
+
+def tool(function: ToolFunction) -> ToolFunction:
+    """Mark a function as an MCP tool of the servers built by create_server().
+
+    Args:
+        function: Tool implementation; its name, docstring and signature
+            describe the tool.
+
+    Returns:
+        The function, unchanged.
+    """
+    TOOLS.append(function)
+    return function
+
+
+def create_server(name: str) -> FastMCP:
+    """Build a FastMCP server exposing every tool.
+
+    Args:
+        name: Server name reported to clients during initialization.
+
+    Returns:
+        Server ready to run.
+    """
+    server = FastMCP(name)
+    for function in TOOLS:
+        server.add_tool(function)
+    return server
+
+
+def get_config() -> AppConfig:
+    """Return the active configuration, loading it on first use.
+
+    Returns:
+        Active application configuration.
+    """
+    global app_config
+    if app_config is None:
+        app_config = load_config()
+        apply_runtime_config(app_config)
+    return app_config
+
+
+def apply_runtime_config(config: AppConfig) -> None:
+    """Apply settings that live in long-lived runtime objects.
+
+    Args:
+        config: Configuration to apply.
+    """
+    configure_logging(config.logging.level)
+    RESULT_CACHE.max_entries = config.cache.max_entries
+    WORKER_POOL.resize(config.execution.max_workers)
+    WORKER_POOL.max_queue_depth = config.execution.max_queue_depth
+    WORKER_POOL.max_wait = config.execution.max_wait
+    OUTPUT_LIMITS.head_lines = config.execution.output_head_lines
+    OUTPUT_LIMITS.tail_lines = config.execution.output_tail_lines
+    OUTPUT_LIMITS.log_dir = config.execution.output_log_dir
+    execution = config.execution
+    PLACEMENT.configure(
+        cpu_affinity=execution.cpu_affinity,
+        cpus_per_worker=execution.cpus_per_worker,
+        nice={"interactive": execution.interactive_nice, "batch": execution.batch_nice},
+        ionice={"interactive": execution.interactive_ionice, "batch": execution.batch_ionice},
+    )
+    library_path = os.pathsep.join(filter(None, [*map(str, config.libraries.paths), _INHERITED_LIBRARY_PATH]))
+    # OpenSCAD processes inherit the server's environment.
+    if library_path:
+        os.environ["OPENSCADPATH"] = library_path
+    else:
+        os.environ.pop("OPENSCADPATH", None)
+    history = config.history
+    JOB_HISTORY.configure((history.path or config.cache.directory / "history.sqlite3") if history.enabled else None)
+
+
+def install_reload_handler(reload: Callable[[], AppConfig], loop: asyncio.AbstractEventLoop | None = None) -> None:
+    """Reload configuration on SIGHUP without interrupting queued work.
+
+    The signal is delivered through the event loop, so the reload runs as an
+    ordinary callback between tasks rather than inside whatever code the
+    signal happened to interrupt.
+
+    Args:
+        reload: Callable that loads a fresh configuration.
+        loop: Event loop that applies reloads. Defaults to the running loop.
+    """
+    if not hasattr(signal, "SIGHUP"):
+        return
+
+    def reload_config() -> None:
+        global app_config
+        try:
+            new_config = reload()
+        except (OSError, ValueError):
+            LOGGER.exception("Config reload failed; keeping the current configuration.")
+            return
+        app_config = new_config
+        apply_runtime_config(new_config)
+        LOGGER.info("Configuration reloaded.")
+
+    (loop or asyncio.get_running_loop()).add_signal_handler(signal.SIGHUP, reload_config)
+
+
+def tool_result(response: dict, image_path: Path | None = None) -> CallToolResult:
+    """Wrap a tool response, and optionally an image file, as MCP content.
+
+    Args:
+        response: JSON-serializable tool response.
+        image_path: Optional PNG or WebP image to embed.
+
+    Returns:
+        Tool result with text and image content plus structured content.
+    """
+    content: list[TextContent | ImageContent] = [TextContent(type="text", text=json.dumps(response, indent=2))]
+    if image_path is not None:
+        from scad_mcp.imaging import IMAGE_MIME_TYPES
+
+        content.append(ImageContent(
+            type="image",
+            data=base64.b64encode(image_path.read_bytes()).decode("ascii"),
+            mimeType=IMAGE_MIME_TYPES[image_path.suffix.lstrip(".")],
+        ))
+    return CallToolResult(content=content, structuredContent=response)
+
+@tool
 async def openscad_installation_checker() -> dict[str, str | bool | None]:
     """Check for OpenSCAD installation information.
 
     Returns:
         Dict with installation details including path and version.
     """
+    from scad_mcp.tools import check_openscad
+
     try:
         # Force system search by ignoring configured path
         from dataclasses import replace
-        config_force_search = replace(app_config, openscad=replace(app_config.openscad, path=None))
+        config = get_config()
+        config_force_search = replace(config, openscad=replace(config.openscad, path=None))
         return await check_openscad(config_force_search)
     except Exception:
         LOGGER.exception("OpenSCAD installation check failed.")
         raise
 
 
-@mcp.tool()
+@tool
 async def scad_model_renderer(
-    scad_file: str,
+    scad_file: str | None = None,
     projection: str | None = None,
     fov: float | None = None,
     angles: list[str] | None = None,
     output_dir: str | None = None,
-    img_width: int = 1920,
-    img_height: int = 1080,
-) -> dict[str, str | list[str]]:
+    img_width: int | None = None,
+    img_height: int | None = None,
+    scad_source: str | None = None,
+    inline_image: bool = False,
+    thumbnail_size: int | None = None,
+    image_format: str | None = None,
+    defines: dict[str, DefineValue] | None = None,
+    quality: str | None = None,
+    backend: str | None = None,
+    priority: str = "normal",
+    view: str | None = None,
+    azimuth: float | None = None,
+    elevation: float | None = None,
+    framing: str | None = None,
+) -> Annotated[CallToolResult, dict[str, str | bool | list[str]]]:
     """Render a SCAD file to an image.
 
     WARNING: OpenSCAD rendering is single-threaded and CPU-bound. This process may take a significant amount of time (minutes) to complete for complex models.
     Requests are processed sequentially. DO NOT assume the request has timed out; wait for the result.
 
     Args:
-        scad_file: Path to the .scad file.
+        scad_file: Path to the .scad file. Provide either scad_file or scad_source.
         projection: Perspective or orthographic projection.
         fov: Field of view in degrees (ignored if projection is orthographic).
         angles: One, two, or three view angles. Final angle is the mean of the provided angles. Choices are "front", "back", "left", "right", "top", "bottom".
         output_dir: Optional output directory for renders.
-        img_width: Output image width in pixels.
-        img_height: Output image height in pixels.
+        img_width: Output image width in pixels. Defaults to the configured width.
+        img_height: Output image height in pixels. Defaults to the configured height.
+        scad_source: Inline SCAD source code, rendered without writing a file first.
+            Identical sources are served from the result cache.
+        inline_image: Return the image as MCP image content in addition to its path.
+        thumbnail_size: Optional longest edge in pixels of a downscaled copy (e.g. 512),
+            produced from the same render.
+        image_format: Optional encoding of the copy, "png" or "webp".
+        defines: Optional SCAD variable overrides passed with -D, e.g. {"width": 10}.
+        quality: "draft" (fast preview), "standard" (full render), or "high" (finer $fa/$fs).
+            Defaults to the configured tier.
+        backend: Geometry backend, "auto", "manifold", or "cgal". Defaults to the configured
+            backend; auto uses Manifold when the OpenSCAD build has it.
+        priority: Queue priority, "high", "normal", or "low". Under load, low priority requests
+            are rejected first. Rejections name a retry-after delay.
+        view: Optional preset replacing angles: "isometric", "isometric_front_left",
+            "isometric_back_right", or "isometric_back_left".
+        azimuth: Optional camera angle in degrees around the Z axis, replacing angles.
+            0 looks from the front, 90 from the right.
+        elevation: Camera elevation in degrees above the XY plane, used with azimuth.
+        framing: "auto" (OpenSCAD centers and fits the model) or "bbox" (the camera frames
+            the model's bounding box, measured once per model). Defaults to the configured framing.
 
     Returns:
-        Dict containing image path and command used.
+        Tool result whose structured content holds the image path, command used, and
+        whether the result was cached. encoded_path is set when a thumbnail or format is
+        requested; with inline_image the encoded image is attached as image content.
     """
+    from scad_mcp.tools import render_model
+
+    if inline_image and image_format is None:
+        image_format = get_config().render.image_format
     try:
-        return await render_model(
-            config=app_config,
+        response = await render_model(
+            config=get_config(),
             scad_file=scad_file,
             projection=projection,
             fov=fov,
@@ -71,56 +251,484 @@ async def scad_model_renderer(
             output_dir=output_dir,
             img_width=img_width,
             img_height=img_height,
+            scad_source=scad_source,
+            thumbnail_size=thumbnail_size,
+            image_format=image_format,
+            defines=defines,
+            quality=quality,
+            backend=backend,
+            priority=priority,
+            view=view,
+            azimuth=azimuth,
+            elevation=elevation,
+            framing=framing,
         )
+    except OverloadedError:
+        # Rejections are expected under load and already logged by the pool.
+        raise
     except Exception:
-        LOGGER.exception("Render tool failed for %s", scad_file)
+        LOGGER.exception("Render tool failed for %s", scad_file or "inline source")
         raise
+    return tool_result(response, Path(str(response["encoded_path"])) if inline_image else None)
+
+
+@tool
+async def scad_render_diff(
+    scad_file_a: str | None = None,
+    scad_source_a: str | None = None,
+    scad_file_b: str | None = None,
+    scad_source_b: str | None = None,
+    defines_a: dict[str, DefineValue] | None = None,
+    defines_b: dict[str, DefineValue] | None = None,
+    projection: str | None = None,
+    fov: float | None = None,
+    angles: list[str] | None = None,
+    output_dir: str | None = None,
+    img_width: int | None = None,
+    img_height: int | None = None,
+    threshold: int = 0,
+    inline_image: bool = False,
+) -> Annotated[CallToolResult, dict[str, str | int | float | bool | list[int] | None]]:
+    """Render two SCAD variants with the same camera and compare them pixel by pixel.
+
+    Compare two sources (scad_file_a/scad_source_a vs scad_file_b/scad_source_b) or one
+    source with two parameter sets (defines_a vs defines_b). Inline sources are served from
+    the result cache when unchanged.
+
+    Args:
+        scad_file_a: Path to the baseline .scad file.
+        scad_source_a: Inline baseline SCAD source.
+        scad_file_b: Path to the .scad file to compare. Defaults to the baseline source.
+        scad_source_b: Inline SCAD source to compare.
+        defines_a: SCAD variable overrides for the baseline, e.g. {"width": 10}.
+        defines_b: SCAD variable overrides for the comparison.
+        projection: Perspective or orthographic projection.
+        fov: Field of view in degrees.
+        angles: One, two, or three view angles shared by both renders.
+        output_dir: Optional output directory for renders and the heatmap.
+        img_width: Output image width in pixels.
+        img_height: Output image height in pixels.
+        threshold: Per-channel difference (0-255) ignored as noise.
+        inline_image: Return the diff heatmap as MCP image content.
 
+    Returns:
+        Tool result whose structured content holds the image paths, heatmap path, changed
+        flag, changed pixel count and fraction, similarity score (1.0 means identical), and
+        changed-region bounding box [x0, y0, x1, y1]. With inline_image the heatmap is
+        attached as image content.
+    """
+    from scad_mcp.tools import diff_renders
 
-@mcp.tool()
+    try:
+        response = await diff_renders(
+            config=get_config(),
+            scad_file_a=scad_file_a,
+            scad_source_a=scad_source_a,
+            scad_file_b=scad_file_b,
+            scad_source_b=scad_source_b,
+            defines_a=defines_a,
+            defines_b=defines_b,
+            projection=projection,
+            fov=fov,
+            angles=angles,
+            output_dir=output_dir,
+            img_width=img_width,
+            img_height=img_height,
+            threshold=threshold,
+        )
+    except Exception:
+        LOGGER.exception("Render diff tool failed.")
+        raise
+    return tool_result(response, Path(str(response["heatmap_path"])) if inline_image else None)
+
+
+@tool
 async def scad_model_converter(
-    scad_file: str,
+    scad_file: str | None = None,
     output_format: str | None = None,
     output_path: str | None = None,
-) -> dict[str, str | list[str]]:
+    scad_source: str | None = None,
+    defines: dict[str, DefineValue] | None = None,
+    stl_encoding: str | None = None,
+    compression: int | None = None,
+    decimal_precision: int | None = None,
+    output_formats: list[str] | None = None,
+    backend: str | None = None,
+    priority: str = "normal",
+) -> dict[str, object]:
     """Convert a SCAD file to another format (e.g., STL, 3MF, AMF).
 
     WARNING: OpenSCAD export can be slow for complex models.
     Requests are processed sequentially.
 
+    To produce several formats from a single evaluation, pass output_formats,
+    e.g. ["stl", "3mf", "png"]. STL, OFF, 3MF and a PNG thumbnail are written
+    from one exported mesh.
+
     Args:
-        scad_file: Path to the .scad file.
+        scad_file: Path to the .scad file. Provide either scad_file or scad_source.
         output_format: Target format (e.g. "stl", "3mf", "amf"). Optional if output_path is provided.
         output_path: Optional explicit output path. If provided, output_format is ignored.
+        scad_source: Inline SCAD source code, converted without writing a file first.
+            Identical sources are served from the result cache.
+        defines: Optional SCAD variable overrides passed with -D, e.g. {"width": 10}.
+        stl_encoding: "binary" or "ascii" for STL output. Defaults to the fastest (binary).
+        compression: Optional zip deflate level 0-9 for 3MF output.
+        decimal_precision: Optional coordinate decimals (1-15) for ASCII STL, OFF and 3MF.
+        output_formats: Optional list of formats to export together. output_format is then
+            ignored and output_path, if given, only names the outputs.
+        backend: Geometry backend, "auto", "manifold", or "cgal". Defaults to the configured
+            backend. A failed Manifold export is retried with CGAL.
+        priority: Queue priority, "high", "normal", or "low". Under load, low priority requests
+            are rejected first. Rejections name a retry-after delay.
 
     Returns:
-        Dict containing output path and command used.
+        Dict containing output path, command used, whether the result was cached, and
+        the cached mesh the output was transcoded from, if any. With output_formats, a
+        dict of outputs per format, the shared mesh path, commands run, and whether the
+        geometry was evaluated.
     """
+    from scad_mcp.tools import convert_model, convert_model_formats
+
     try:
+        if output_formats:
+            return await convert_model_formats(
+                config=get_config(),
+                scad_file=scad_file,
+                output_formats=output_formats,
+                output_path=output_path,
+                scad_source=scad_source,
+                defines=defines,
+                stl_encoding=stl_encoding,
+                compression=compression,
+                decimal_precision=decimal_precision,
+                backend=backend,
+                priority=priority,
+            )
         return await convert_model(
-            config=app_config,
+            config=get_config(),
             scad_file=scad_file,
             output_format=output_format,
             output_path=output_path,
+            scad_source=scad_source,
+            defines=defines,
+            stl_encoding=stl_encoding,
+            compression=compression,
+            decimal_precision=decimal_precision,
+            backend=backend,
+            priority=priority,
+        )
+    except OverloadedError:
+        # Rejections are expected under load and already logged by the pool.
+        raise
+    except Exception:
+        LOGGER.exception("Convert tool failed for %s", scad_file or "inline source")
+        raise
+
+
+@tool
+async def scad_mesh_diff(
+    scad_file_a: str | None = None,
+    scad_source_a: str | None = None,
+    scad_file_b: str | None = None,
+    scad_source_b: str | None = None,
+    defines_a: dict[str, DefineValue] | None = None,
+    defines_b: dict[str, DefineValue] | None = None,
+    sample_count: int = 20000,
+    tolerance: float = 1e-6,
+) -> dict[str, object]:
+    """Export two SCAD variants to STL and compare their geometry.
+
+    WARNING: Each uncached variant requires a full OpenSCAD export.
+
+    Compare two sources (scad_file_a/scad_source_a vs scad_file_b/scad_source_b) or one
+    source with two parameter sets (defines_a vs defines_b). Inline sources reuse cached meshes.
+
+    Args:
+        scad_file_a: Path to the baseline .scad file.
+        scad_source_a: Inline baseline SCAD source.
+        scad_file_b: Path to the .scad file to compare. Defaults to the baseline source.
+        scad_source_b: Inline SCAD source to compare.
+        defines_a: SCAD variable overrides for the baseline, e.g. {"width": 10}.
+        defines_b: SCAD variable overrides for the comparison.
+        sample_count: Surface samples per mesh for the distance estimate.
+        tolerance: Distance and volume change at or below which the meshes count as unchanged.
+
+    Returns:
+        Dict with mesh paths, changed flag, triangle counts and delta, volumes and delta,
+        bounding boxes and size delta, and Hausdorff and mean surface distances.
+    """
+    from scad_mcp.tools import diff_meshes
+
+    try:
+        return await diff_meshes(
+            config=get_config(),
+            scad_file_a=scad_file_a,
+            scad_source_a=scad_source_a,
+            scad_file_b=scad_file_b,
+            scad_source_b=scad_source_b,
+            defines_a=defines_a,
+            defines_b=defines_b,
+            sample_count=sample_count,
+            tolerance=tolerance,
+        )
+    except Exception:
+        LOGGER.exception("Mesh diff tool failed.")
+        raise
+
+
+@tool
+async def scad_assembly_export(
+    scad_file: str | None = None,
+    scad_source: str | None = None,
+    defines: dict[str, DefineValue] | None = None,
+    output_format: str = "stl",
+    output_dir: str | None = None,
+    merge_3mf: bool = False,
+    compression: int | None = None,
+    backend: str | None = None,
+) -> dict[str, object]:
+    """Export each top-level object of an assembly as a separate part, in parallel.
+
+    WARNING: Every uncached part is a full OpenSCAD export; parts run concurrently
+    up to the configured number of workers.
+
+    Each top-level module instantiation becomes a part. Tag statements with a
+    "// @part name" comment on the line before to name them; when any statement is
+    tagged, only tagged statements are exported.
+
+    Args:
+        scad_file: Path to the assembly .scad file. Provide either scad_file or scad_source.
+        scad_source: Inline assembly source.
+        defines: Optional SCAD variable overrides passed with -D to every part.
+        output_format: Format of the part files (default "stl").
+        output_dir: Optional directory for the parts. Defaults to "<stem>_parts" next to the source.
+        merge_3mf: Merge the STL parts into one 3MF with an object per part.
+        compression: Optional zip deflate level 0-9 for the merged 3MF.
+        backend: Geometry backend for every part. Defaults to the configured backend.
+
+    Returns:
+        Dict with each part's name, output path and cache state, and the merged 3MF path.
+    """
+    from scad_mcp.tools import export_assembly
+
+    try:
+        return await export_assembly(
+            config=get_config(),
+            scad_file=scad_file,
+            scad_source=scad_source,
+            defines=defines,
+            output_format=output_format,
+            output_dir=output_dir,
+            merge_3mf=merge_3mf,
+            compression=compression,
+            backend=backend,
+        )
+    except Exception:
+        LOGGER.exception("Assembly export tool failed for %s", scad_file or "inline source")
+        raise
+
+
+@tool
+async def scad_animation(
+    scad_file: str | None = None,
+    scad_source: str | None = None,
+    mode: str = "turntable",
+    frames: int = 24,
+    output_format: str = "gif",
+    elevation: float = 30.0,
+    projection: str | None = None,
+    fov: float | None = None,
+    output_dir: str | None = None,
+    img_width: int | None = None,
+    img_height: int | None = None,
+    defines: dict[str, DefineValue] | None = None,
+    quality: str | None = None,
+    frame_duration: int = 100,
+    priority: str = "normal",
+) -> dict[str, object]:
+    """Render a turntable or $t animation and combine the frames into one image.
+
+    WARNING: Every uncached frame is an OpenSCAD render; frames run concurrently
+    up to the configured number of workers.
+
+    A turntable exports the model once and orbits the camera around the mesh.
+    An animation renders one frame per $t step, like OpenSCAD's --animate.
+
+    Args:
+        scad_file: Path to the .scad file. Provide either scad_file or scad_source.
+        scad_source: Inline SCAD source.
+        mode: "turntable" (orbit the camera) or "animate" (step $t from 0 to 1).
+        frames: Number of frames, 2 to 360 (default 24).
+        output_format: "gif", "webp", or "sprite" for a PNG sprite sheet.
+        elevation: Turntable camera elevation in degrees (default 30).
+        projection: "perspective" or "orthographic". Defaults to config value.
+        fov: Field of view in degrees. Defaults to config value.
+        output_dir: Optional output directory for frames and the animation.
+        img_width: Frame width in pixels. Defaults to config value.
+        img_height: Frame height in pixels. Defaults to config value.
+        defines: Optional SCAD variable overrides passed with -D.
+        quality: Quality tier for animate frames. Defaults to config value.
+        frame_duration: Milliseconds per frame (default 100).
+        priority: Queue priority, "high", "normal", or "low".
+
+    Returns:
+        Dict with the animation path, frame paths, and how many frames were cached.
+    """
+    from scad_mcp.tools import render_animation
+
+    try:
+        return await render_animation(
+            config=get_config(),
+            scad_file=scad_file,
+            scad_source=scad_source,
+            mode=mode,
+            frames=frames,
+            output_format=output_format,
+            elevation=elevation,
+            projection=projection,
+            fov=fov,
+            output_dir=output_dir,
+            img_width=img_width,
+            img_height=img_height,
+            defines=defines,
+            quality=quality,
+            frame_duration=frame_duration,
+            priority=priority,
+        )
+    except OverloadedError:
+        # Rejections are expected under load and already logged by the pool.
+        raise
+    except Exception:
+        LOGGER.exception("Animation tool failed for %s", scad_file or "inline source")
+        raise
+
+
+@tool
+async def scad_backend_benchmark(
+    scad_files: list[str],
+    defines: dict[str, DefineValue] | None = None,
+    repeats: int = 1,
+) -> dict[str, object]:
+    """Export models with the CGAL and Manifold backends and report which is faster.
+
+    WARNING: Every model is exported once per backend and repeat, without the cache.
+
+    Args:
+        scad_files: Paths of .scad files forming the sample corpus.
+        defines: Optional SCAD variable overrides passed with -D to every model.
+        repeats: Runs per model and backend; the fastest run is reported.
+
+    Returns:
+        Dict with per-model timings, errors and winner, wins and total time per backend,
+        and the recommended value for openscad.backend.
+    """
+    from scad_mcp.tools import benchmark_backends
+
+    try:
+        return await benchmark_backends(
+            config=get_config(),
+            scad_files=scad_files,
+            defines=defines,
+            repeats=repeats,
         )
     except Exception:
-        LOGGER.exception("Convert tool failed for %s", scad_file)
+        LOGGER.exception("Backend benchmark tool failed.")
         raise
 
 
+@tool
+async def scad_library_check(
+    scad_file: str | None = None,
+    scad_source: str | None = None,
+    names: list[str] | None = None,
+) -> dict[str, object]:
+    """Look up installed OpenSCAD libraries (BOSL2, MCAD, ...) and check a model's references.
+
+    Fast: parses sources without running OpenSCAD.
+
+    Args:
+        scad_file: Optional path to a .scad file to check.
+        scad_source: Optional inline SCAD source to check.
+        names: Optional module or function names to look up, e.g. ["cuboid"].
+
+    Returns:
+        Dict with the library search path, the files defining each name, and for a model
+        its used/included files, unresolved references, and undefined calls with the
+        library files that define them.
+    """
+    from scad_mcp.tools import check_libraries
+
+    try:
+        return await check_libraries(config=get_config(), scad_file=scad_file, scad_source=scad_source, names=names)
+    except Exception:
+        LOGGER.exception("Library check failed.")
+        raise
+
+
+@tool
+async def scad_job_history(
+    query: str = "slowest",
+    limit: int = 10,
+    kind: str | None = None,
+    hours: float | None = None,
+) -> dict[str, object]:
+    """Query the history of past render and convert jobs.
+
+    Args:
+        query: "slowest" (mean run time per model), "failures" (failure hotspots with the
+            last error), "cache" (hit rate per job kind), "capacity" (busy time, queue waits
+            and worker utilization), or "recent" (latest jobs).
+        limit: Maximum rows to return.
+        kind: Optional job kind filter, "render" or "convert".
+        hours: Optional window; only jobs from the last hours are included.
+
+    Returns:
+        Dict with the query, database path, window and result rows.
+    """
+    from scad_mcp.tools import job_history
+
+    try:
+        return await job_history(config=get_config(), query=query, limit=limit, kind=kind, hours=hours)
+    except Exception:
+        LOGGER.exception("Job history tool failed.")
+        raise
+
+
+# Server with the default name for importers; main() builds one with the configured name.
+mcp = create_server(ServerConfig().name)
+
+
 def main() -> None:
     """Run the MCP server."""
     import argparse
     parser = argparse.ArgumentParser(description="OpenSCAD MCP Server")
     parser.add_argument("--openscad-path", help="Path to OpenSCAD executable")
+    parser.add_argument("--config", help="Path to a TOML config file (default: ./scad-mcp.toml)")
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="SECTION.FIELD=VALUE",
+        help="Override a config setting, e.g. --set execution.max_workers=4",
+    )
     args = parser.parse_args()
 
+    def reload() -> AppConfig:
+        return load_config(openscad_path=args.openscad_path, config_file=args.config, overrides=args.set)
+
     global app_config
-    if args.openscad_path:
-        app_config = load_config(openscad_path=args.openscad_path)
-        configure_logging(app_config.logging.level)
+    app_config = reload()
+    apply_runtime_config(app_config)
+
+    server = mcp if app_config.server.name == ServerConfig().name else create_server(app_config.server.name)
+
+    async def serve() -> None:
+        # The reload handler needs the loop the server runs on.
+        install_reload_handler(reload)
+        await server.run_stdio_async()
 
-    mcp.run()
+    asyncio.run(serve())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,85 @@
+"""Content-addressed storage for inline SCAD sources."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+
+from scad_mcp.config.models import AppConfig
+from scad_mcp.validation import validate_scad_source
+from scad_mcp.workspace import partial_file
+
+LOGGER = logging.getLogger("scad_mcp.sources")
+
+DIGEST_LENGTH = 16
+
+
+def source_digest(data: bytes) -> str:
+    """Return the content digest used to name stored sources.
+
+    Args:
+        data: Raw SCAD source bytes.
+
+    Returns:
+        Truncated SHA-256 hex digest.
+    """
+    return hashlib.sha256(data).hexdigest()[:DIGEST_LENGTH]
+
+
+def store_source(source: str, directory: Path) -> Path:
+    """Store SCAD source text under its content digest.
+
+    Identical sources map to the same file, which is only written once.
+
+    Args:
+        source: SCAD source text.
+        directory: Directory holding stored sources.
+
+    Returns:
+        Path of the stored .scad file.
+    """
+    data = source.encode("utf-8")
+    path = directory / f"{source_digest(data)}.scad"
+    if path.exists():
+        return path
+    directory.mkdir(parents=True, exist_ok=True)
+    with partial_file(path) as partial:
+        partial.write_bytes(data)
+    LOGGER.debug("Stored inline source at %s", path)
+    return path
+
+
+async def resolve_scad_input(
+    config: AppConfig,
+    scad_file: str | None,
+    scad_source: str | None,
+) -> tuple[Path, str | None]:
+    """Resolve a tool's SCAD input to a path on disk.
+
+    Args:
+        config: Application configuration.
+        scad_file: Optional path to a .scad file.
+        scad_source: Optional inline SCAD source text.
+
+    Returns:
+        Tuple of the SCAD path and, for inline sources, the digest used in
+        cache keys (None for file inputs). The digest also covers the contents
+        of used and included library files, and with libraries.flatten the
+        path points at a copy that references flattened libraries.
+
+    Raises:
+        ValueError: When neither or both inputs are provided.
+    """
+    if (scad_file is None) == (scad_source is None):
+        raise ValueError("Provide exactly one of scad_file or scad_source.")
+    if scad_source is None:
+        return Path(scad_file), None
+    validate_scad_source(scad_source)
+    # Imported here; the library index is only needed once a tool runs.
+    from scad_mcp.libraries import prepare_source
+
+    # Storing the source and scanning its libraries touch the disk, so they run off the event loop.
+    path = await asyncio.to_thread(store_source, scad_source, config.cache.directory / "sources")
+    return await asyncio.to_thread(prepare_source, config, path)
@@ -0,0 +1,5 @@
+"""Test doubles and load-testing tools for scad-mcp.
+
+Nothing here is imported by the server; it exists to exercise scheduling,
+timeouts and caching without a real OpenSCAD install.
+"""
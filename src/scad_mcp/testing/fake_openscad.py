@@ -0,0 +1,350 @@
+"""A stand-in OpenSCAD executable with configurable latency, load and failures.
+
+It accepts the command lines scad-mcp builds (-o, --render, --camera,
+--imgsize, -D, --export-format, --backend, --summary-file) and writes small
+but valid PNG, STL, OFF and 3MF files. Behavior is configured through
+environment variables, which a model can override per run with a comment:
+
+    // fake-openscad: latency=2 fail=error echo=5000
+
+Settings:
+    latency: Seconds per run, or a distribution: "uniform:0.1,0.5",
+        "lognormal:0.2,0.5" (median, sigma) or "exponential:0.2" (mean).
+    cpu: Fraction of the latency spent burning CPU instead of sleeping.
+    memory_mb: Memory allocated gradually over the run.
+    progress: Number of progress lines written to stderr.
+    echo: Number of ECHO lines written to stderr.
+    fail: Failure mode, one of error, crash, hang or empty.
+    fail_rate: Probability of failing when fail is set; defaults to 1.
+    seed: Random seed for latency sampling and failures.
+
+Each setting is read from FAKE_OPENSCAD_<NAME>, e.g. FAKE_OPENSCAD_LATENCY.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+import random
+import re
+import struct
+import sys
+import time
+import zipfile
+import zlib
+
+VERSION = "OpenSCAD version 2024.12.06 (scad-mcp fake)"
+HELP_TEXT = """Usage: openscad [options] file.scad
+  -o arg                     output specified file instead of running the GUI
+  -D arg                     var=val - pre-define variables
+  --render arg               for full geometry evaluation when exporting png
+  --camera arg               camera parameters
+  --autocenter               adjust camera to look at object's center
+  --viewall                  adjust camera to fit object
+  --imgsize arg              =width,height of exported png
+  --projection arg           =(o)rtho or (p)erspective when exporting png
+  --export-format arg        overrides format of exported scad file
+  --backend arg              3D rendering backend to use: 'CGAL' or 'Manifold'
+  --summary arg              enable additional render summary and statistics
+  --summary-file arg         output summary information in JSON format to the given file
+"""
+SETTINGS = ("latency", "cpu", "memory_mb", "progress", "echo", "fail", "fail_rate", "seed")
+DIRECTIVE = re.compile(r"//\s*fake-openscad:(.*)")
+FAILURE_MODES = {"error", "crash", "hang", "empty"}
+
+CUBE_VERTICES = [(x, y, z) for x in (0.0, 1.0) for y in (0.0, 1.0) for z in (0.0, 1.0)]
+CUBE_FACES = [
+    (0, 1, 3), (0, 3, 2), (4, 6, 7), (4, 7, 5), (0, 4, 5), (0, 5, 1),
+    (2, 3, 7), (2, 7, 6), (0, 2, 6), (0, 6, 4), (1, 5, 7), (1, 7, 3),
+]
+
+
+def load_settings(scad_file: Path | None, environ: dict[str, str] | None = None) -> dict[str, str]:
+    """Collect settings from the environment and the model's directive comment.
+
+    Args:
+        scad_file: Input model, which may carry a fake-openscad directive.
+        environ: Environment to read; defaults to os.environ.
+
+    Returns:
+        Setting names mapped to their raw values.
+    """
+    environ = os.environ if environ is None else environ
+    settings = {name: environ[f"FAKE_OPENSCAD_{name.upper()}"] for name in SETTINGS
+                if f"FAKE_OPENSCAD_{name.upper()}" in environ}
+    if scad_file and scad_file.is_file():
+        for match in DIRECTIVE.finditer(scad_file.read_text(encoding="utf-8", errors="ignore")):
+            for token in match.group(1).split():
+                name, _, value = token.partition("=")
+                if name in SETTINGS:
+                    settings[name] = value
+    return settings
+
+
+def sample_latency(spec: str, rng: random.Random) -> float:
+    """Draw a run time from a latency specification.
+
+    Args:
+        spec: Fixed seconds, or "uniform:low,high", "lognormal:median,sigma"
+            or "exponential:mean".
+        rng: Random source.
+
+    Returns:
+        Seconds, never negative.
+
+    Raises:
+        ValueError: When the specification is malformed.
+    """
+    kind, _, args = spec.partition(":")
+    if not args:
+        return max(float(kind), 0.0)
+    values = [float(value) for value in args.split(",")]
+    if kind == "uniform":
+        return rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        return rng.lognormvariate(0.0, values[1]) * values[0]
+    if kind == "exponential":
+        return rng.expovariate(1.0 / values[0])
+    raise ValueError(f"Unknown latency distribution: {kind}")
+
+
+def png_bytes(width: int, height: int, color: tuple[int, int, int]) -> bytes:
+    """Encode a solid-color RGB PNG.
+
+    Args:
+        width: Image width in pixels.
+        height: Image height in pixels.
+        color: RGB fill.
+
+    Returns:
+        PNG file contents.
+    """
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    row = b"\x00" + bytes(color) * width
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+        chunk(b"IDAT", zlib.compress(row * height, 1)),
+        chunk(b"IEND", b""),
+    ])
+
+
+def _cube(size: float) -> list[tuple[tuple[float, float, float], ...]]:
+    return [tuple(tuple(size * value for value in CUBE_VERTICES[index]) for index in face) for face in CUBE_FACES]
+
+
+def write_output(path: Path, args: argparse.Namespace, defines: dict[str, str]) -> None:
+    """Write a minimal valid file in the format given by the path or --export-format.
+
+    Geometry is a cube whose edge is the numeric "size" define, or 10.
+
+    Args:
+        path: Output path.
+        args: Parsed command line.
+        defines: -D overrides by name.
+    """
+    fmt = path.suffix.lstrip(".").lower()
+    if args.export_format in {"binstl", "asciistl"}:
+        fmt = "stl"
+    try:
+        size = float(defines.get("size", "10"))
+    except ValueError:
+        size = 10.0
+    triangles = _cube(size)
+    if fmt == "png":
+        width, height = (int(value) for value in (args.imgsize or "640,480").split(","))
+        seed = hashlib.sha256(f"{args.camera}{sorted(defines.items())}".encode()).digest()
+        path.write_bytes(png_bytes(width, height, (seed[0], seed[1], seed[2])))
+    elif fmt == "stl" and args.export_format == "binstl":
+        records = b"".join(
+            struct.pack("<3f", 0.0, 0.0, 0.0) + struct.pack("<9f", *(c for vertex in triangle for c in vertex)) + b"\0\0"
+            for triangle in triangles
+        )
+        path.write_bytes(b"\0" * 80 + struct.pack("<I", len(triangles)) + records)
+    elif fmt == "stl":
+        lines = ["solid fake"]
+        for triangle in triangles:
+            lines.append("facet normal 0 0 0\nouter loop")
+            lines.extend(f"vertex {x:g} {y:g} {z:g}" for x, y, z in triangle)
+            lines.append("endloop\nendfacet")
+        lines.append("endsolid fake\n")
+        path.write_text("\n".join(lines), encoding="utf-8")
+    elif fmt == "off":
+        vertices = [tuple(size * value for value in vertex) for vertex in CUBE_VERTICES]
+        lines = ["OFF", f"{len(vertices)} {len(CUBE_FACES)} 0"]
+        lines.extend(f"{x:g} {y:g} {z:g}" for x, y, z in vertices)
+        lines.extend(f"3 {a} {b} {c}" for a, b, c in CUBE_FACES)
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    elif fmt == "3mf":
+        vertices = "".join(
+            f'<vertex x="{size * x:g}" y="{size * y:g}" z="{size * z:g}"/>' for x, y, z in CUBE_VERTICES
+        )
+        faces = "".join(f'<triangle v1="{a}" v2="{b}" v3="{c}"/>' for a, b, c in CUBE_FACES)
+        model = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n<model unit="millimeter" '
+            'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02"><resources>'
+            f'<object id="1" type="model"><mesh><vertices>{vertices}</vertices>'
+            f"<triangles>{faces}</triangles></mesh></object></resources>"
+            '<build><item objectid="1"/></build></model>\n'
+        )
+        from scad_mcp.mesh import THREE_MF_CONTENT_TYPES, THREE_MF_RELS
+
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+            package.writestr("[Content_Types].xml", THREE_MF_CONTENT_TYPES)
+            package.writestr("_rels/.rels", THREE_MF_RELS)
+            package.writestr("3D/3dmodel.model", model)
+    else:
+        path.write_text(f"fake {fmt} export\n", encoding="utf-8")
+    if args.summary_file:
+        summary = {"geometry": {"bounding_box": {"min": [0.0, 0.0, 0.0], "max": [size, size, size]}}}
+        Path(args.summary_file).write_text(json.dumps(summary), encoding="utf-8")
+
+
+def simulate_work(seconds: float, cpu_fraction: float, memory_mb: int, progress: int) -> list[bytearray]:
+    """Spend time like an OpenSCAD run: burn CPU, grow memory and report progress.
+
+    Args:
+        seconds: Total run time.
+        cpu_fraction: Share of the time spent busy rather than sleeping.
+        memory_mb: Memory to allocate, spread evenly over the run.
+        progress: Progress lines to write to stderr.
+
+    Returns:
+        The allocated buffers, kept alive by the caller until exit.
+    """
+    steps = max(progress, 1 if memory_mb else 0, 1)
+    held: list[bytearray] = []
+    step_seconds = seconds / steps
+    for step in range(1, steps + 1):
+        busy_until = time.perf_counter() + step_seconds * cpu_fraction
+        while time.perf_counter() < busy_until:
+            pass
+        time.sleep(step_seconds * (1.0 - cpu_fraction))
+        if memory_mb:
+            held.append(bytearray(memory_mb * 1024 * 1024 // steps))
+        if progress:
+            sys.stderr.write(f"Rendering Polygon Mesh: {step}/{steps}\n")
+    return held
+
+
+def parse_args(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
+    """Parse the subset of OpenSCAD options scad-mcp uses; others are returned."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("-o", dest="output")
+    parser.add_argument("-D", dest="defines", action="append", default=[])
+    parser.add_argument("--render", action="store_true")
+    parser.add_argument("--camera")
+    parser.add_argument("--imgsize")
+    parser.add_argument("--projection")
+    parser.add_argument("--export-format")
+    parser.add_argument("--backend")
+    parser.add_argument("--enable", action="append", default=[])
+    parser.add_argument("--summary", action="append", default=[])
+    parser.add_argument("--summary-file")
+    parser.add_argument("--autocenter", action="store_true")
+    parser.add_argument("--viewall", action="store_true")
+    parser.add_argument("--help", action="store_true")
+    parser.add_argument("--version", action="store_true")
+    parser.add_argument("input", nargs="?")
+    return parser.parse_known_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the fake OpenSCAD command line.
+
+    Args:
+        argv: Arguments without the program name; defaults to sys.argv.
+
+    Returns:
+        Process exit code.
+    """
+    args, unknown = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.help:
+        sys.stdout.write(HELP_TEXT)
+        return 0
+    if args.version:
+        sys.stdout.write(VERSION + "\n")
+        return 0
+    if not args.output or not args.input:
+        sys.stderr.write("ERROR: fake OpenSCAD needs -o and an input file.\n")
+        return 1
+    if unknown:
+        sys.stderr.write(f"WARNING: ignoring unsupported arguments: {' '.join(unknown)}\n")
+    scad_file = Path(args.input)
+    if not scad_file.is_file():
+        sys.stderr.write(f"ERROR: Can't open input file '{scad_file}'!\n")
+        return 1
+    settings = load_settings(scad_file)
+    rng = random.Random(settings.get("seed"))
+    defines = dict(define.partition("=")[::2] for define in args.defines)
+
+    sys.stderr.write("Parsing design (AST generation)...\nCompiling design (CSG Tree generation)...\n")
+    for index in range(int(settings.get("echo", "0"))):
+        sys.stderr.write(f'ECHO: "line", {index}\n')
+    # Buffers stay allocated until the output is written, like a real peak.
+    held = simulate_work(
+        sample_latency(settings.get("latency", "0"), rng),
+        float(settings.get("cpu", "0")),
+        int(settings.get("memory_mb", "0")),
+        int(settings.get("progress", "0")),
+    )
+
+    failure = settings.get("fail")
+    if failure and rng.random() < float(settings.get("fail_rate", "1")):
+        if failure not in FAILURE_MODES:
+            sys.stderr.write(f"ERROR: unknown fake failure mode {failure!r}\n")
+            return 2
+        if failure == "crash":
+            sys.stderr.flush()
+            os.abort()
+        if failure == "hang":
+            time.sleep(1e6)
+        if failure == "empty":
+            return 0
+        sys.stderr.write(f"ERROR: Parser error in file \"{scad_file}\", line 1: syntax error\n")
+        return 1
+
+    write_output(Path(args.output), args, defines)
+    del held
+    sys.stderr.write("Rendering finished.\n")
+    return 0
+
+
+def write_launcher(directory: Path) -> Path:
+    """Write an executable that runs this fake with the current interpreter.
+
+    Useful where the scad-mcp-fake-openscad script is not installed, such as
+    a source checkout. Pass the result as the OpenSCAD path.
+
+    Args:
+        directory: Directory for the launcher.
+
+    Returns:
+        Path of the launcher script.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    src_dir = Path(__file__).resolve().parents[2]
+    if os.name == "nt":
+        launcher = directory / "openscad.cmd"
+        launcher.write_text(
+            f'@set "PYTHONPATH={src_dir};%PYTHONPATH%"\r\n@"{sys.executable}" -m scad_mcp.testing.fake_openscad %*\r\n',
+            encoding="utf-8",
+        )
+    else:
+        launcher = directory / "openscad"
+        launcher.write_text(
+            f'#!/bin/sh\nPYTHONPATH="{src_dir}${{PYTHONPATH:+:$PYTHONPATH}}" '
+            f'exec "{sys.executable}" -m scad_mcp.testing.fake_openscad "$@"\n',
+            encoding="utf-8",
+        )
+        launcher.chmod(0o755)
+    return launcher
+
+
+if __name__ == "__main__":
+    sys.exit(main())
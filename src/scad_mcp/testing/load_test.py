@@ -0,0 +1,204 @@
+"""Fire many concurrent MCP tool calls at a server backed by the fake OpenSCAD.
+
+Example:
+    scad-mcp-load-test --calls 2000 --workers 8 --latency lognormal:0.2,0.5 --max-queue-depth 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import timedelta
+import json
+import os
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+
+from scad_mcp.testing.fake_openscad import write_launcher
+
+TOOLS = {"scad_model_renderer", "scad_model_converter"}
+
+
+def tool_arguments(tool: str, index: int, distinct: int, priority: str) -> dict[str, object]:
+    """Build the arguments of one call; sources repeat every distinct calls.
+
+    Args:
+        tool: Tool name.
+        index: Call number.
+        distinct: Number of distinct sources, so calls beyond it hit the cache.
+        priority: Queue priority of the call.
+
+    Returns:
+        Tool arguments.
+    """
+    source = f"cube({index % distinct + 1}); // load test {index % distinct}\n"
+    if tool == "scad_model_converter":
+        return {"scad_source": source, "output_format": "stl", "priority": priority}
+    return {"scad_source": source, "img_width": 64, "img_height": 48, "quality": "draft", "priority": priority}
+
+
+def _classify(text: str) -> str:
+    lowered = text.lower()
+    if "overloaded" in lowered:
+        return "rejected"
+    if "timed out" in lowered:
+        return "timeout"
+    return "error"
+
+
+def _percentiles(samples: list[float]) -> dict[str, float | None]:
+    if not samples:
+        return {"p50": None, "p90": None, "p99": None, "max": None}
+    if len(samples) == 1:
+        return {"p50": samples[0], "p90": samples[0], "p99": samples[0], "max": samples[0]}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p90": cuts[89], "p99": cuts[98], "max": max(samples)}
+
+
+async def run_load_test(
+    calls: int = 1000,
+    concurrency: int | None = None,
+    tool: str = "scad_model_renderer",
+    workers: int = 4,
+    distinct: int | None = None,
+    low_priority_share: float = 0.0,
+    latency: str = "0.05",
+    fail_rate: float = 0.0,
+    timeout: float | None = None,
+    max_queue_depth: int | None = None,
+    call_timeout: float = 600.0,
+    work_dir: Path | None = None,
+) -> dict[str, object]:
+    """Start a stdio server on the fake OpenSCAD and call one tool concurrently.
+
+    Args:
+        calls: Total tool calls.
+        concurrency: Calls in flight at once; defaults to all of them.
+        tool: "scad_model_renderer" or "scad_model_converter".
+        workers: execution.max_workers of the server.
+        distinct: Distinct model sources; repeats are cache hits. Defaults to calls.
+        low_priority_share: Fraction of calls sent with low priority.
+        latency: Fake OpenSCAD latency specification.
+        fail_rate: Probability that a fake run fails with a parser error.
+        timeout: Optional execution.timeout of the server.
+        max_queue_depth: Optional execution.max_queue_depth of the server.
+        call_timeout: Client-side limit for each call in seconds.
+        work_dir: Directory for the server's cache and renders; a temporary
+            directory by default.
+
+    Returns:
+        Dict with counts per outcome, wall time, throughput, and latency
+        percentiles of successful calls.
+
+    Raises:
+        ValueError: When the tool or counts are invalid.
+    """
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    if tool not in TOOLS:
+        raise ValueError(f"Tool must be one of {', '.join(sorted(TOOLS))}.")
+    if calls < 1:
+        raise ValueError("calls must be at least 1.")
+    with tempfile.TemporaryDirectory(prefix="scad-mcp-load-") as scratch:
+        root = work_dir or Path(scratch)
+        launcher = write_launcher(root / "bin")
+        # Per-request INFO logs would make the server's own logging the bottleneck.
+        settings = [f"execution.max_workers={workers}", "logging.level=WARNING"]
+        if timeout is not None:
+            settings.append(f"execution.timeout={timeout}")
+        if max_queue_depth is not None:
+            settings.append(f"execution.max_queue_depth={max_queue_depth}")
+        env = {name: value for name, value in os.environ.items() if not name.startswith(("SCAD_MCP_", "FAKE_OPENSCAD_"))}
+        env.update({"FAKE_OPENSCAD_LATENCY": latency, "SCAD_MCP_HISTORY_ENABLED": "false"})
+        if fail_rate:
+            env.update({"FAKE_OPENSCAD_FAIL": "error", "FAKE_OPENSCAD_FAIL_RATE": str(fail_rate)})
+        src_dir = str(Path(__file__).resolve().parents[2])
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [src_dir, env.get("PYTHONPATH")]))
+        params = StdioServerParameters(
+            command=sys.executable,
+            args=["-m", "scad_mcp.server", "--openscad-path", str(launcher),
+                  *(arg for setting in settings for arg in ("--set", setting))],
+            env=env,
+            cwd=str(root),
+        )
+
+        outcomes: dict[str, int] = {"ok": 0, "cached": 0, "rejected": 0, "timeout": 0, "error": 0}
+        latencies: list[float] = []
+        gate = asyncio.Semaphore(concurrency or calls)
+        low_every = round(1 / low_priority_share) if low_priority_share else 0
+
+        async with stdio_client(params) as (read, write), ClientSession(read, write) as session:
+            await session.initialize()
+
+            async def call(index: int) -> None:
+                priority = "low" if low_every and index % low_every == 0 else "normal"
+                arguments = tool_arguments(tool, index, distinct or calls, priority)
+                async with gate:
+                    started = time.perf_counter()
+                    try:
+                        result = await session.call_tool(
+                            tool, arguments, read_timeout_seconds=timedelta(seconds=call_timeout),
+                        )
+                    except Exception as exc:  # noqa: BLE001 - every failure is a data point here
+                        outcomes[_classify(str(exc))] += 1
+                        return
+                    elapsed = time.perf_counter() - started
+                if result.isError:
+                    outcomes[_classify(" ".join(getattr(item, "text", "") for item in result.content))] += 1
+                    return
+                outcomes["ok"] += 1
+                outcomes["cached"] += bool((result.structuredContent or {}).get("cached"))
+                latencies.append(elapsed)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(call(index) for index in range(calls)))
+            wall = time.perf_counter() - started
+
+    return {
+        "tool": tool,
+        "calls": calls,
+        "workers": workers,
+        **outcomes,
+        "wall_seconds": wall,
+        "throughput_per_second": outcomes["ok"] / wall if wall else None,
+        "latency_seconds": _percentiles(latencies),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run a load test from the command line and print the JSON summary."""
+    parser = argparse.ArgumentParser(description="Load-test scad-mcp against a fake OpenSCAD")
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, help="calls in flight at once (default: all)")
+    parser.add_argument("--tool", default="scad_model_renderer", choices=sorted(TOOLS))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--distinct", type=int, help="distinct sources; repeats are cache hits")
+    parser.add_argument("--low-priority-share", type=float, default=0.0)
+    parser.add_argument("--latency", default="0.05", help='seconds or "uniform:a,b", "lognormal:median,sigma"')
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, help="execution.timeout of the server")
+    parser.add_argument("--max-queue-depth", type=int)
+    parser.add_argument("--work-dir", type=Path, help="keep the server's cache and renders here")
+    args = parser.parse_args(argv)
+    summary = asyncio.run(run_load_test(
+        calls=args.calls,
+        concurrency=args.concurrency,
+        tool=args.tool,
+        workers=args.workers,
+        distinct=args.distinct,
+        low_priority_share=args.low_priority_share,
+        latency=args.latency,
+        fail_rate=args.fail_rate,
+        timeout=args.timeout,
+        max_queue_depth=args.max_queue_depth,
+        work_dir=args.work_dir,
+    ))
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
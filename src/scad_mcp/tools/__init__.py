@@ -1,7 +1,34 @@
-"""Tool entry points for MCP usage."""
+"""Tool entry points for MCP usage.
 
-from scad_mcp.tools.installation_checker import check_openscad
-from scad_mcp.tools.model_converter import convert_model
-from scad_mcp.tools.model_renderer import render_model
+Tool modules are imported on first attribute access so that starting the
+server does not pay for tools, and their optional dependencies, until used.
+"""
 
-__all__ = ["check_openscad", "convert_model", "render_model"]
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any
+
+_EXPORTS = {
+    "benchmark_backends": "scad_mcp.tools.backend_benchmark",
+    "check_libraries": "scad_mcp.tools.library_index",
+    "check_openscad": "scad_mcp.tools.installation_checker",
+    "convert_model": "scad_mcp.tools.model_converter",
+    "convert_model_formats": "scad_mcp.tools.model_converter",
+    "diff_meshes": "scad_mcp.tools.mesh_diff",
+    "diff_renders": "scad_mcp.tools.render_diff",
+    "export_assembly": "scad_mcp.tools.assembly_export",
+    "job_history": "scad_mcp.tools.job_history",
+    "render_animation": "scad_mcp.tools.animation",
+    "render_model": "scad_mcp.tools.model_renderer",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,162 @@
+"""MCP tool for turntable and $t-driven animations."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+
+from scad_mcp.config.models import AppConfig
+from scad_mcp.imaging import assemble_animation
+from scad_mcp.libraries import prewarm
+from scad_mcp.mesh import load_stl, mesh_stats
+from scad_mcp.models import BoundingBox, DefineValue
+from scad_mcp.openscad.camera import union_bounds
+from scad_mcp.openscad.cli import defines_suffix
+from scad_mcp.sources import resolve_scad_input, source_digest
+from scad_mcp.tools.model_converter import convert_model, mesh_cache_path
+from scad_mcp.tools.model_renderer import model_bounds, render_model
+from scad_mcp.validation import validate_animation, validate_elevation
+
+LOGGER = logging.getLogger("scad_mcp.tools.animation")
+
+ANIMATION_SUFFIXES = {"gif": "gif", "webp": "webp", "sprite": "png"}
+
+
+async def render_animation(
+    config: AppConfig,
+    scad_file: str | None = None,
+    scad_source: str | None = None,
+    mode: str = "turntable",
+    frames: int = 24,
+    output_format: str = "gif",
+    elevation: float = 30.0,
+    projection: str | None = None,
+    fov: float | None = None,
+    output_dir: str | None = None,
+    img_width: int | None = None,
+    img_height: int | None = None,
+    defines: dict[str, DefineValue] | None = None,
+    quality: str | None = None,
+    frame_duration: int = 100,
+    priority: str = "normal",
+) -> dict[str, object]:
+    """Render animation frames in parallel and combine them.
+
+    A turntable exports the model to STL once and renders every frame as a
+    preview of the imported mesh, orbiting the camera at a fixed distance
+    framed on the mesh's bounding box. An animation renders
+    one frame per $t step from 0 up to, but excluding, 1, framed on the union
+    of every step's bounding box. Frames are ordinary
+    renders, so they run concurrently across the worker pool and inline
+    sources reuse cached meshes and frames.
+
+    Args:
+        config: Application configuration.
+        scad_file: Path to the .scad file. Mutually exclusive with scad_source.
+        scad_source: Inline SCAD source.
+        mode: "turntable" or "animate".
+        frames: Number of frames, 2 to 360.
+        output_format: "gif" or "webp" for a looping animation, or "sprite" for a PNG grid.
+        elevation: Turntable camera elevation in degrees above the XY plane.
+        projection: Perspective or orthographic projection.
+        fov: Field of view in degrees.
+        output_dir: Optional output directory for frames and the animation.
+        img_width: Frame width in pixels.
+        img_height: Frame height in pixels.
+        defines: Optional SCAD variable overrides passed with -D.
+        quality: Quality tier of animate frames; turntable frames are mesh previews.
+        frame_duration: Display time of each frame in milliseconds.
+        priority: Queue priority, "high", "normal", or "low".
+
+    Returns:
+        Dict with the animation path, frame paths, mode, the turntable mesh
+        path, and how many frames came from the result cache.
+
+    Raises:
+        ValueError: When animation options are invalid.
+    """
+    validate_animation(mode, frames, output_format)
+    validate_elevation(elevation)
+    if frame_duration < 1:
+        raise ValueError("frame_duration must be at least 1 millisecond.")
+    scad_path, _ = await resolve_scad_input(config, scad_file, scad_source)
+    base_dir = Path(output_dir) if output_dir else config.render.output_dir
+    stem = f"{scad_path.stem}_{mode}{frames}{defines_suffix(defines or {})}"
+    frame_dir = base_dir / f"{stem}_frames"
+    view = dict(
+        config=config,
+        projection=projection,
+        fov=fov,
+        angles=["front"],
+        output_dir=str(frame_dir),
+        img_width=img_width,
+        img_height=img_height,
+        priority=priority,
+    )
+
+    mesh_path = None
+    if mode == "turntable":
+        mesh = await convert_model(
+            config=config,
+            scad_file=scad_file,
+            output_path=str(mesh_cache_path(config, "turntable", scad_file, scad_source, defines)),
+            scad_source=scad_source,
+            defines=defines,
+            priority=priority,
+        )
+        mesh_path = str(mesh["output_path"])
+        # Previewing an imported mesh is cheap and needs no CSG evaluation. The cached mesh
+        # path is reused when a source file changes, so its digest keys the cached frames.
+        mesh_digest = source_digest(await asyncio.to_thread(Path(mesh_path).read_bytes))
+        wrapper = f"import({json.dumps(str(Path(mesh_path).resolve()))}); // mesh {mesh_digest}\n"
+        try:
+            stats = mesh_stats(await asyncio.to_thread(load_stl, Path(mesh_path)))
+            bounds = BoundingBox(minimum=stats.bbox_min, maximum=stats.bbox_max)
+        except RuntimeError:
+            # Without NumPy the frames share a single OpenSCAD bounds probe instead.
+            bounds = None
+        step = 360.0 / frames
+        # A fixed frame around the bounding box keeps the model from jumping between frames.
+        jobs = [
+            render_model(**view, scad_file=None, scad_source=wrapper, quality="draft",
+                         azimuth=index * step, elevation=elevation, framing="bbox", bounds=bounds)
+            for index in range(frames)
+        ]
+    else:
+        if config.libraries.prewarm:
+            # Every probe and frame parses the same libraries; read them from disk once, up front.
+            await asyncio.to_thread(prewarm, config, scad_path)
+        steps = [{**(defines or {}), "$t": index / frames} for index in range(frames)]
+        # Frame the union of every step's bounds so the camera holds still while the model moves.
+        boxes = await asyncio.gather(*(
+            model_bounds(config, scad_file, scad_source, defines=step, priority=priority) for step in steps
+        ))
+        bounds = union_bounds(boxes)
+        jobs = [
+            render_model(**view, scad_file=scad_file, scad_source=scad_source, quality=quality,
+                         defines=step, framing="bbox", bounds=bounds)
+            for step in steps
+        ]
+
+    LOGGER.info("Rendering %s %s frames of %s", frames, mode, scad_path)
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(job) for job in jobs]
+    except ExceptionGroup as errors:
+        raise errors.exceptions[0] from errors
+    results = [task.result() for task in tasks]
+    frame_paths = [Path(str(result["image_path"])) for result in results]
+
+    target = base_dir / f"{stem}.{ANIMATION_SUFFIXES[output_format]}"
+    await asyncio.to_thread(
+        assemble_animation, frame_paths, target, output_format, frame_duration, config.render.webp_quality,
+    )
+    return {
+        "animation_path": str(target),
+        "frames": [str(path) for path in frame_paths],
+        "mode": mode,
+        "mesh_path": mesh_path,
+        "cached_frames": sum(1 for result in results if result["cached"]),
+    }
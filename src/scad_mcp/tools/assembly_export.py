@@ -0,0 +1,124 @@
+"""MCP tool for exporting assembly parts in parallel."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+
+from scad_mcp.assembly import split_assembly
+from scad_mcp.config.models import AppConfig
+from scad_mcp.libraries import prewarm
+from scad_mcp.mesh import load_stl, write_3mf
+from scad_mcp.models import DefineValue
+from scad_mcp.openscad.cli import defines_suffix
+from scad_mcp.sources import resolve_scad_input
+from scad_mcp.tools.model_converter import convert_model
+from scad_mcp.validation import validate_export_options
+from scad_mcp.workspace import job_workspace, promote
+
+LOGGER = logging.getLogger("scad_mcp.tools.assembly_export")
+
+
+async def export_assembly(
+    config: AppConfig,
+    scad_file: str | None,
+    scad_source: str | None = None,
+    defines: dict[str, DefineValue] | None = None,
+    output_format: str = "stl",
+    output_dir: str | None = None,
+    merge_3mf: bool = False,
+    compression: int | None = None,
+    backend: str | None = None,
+) -> dict[str, object]:
+    """Export each top-level object of an assembly as its own part.
+
+    Parts are exported concurrently, each as a separate OpenSCAD job on the
+    shared worker pool, so large unions no longer run on a single core. Part
+    sources are passed inline and share the result cache.
+
+    Args:
+        config: Application configuration.
+        scad_file: Path to the assembly .scad file. Mutually exclusive with scad_source.
+        scad_source: Inline assembly source.
+        defines: Optional SCAD variable overrides passed with -D to every part.
+        output_format: Format of the part files, e.g. "stl" or "3mf".
+        output_dir: Optional directory for the parts. Defaults to "<stem>_parts" next to the source.
+        merge_3mf: Whether to merge the parts into one multi-object 3MF.
+        compression: Optional deflate level for the merged 3MF.
+        backend: Geometry backend for every part. Defaults to the configured backend.
+
+    Returns:
+        Dict with each part's name, output path and cache state, and the merged 3MF path.
+
+    Raises:
+        ValueError: When the assembly has no top-level objects or options are invalid.
+    """
+    output_format = output_format.lstrip(".").lower()
+    if merge_3mf and output_format != "stl":
+        raise ValueError("merge_3mf requires STL parts.")
+    if merge_3mf:
+        validate_export_options("3mf", None, compression, None)
+    scad_path, digest = await resolve_scad_input(config, scad_file, scad_source)
+    source = scad_path.read_text(encoding="utf-8")
+    # Inline sources have no directory of their own to resolve relative paths against.
+    parts = split_assembly(source, None if digest else scad_path.parent)
+
+    stem = f"{scad_path.stem}{defines_suffix(defines or {})}"
+    directory = Path(output_dir) if output_dir else scad_path.with_name(f"{stem}_parts")
+    LOGGER.info("Exporting %d parts of %s", len(parts), scad_path)
+    if config.libraries.prewarm:
+        await asyncio.to_thread(prewarm, config, scad_path)
+
+    try:
+        # The task group cancels the remaining parts as soon as one fails.
+        async with asyncio.TaskGroup() as group:
+            tasks = [
+                group.create_task(
+                    convert_model(
+                        config=config,
+                        scad_file=None,
+                        output_path=str(directory / f"{stem}.{part.name}.{output_format}"),
+                        scad_source=part.source,
+                        defines=defines,
+                        backend=backend,
+                    )
+                )
+                for part in parts
+            ]
+    except ExceptionGroup as errors:
+        raise errors.exceptions[0] from errors
+    results = [task.result() for task in tasks]
+
+    merged_path = None
+    if merge_3mf:
+        target = directory / f"{stem}.3mf"
+        paths = [Path(str(result["output_path"])) for result in results]
+        with job_workspace(config.workspace.scratch_dir) as scratch:
+            await asyncio.to_thread(_merge, [part.name for part in parts], paths, scratch / target.name, compression)
+            promote(scratch / target.name, target)
+        merged_path = str(target)
+
+    return {
+        "parts": [
+            {
+                "name": part.name,
+                "output_path": result["output_path"],
+                "cached": bool(result["cached"] or result["transcoded_from"]),
+            }
+            for part, result in zip(parts, results)
+        ],
+        "merged_path": merged_path,
+    }
+
+
+def _merge(names: list[str], paths: list[Path], target: Path, compression: int | None) -> None:
+    """Write STL parts into one 3MF with an object per part.
+
+    Args:
+        names: Part names.
+        paths: STL files in the same order.
+        target: Destination 3MF path.
+        compression: Optional deflate level.
+    """
+    write_3mf(target, [(name, load_stl(path)) for name, path in zip(names, paths)], compression=compression)
@@ -0,0 +1,151 @@
+"""MCP tool for comparing OpenSCAD geometry backends."""
+
+from __future__ import annotations
+
+import logging
+import time
+from pathlib import Path
+
+from scad_mcp.config.models import AppConfig
+from scad_mcp.execution import WORKER_POOL
+from scad_mcp.models import ConvertRequest, DefineValue, OpenScadCapabilities
+from scad_mcp.openscad.converter import convert_scad
+from scad_mcp.openscad.installer import find_openscad_executable, probe_capabilities
+from scad_mcp.validation import validate_defines, validate_scad_file
+from scad_mcp.workspace import job_workspace
+
+LOGGER = logging.getLogger("scad_mcp.tools.backend_benchmark")
+
+
+async def benchmark_backends(
+    config: AppConfig,
+    scad_files: list[str],
+    defines: dict[str, DefineValue] | None = None,
+    repeats: int = 1,
+) -> dict[str, object]:
+    """Export each model with CGAL and Manifold and compare timings.
+
+    Runs go one at a time, each on a worker slot, so they do not compete
+    with each other for CPU. They bypass the result cache and never fall back
+    between backends.
+
+    Args:
+        config: Application configuration.
+        scad_files: Paths of the .scad files to benchmark.
+        defines: Optional SCAD variable overrides passed with -D.
+        repeats: Runs per model and backend; the fastest run is reported.
+
+    Returns:
+        Dict with per-model timings, errors, winner and CGAL/Manifold speedup,
+        wins and total time per backend, and the recommended backend.
+
+    Raises:
+        ValueError: When no files are given, repeats is not positive, or a
+            file or define is invalid.
+        FileNotFoundError: When a model does not exist.
+        RuntimeError: When OpenSCAD cannot be found.
+    """
+    if not scad_files:
+        raise ValueError("scad_files must list at least one model.")
+    if repeats < 1:
+        raise ValueError("repeats must be at least 1.")
+    # Checked up front so a bad path fails the request before any model is timed.
+    for scad_file in scad_files:
+        validate_scad_file(Path(scad_file))
+    validate_defines(defines or {})
+    resolved_path = find_openscad_executable(config.openscad.path)
+    if not resolved_path:
+        LOGGER.error("OpenSCAD executable not found for benchmark.")
+        raise RuntimeError("OpenSCAD executable not found.")
+    capabilities = await probe_capabilities(resolved_path)
+    backends = ["cgal", "manifold"] if capabilities.manifold else ["cgal"]
+
+    models = []
+    wins = {backend: 0 for backend in backends}
+    totals = {backend: 0.0 for backend in backends}
+    for scad_file in scad_files:
+        timings: dict[str, float | None] = {}
+        errors: dict[str, str | None] = {}
+        for backend in backends:
+            timings[backend], errors[backend] = await _time_export(
+                config, resolved_path, Path(scad_file), defines or {}, backend, capabilities, repeats,
+            )
+        entry: dict[str, object] = {"scad_file": scad_file}
+        for backend in backends:
+            entry[f"{backend}_seconds"] = timings[backend]
+            entry[f"{backend}_error"] = errors[backend]
+        succeeded = [backend for backend in backends if timings[backend] is not None]
+        winner = min(succeeded, key=lambda backend: timings[backend]) if succeeded else None
+        entry["winner"] = winner
+        entry["speedup"] = None
+        if winner:
+            wins[winner] += 1
+        # Totals only count models every backend exported, so they stay comparable.
+        if len(succeeded) == len(backends):
+            for backend in backends:
+                totals[backend] += timings[backend]
+            if "manifold" in timings and timings["manifold"]:
+                entry["speedup"] = timings["cgal"] / timings["manifold"]
+        models.append(entry)
+        LOGGER.info("Benchmarked %s: %s", scad_file, {backend: timings[backend] for backend in backends})
+
+    recommended = "cgal"
+    if capabilities.manifold and wins["manifold"] and totals["manifold"] <= totals["cgal"]:
+        recommended = "manifold"
+    return {
+        "manifold_available": capabilities.manifold,
+        "models": models,
+        "wins": wins,
+        "total_seconds": totals,
+        "recommended_backend": recommended,
+    }
+
+
+async def _time_export(
+    config: AppConfig,
+    openscad_path: Path,
+    scad_file: Path,
+    defines: dict[str, DefineValue],
+    backend: str,
+    capabilities: OpenScadCapabilities,
+    repeats: int,
+) -> tuple[float | None, str | None]:
+    """Time the fastest STL export of a model on one backend.
+
+    Args:
+        config: Application configuration.
+        openscad_path: OpenSCAD executable.
+        scad_file: Model to export.
+        defines: SCAD variable overrides.
+        backend: "cgal" or "manifold".
+        capabilities: Features of the OpenSCAD build.
+        repeats: Number of runs.
+
+    Returns:
+        Fastest wall time in seconds and None, or None and the error message.
+    """
+    best: float | None = None
+    for _ in range(repeats):
+        async with WORKER_POOL.slot():
+            with job_workspace(config.workspace.scratch_dir) as scratch:
+                request = ConvertRequest(
+                    scad_file=scad_file,
+                    output_file=scratch / f"{scad_file.stem}.{backend}.stl",
+                    defines=defines,
+                )
+                started = time.perf_counter()
+                try:
+                    await convert_scad(
+                        request=request,
+                        openscad_path=openscad_path,
+                        timeout=config.execution.timeout,
+                        capabilities=capabilities,
+                        backend=backend,
+                        fallback=False,
+                    )
+                except (RuntimeError, TimeoutError) as exc:
+                    LOGGER.warning("%s backend failed on %s: %s", backend, scad_file, exc)
+                    return None, str(exc)
+                elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, None
@@ -0,0 +1,56 @@
+"""MCP tool for querying the job history."""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from scad_mcp.config.models import AppConfig
+from scad_mcp.history import JOB_HISTORY
+
+LOGGER = logging.getLogger("scad_mcp.tools.job_history")
+
+
+async def job_history(
+    config: AppConfig,
+    query: str = "slowest",
+    limit: int = 10,
+    kind: str | None = None,
+    hours: float | None = None,
+) -> dict[str, object]:
+    """Run a report against the job history.
+
+    Args:
+        config: Application configuration.
+        query: "slowest" models, "failures" hotspots, "cache" efficiency,
+            "capacity" use of the worker pool, or "recent" jobs.
+        limit: Maximum rows.
+        kind: Optional job kind, "render" or "convert".
+        hours: Optional window; only jobs from the last hours are included.
+
+    Returns:
+        Dict with the query, database path, window and result rows. Capacity
+        rows include worker utilization when a window is given.
+
+    Raises:
+        ValueError: When the query, kind or window is invalid.
+        RuntimeError: When the job history is disabled.
+    """
+    if kind is not None and kind not in {"render", "convert"}:
+        raise ValueError("kind must be render or convert.")
+    if hours is not None and hours <= 0:
+        raise ValueError("hours must be positive.")
+    since = time.time() - hours * 3600 if hours else 0.0
+    rows = await JOB_HISTORY.query(query, limit=limit, kind=kind, since=since)
+    if query == "capacity" and hours:
+        # Share of the window the worker pool spent running OpenSCAD.
+        available = hours * 3600 * config.execution.max_workers
+        for row in rows:
+            row["utilization"] = (row["busy_seconds"] or 0.0) / available
+    LOGGER.debug("Job history %s returned %d rows", query, len(rows))
+    return {
+        "query": query,
+        "database": str(JOB_HISTORY.path),
+        "hours": hours,
+        "rows": rows,
+    }
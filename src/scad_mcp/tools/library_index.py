@@ -0,0 +1,55 @@
+"""MCP tool for looking up installed OpenSCAD libraries."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from scad_mcp.config.models import AppConfig
+from scad_mcp.libraries import LIBRARY_INDEX, library_roots
+from scad_mcp.sources import resolve_scad_input
+
+LOGGER = logging.getLogger("scad_mcp.tools.library_index")
+
+
+async def check_libraries(
+    config: AppConfig,
+    scad_file: str | None = None,
+    scad_source: str | None = None,
+    names: list[str] | None = None,
+) -> dict[str, object]:
+    """Look up library definitions and check a model's references without running OpenSCAD.
+
+    Args:
+        config: Application configuration.
+        scad_file: Optional model to check.
+        scad_source: Optional inline model source to check.
+        names: Optional module or function names to look up.
+
+    Returns:
+        Dict with the library search path and file counts, the files defining
+        each requested name, and for a model its dependencies with content
+        digests, unresolved use/include references, and called names that no
+        visible file defines, each with the library files that do define it.
+    """
+    roots = library_roots(config.libraries.paths)
+    catalog = await asyncio.to_thread(LIBRARY_INDEX.catalog, roots)
+    counts = await asyncio.to_thread(lambda: [sum(1 for _ in root.rglob("*.scad")) for root in roots])
+    libraries = {str(root): count for root, count in zip(roots, counts)}
+
+    def where(name: str) -> list[dict[str, str]]:
+        return [{"kind": kind, "path": str(path)} for kind, path in catalog.get(name, [])]
+
+    result: dict[str, object] = {"roots": [str(root) for root in roots], "libraries": libraries}
+    if names:
+        result["definitions"] = {name: where(name) for name in names}
+        result["unknown"] = [name for name in names if name not in catalog]
+    if scad_file is not None or scad_source is not None:
+        scad_path, _ = await resolve_scad_input(config, scad_file, scad_source)
+        files, unresolved = await asyncio.to_thread(LIBRARY_INDEX.dependencies, scad_path, roots)
+        undefined = await asyncio.to_thread(LIBRARY_INDEX.undefined_calls, scad_path, roots)
+        result["dependencies"] = [{"path": str(item.path), "digest": item.digest} for item in files]
+        result["unresolved"] = unresolved
+        result["undefined"] = [{"name": name, "defined_in": where(name)} for name in undefined]
+        LOGGER.debug("Checked %s: %d dependencies, %d undefined", scad_path, len(files), len(undefined))
+    return result
@@ -0,0 +1,132 @@
+"""MCP tool for comparing exported geometry between two revisions."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+
+from scad_mcp.config.models import AppConfig
+from scad_mcp.mesh import load_stl, mesh_stats, surface_distance
+from scad_mcp.models import DefineValue
+from scad_mcp.tools.model_converter import convert_model, mesh_cache_path
+
+LOGGER = logging.getLogger("scad_mcp.tools.mesh_diff")
+
+
+async def _export_mesh(
+    config: AppConfig,
+    label: str,
+    scad_file: str | None,
+    scad_source: str | None,
+    defines: dict[str, DefineValue] | None,
+) -> tuple[Path, bool]:
+    """Export one side of a comparison to STL, reusing cached meshes.
+
+    Args:
+        config: Application configuration.
+        label: Subdirectory name keeping the two sides apart.
+        scad_file: Path to the .scad file.
+        scad_source: Inline SCAD source.
+        defines: SCAD variable overrides.
+
+    Returns:
+        Tuple of the STL path and whether it was reused from a cached mesh.
+    """
+    mesh_path = mesh_cache_path(config, label, scad_file, scad_source, defines)
+    result = await convert_model(
+        config=config,
+        scad_file=scad_file,
+        output_path=str(mesh_path),
+        scad_source=scad_source,
+        defines=defines,
+    )
+    return Path(str(result["output_path"])), bool(result["cached"] or result["transcoded_from"])
+
+
+def _compare(mesh_a: Path, mesh_b: Path, sample_count: int) -> dict[str, object]:
+    """Compare two STL meshes.
+
+    Args:
+        mesh_a: Baseline mesh.
+        mesh_b: Mesh to compare.
+        sample_count: Surface samples per mesh for the distance estimate.
+
+    Returns:
+        Dict of geometry deltas.
+    """
+    triangles_a = load_stl(mesh_a)
+    triangles_b = load_stl(mesh_b)
+    stats_a = mesh_stats(triangles_a)
+    stats_b = mesh_stats(triangles_b)
+    hausdorff, mean_distance = surface_distance(triangles_a, triangles_b, sample_count)
+    size_a = [high - low for low, high in zip(stats_a.bbox_min, stats_a.bbox_max)]
+    size_b = [high - low for low, high in zip(stats_b.bbox_min, stats_b.bbox_max)]
+    return {
+        "triangles_a": stats_a.triangles,
+        "triangles_b": stats_b.triangles,
+        "triangle_delta": stats_b.triangles - stats_a.triangles,
+        "volume_a": stats_a.volume,
+        "volume_b": stats_b.volume,
+        "volume_delta": stats_b.volume - stats_a.volume,
+        "bbox_a": [list(stats_a.bbox_min), list(stats_a.bbox_max)],
+        "bbox_b": [list(stats_b.bbox_min), list(stats_b.bbox_max)],
+        "bbox_size_delta": [b - a for a, b in zip(size_a, size_b)],
+        "hausdorff_distance": hausdorff,
+        "mean_distance": mean_distance,
+    }
+
+
+async def diff_meshes(
+    config: AppConfig,
+    scad_file_a: str | None = None,
+    scad_source_a: str | None = None,
+    scad_file_b: str | None = None,
+    scad_source_b: str | None = None,
+    defines_a: dict[str, DefineValue] | None = None,
+    defines_b: dict[str, DefineValue] | None = None,
+    sample_count: int = 20000,
+    tolerance: float = 1e-6,
+) -> dict[str, object]:
+    """Export two variants to STL and compare their geometry.
+
+    Variant B defaults to the source of variant A, so two parameter sets of
+    one model can be compared by passing only defines_b.
+
+    Args:
+        config: Application configuration.
+        scad_file_a: Path to the baseline .scad file.
+        scad_source_a: Inline baseline SCAD source.
+        scad_file_b: Path to the .scad file to compare.
+        scad_source_b: Inline SCAD source to compare.
+        defines_a: SCAD variable overrides for the baseline.
+        defines_b: SCAD variable overrides for the comparison.
+        sample_count: Surface samples per mesh for the distance estimate.
+        tolerance: Hausdorff distance and volume change at or below which the
+            meshes count as unchanged.
+
+    Returns:
+        Dict with mesh paths, triangle count, volume and bounding-box deltas,
+        Hausdorff and mean surface distances, and a changed flag.
+    """
+    if not 0 <= sample_count <= 1_000_000:
+        raise ValueError("Sample count must be between 0 and 1000000.")
+    if scad_file_b is None and scad_source_b is None:
+        scad_file_b, scad_source_b = scad_file_a, scad_source_a
+
+    mesh_a, cached_a = await _export_mesh(config, "a", scad_file_a, scad_source_a, defines_a)
+    mesh_b, cached_b = await _export_mesh(config, "b", scad_file_b, scad_source_b, defines_b)
+    LOGGER.info("Comparing meshes %s and %s", mesh_a, mesh_b)
+    comparison = await asyncio.to_thread(_compare, mesh_a, mesh_b, sample_count)
+
+    # Triangle counts are reported but not compared: a retriangulated face
+    # is the same geometry.
+    changed = comparison["hausdorff_distance"] > tolerance or abs(comparison["volume_delta"]) > tolerance
+    return {
+        "mesh_a": str(mesh_a),
+        "mesh_b": str(mesh_b),
+        "cached_a": cached_a,
+        "cached_b": cached_b,
+        "changed": changed,
+        **comparison,
+    }
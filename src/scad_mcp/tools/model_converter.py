@@ -2,48 +2,146 @@
 
 from __future__ import annotations
 
+import asyncio
+from dataclasses import asdict
+import json
 import logging
 from pathlib import Path
 
+from scad_mcp.cache import RESULT_CACHE, CacheEntry
 from scad_mcp.config.models import AppConfig
-from scad_mcp.models import ConvertRequest
-from scad_mcp.openscad.installer import find_openscad_executable
+from scad_mcp.execution import WORKER_POOL, OverloadedError
+from scad_mcp.history import JOB_HISTORY
+from scad_mcp.mesh import MESH_WRITERS, load_numpy, load_stl, write_mesh
+from scad_mcp.models import ConvertRequest, DefineValue, ExportOptions, RenderRequest
+from scad_mcp.openscad.installer import find_openscad_executable, probe_capabilities
+from scad_mcp.openscad.cli import defines_suffix, select_backend
 from scad_mcp.openscad.converter import convert_scad
-from scad_mcp.tools.model_renderer import RENDER_LOCK
+from scad_mcp.openscad.renderer import render_scad
+from scad_mcp.sources import resolve_scad_input, source_digest
+from scad_mcp.validation import validate_backend, validate_export_options, validate_priority
+from scad_mcp.workspace import job_workspace, promote
 
 LOGGER = logging.getLogger("scad_mcp.tools.model_converter")
 
 
+def mesh_cache_path(
+    config: AppConfig,
+    label: str,
+    scad_file: str | None,
+    scad_source: str | None,
+    defines: dict[str, DefineValue] | None = None,
+) -> Path:
+    """Return a cache path for an intermediate STL export of a model.
+
+    Meshes are named by source identity, a digest of inline source text or
+    of a file's resolved path, so concurrent jobs never share an output and
+    a user's source directory is never written to.
+
+    Args:
+        config: Application configuration.
+        label: Subdirectory name keeping callers apart.
+        scad_file: Path to the .scad file.
+        scad_source: Inline SCAD source.
+        defines: SCAD variable overrides, included in the file name.
+
+    Returns:
+        STL path under the cache directory.
+    """
+    if scad_file:
+        path = Path(scad_file).expanduser().resolve()
+        stem = f"{path.stem}-{source_digest(str(path).encode('utf-8'))[:8]}"
+    else:
+        stem = source_digest((scad_source or "").encode("utf-8"))
+    return config.cache.directory / "meshes" / label / f"{stem}{defines_suffix(defines or {})}.stl"
+
+
 async def convert_model(
     config: AppConfig,
-    scad_file: str,
+    scad_file: str | None,
     output_format: str | None = None,
     output_path: str | None = None,
-) -> dict[str, str | list[str]]:
+    scad_source: str | None = None,
+    defines: dict[str, DefineValue] | None = None,
+    stl_encoding: str | None = None,
+    compression: int | None = None,
+    decimal_precision: int | None = None,
+    backend: str | None = None,
+    priority: str = "normal",
+) -> dict[str, str | bool | list[str] | None]:
     """Convert a SCAD file to another format.
 
+    STL defaults to the binary encoding when OpenSCAD supports choosing it.
+    When an inline source was already exported to STL with the same defines,
+    STL, OFF, and 3MF outputs are written from that mesh without running
+    OpenSCAD again.
+
     Args:
         config: Application configuration.
-        scad_file: Path to the .scad file.
+        scad_file: Path to the .scad file. Mutually exclusive with scad_source.
         output_format: Target format (e.g. "stl", "3mf", "amf"). Optional if output_path is provided.
         output_path: Optional explicit output path. If provided, output_format is ignored.
+        scad_source: Inline SCAD source. Identical sources share cached exports.
+        defines: Optional SCAD variable overrides passed with -D.
+        stl_encoding: Optional "binary" or "ascii" STL encoding.
+        compression: Optional 3MF deflate level, 0 (stored) to 9.
+        decimal_precision: Optional decimal places for ASCII STL, OFF, and 3MF coordinates.
+        backend: Geometry backend, "auto", "manifold", or "cgal". Defaults to the configured backend.
+        priority: Queue priority, "high", "normal", or "low". Low priority work is shed first under load.
 
     Returns:
-        Dict with output file path and command used.
+        Dict with output file path, command used, whether the export was cached,
+        and the cached mesh it was transcoded from, if any.
     """
-    scad_path = Path(scad_file)
+    scad_path, digest = await resolve_scad_input(config, scad_file, scad_source)
+    requested_backend = backend or config.openscad.backend
+    validate_backend(requested_backend)
+    validate_priority(priority)
 
     if output_path:
         out_path = Path(output_path)
     elif output_format:
-        out_path = scad_path.with_suffix(f".{output_format.lstrip('.')}")
+        stem = f"{scad_path.stem}{defines_suffix(defines or {})}"
+        out_path = scad_path.with_name(f"{stem}.{output_format.lstrip('.')}")
     else:
         raise ValueError("Either output_format or output_path must be provided.")
 
     request = ConvertRequest(
         scad_file=scad_path,
         output_file=out_path,
+        defines=defines or {},
+        options=ExportOptions(
+            stl_encoding=stl_encoding,
+            compression=compression,
+            decimal_precision=decimal_precision,
+        ),
     )
+    # Checked before the cache lookup so a cached or transcoded export cannot accept bad options
+    validate_export_options(
+        out_path.suffix.lstrip(".").lower(), stl_encoding, compression, decimal_precision,
+    )
+
+    parameters = {
+        "output_path": out_path, "defines": request.defines, "options": asdict(request.options),
+        "backend": requested_backend,
+    }
+
+    cache_key = None
+    mesh_key = None
+    if digest:
+        cache_key = RESULT_CACHE.key(
+            "convert", digest, out_path, request.defines, request.options, requested_backend,
+        )
+        cached = RESULT_CACHE.get(cache_key)
+        if cached:
+            LOGGER.info("Conversion cache hit for source %s", digest)
+            JOB_HISTORY.record_cache_hit("convert", scad_path, digest, parameters, cached.path)
+            return {"output_path": str(cached.path), "command": cached.command, "cached": True, "transcoded_from": None}
+        mesh_key = RESULT_CACHE.key("mesh", digest, request.defines, requested_backend)
+        mesh = RESULT_CACHE.get(mesh_key)
+        if mesh and _can_transcode(out_path):
+            JOB_HISTORY.record_cache_hit("convert", scad_path, digest, parameters, mesh.path)
+            return await _write_from_mesh(config, mesh, out_path, request.options, cache_key)
 
     executable_path = config.openscad.path
     resolved_path = find_openscad_executable(executable_path)
@@ -51,19 +149,308 @@ async def convert_model(
     if not resolved_path:
         LOGGER.error("OpenSCAD executable not found for conversion.")
         raise RuntimeError("OpenSCAD executable not found.")
+    capabilities = await probe_capabilities(resolved_path)
+    selected = select_backend(requested_backend, capabilities)
 
     try:
-        # Use the same lock as rendering since OpenSCAD is single-threaded
-        async with RENDER_LOCK:
-            result = await convert_scad(
-                request=request,
-                openscad_path=resolved_path,
-            )
+        with JOB_HISTORY.track("convert", scad_path, digest, parameters) as job:
+            # Renders and conversions share one pool of OpenSCAD worker slots
+            async with WORKER_POOL.slot(priority, JOB_HISTORY.estimate("convert", job.source_hash)) as placement:
+                job.running(placement)
+                with job_workspace(config.workspace.scratch_dir) as scratch:
+                    result = await convert_scad(
+                        request=request,
+                        openscad_path=resolved_path,
+                        timeout=config.execution.timeout,
+                        scratch_dir=scratch,
+                        capabilities=capabilities,
+                        backend=selected,
+                    )
+            job.finish(result.output_path, result.command)
+    except OverloadedError:
+        raise
     except Exception:
-        LOGGER.exception("Conversion failed for %s", scad_file)
+        LOGGER.exception("Conversion failed for %s", scad_path)
         raise
 
+    if cache_key:
+        entry = CacheEntry(path=result.output_path, command=result.command)
+        RESULT_CACHE.put(cache_key, entry)
+        if out_path.suffix.lower() == ".stl":
+            RESULT_CACHE.put(mesh_key, entry)
     return {
         "output_path": str(result.output_path),
         "command": result.command,
+        "cached": False,
+        "transcoded_from": None,
+    }
+
+
+async def convert_model_formats(
+    config: AppConfig,
+    scad_file: str | None,
+    output_formats: list[str],
+    output_path: str | None = None,
+    scad_source: str | None = None,
+    defines: dict[str, DefineValue] | None = None,
+    stl_encoding: str | None = None,
+    compression: int | None = None,
+    decimal_precision: int | None = None,
+    backend: str | None = None,
+    priority: str = "normal",
+) -> dict[str, object]:
+    """Export a SCAD file to several formats from a single evaluation.
+
+    OpenSCAD evaluates the geometry once into a binary STL; STL, OFF, and 3MF
+    outputs are written from that mesh and a PNG thumbnail is rendered from an
+    import of it, so CGAL runs only once. Other formats (e.g. AMF), and mesh
+    formats when NumPy is not installed, need their own OpenSCAD export each.
+
+    Args:
+        config: Application configuration.
+        scad_file: Path to the .scad file. Mutually exclusive with scad_source.
+        output_formats: Target formats, e.g. ["stl", "3mf", "png"].
+        output_path: Optional output path whose stem names every output; its suffix is ignored.
+        scad_source: Inline SCAD source. Identical sources share cached exports.
+        defines: Optional SCAD variable overrides passed with -D.
+        stl_encoding: Optional "binary" or "ascii" encoding for the STL output.
+        compression: Optional deflate level for the 3MF output.
+        decimal_precision: Optional decimal places for ASCII STL, OFF, and 3MF coordinates.
+        backend: Geometry backend, "auto", "manifold", or "cgal". Defaults to the configured backend.
+        priority: Queue priority, "high", "normal", or "low".
+
+    Returns:
+        Dict with the output path per format, the mesh they were written from,
+        the OpenSCAD commands run, and whether the geometry was evaluated.
+
+    Raises:
+        ValueError: When no formats are given or the options are invalid.
+    """
+    formats = list(dict.fromkeys(fmt.lstrip(".").lower() for fmt in output_formats))
+    if not formats:
+        raise ValueError("output_formats must list at least one format.")
+    scad_path, digest = await resolve_scad_input(config, scad_file, scad_source)
+    requested_backend = backend or config.openscad.backend
+    suffix = defines_suffix(defines or {})
+    base = Path(output_path).with_suffix("") if output_path else scad_path.with_name(f"{scad_path.stem}{suffix}")
+    targets = {fmt: base.with_name(f"{base.name}.{fmt}") for fmt in formats}
+    options = {
+        fmt: _format_options(fmt, stl_encoding, compression, decimal_precision) for fmt in formats
+    }
+    for fmt in formats:
+        if fmt != "png":
+            validate_export_options(
+                fmt, options[fmt].stl_encoding, options[fmt].compression, options[fmt].decimal_precision,
+            )
+
+    outputs: dict[str, str] = {}
+    commands: list[list[str]] = []
+    evaluated = False
+    mesh_path = None
+    transcoded = [fmt for fmt in formats if fmt != "png" and _can_transcode(targets[fmt])]
+    derived = [fmt for fmt in formats if fmt == "png"] + transcoded
+    with job_workspace(config.workspace.scratch_dir) as scratch:
+        if derived:
+            # A binary STL output doubles as the mesh; otherwise keep one next to the cached source.
+            if "stl" in targets and stl_encoding != "ascii":
+                mesh_target = targets["stl"]
+            elif digest:
+                mesh_target = config.cache.directory / "meshes" / f"{scad_path.stem}{suffix}.stl"
+            else:
+                mesh_target = scratch / f"{scad_path.stem}{suffix}.stl"
+            mesh_result = await convert_model(
+                config=config,
+                scad_file=scad_file,
+                output_path=str(mesh_target),
+                scad_source=scad_source,
+                defines=defines,
+                backend=backend,
+                priority=priority,
+            )
+            mesh = CacheEntry(path=Path(mesh_result["output_path"]), command=mesh_result["command"])
+            if not mesh_result["cached"] and not mesh_result["transcoded_from"]:
+                evaluated = True
+                commands.append(mesh.command)
+            if mesh.path.parent != scratch:
+                mesh_path = str(mesh.path)
+            for fmt in formats:
+                target = targets[fmt]
+                if fmt == "png":
+                    image_path, command = await _render_mesh(config, mesh.path, target, scratch, priority)
+                    commands.append(command)
+                    outputs[fmt] = str(image_path)
+                elif target == mesh.path:
+                    outputs[fmt] = str(target)
+                elif fmt in transcoded:
+                    cache_key = None
+                    if digest:
+                        cache_key = RESULT_CACHE.key(
+                            "convert", digest, target, defines or {}, options[fmt], requested_backend,
+                        )
+                    result = await _write_from_mesh(config, mesh, target, options[fmt], cache_key)
+                    outputs[fmt] = result["output_path"]
+
+        for fmt in formats:
+            if fmt in outputs:
+                continue
+            result = await convert_model(
+                config=config,
+                scad_file=scad_file,
+                output_path=str(targets[fmt]),
+                scad_source=scad_source,
+                defines=defines,
+                backend=backend,
+                priority=priority,
+            )
+            if not result["cached"]:
+                evaluated = True
+                commands.append(result["command"])
+            outputs[fmt] = result["output_path"]
+
+    return {
+        "outputs": {fmt: outputs[fmt] for fmt in formats},
+        "mesh_path": mesh_path,
+        "commands": commands,
+        "evaluated": evaluated,
     }
+
+
+def _format_options(
+    output_format: str,
+    stl_encoding: str | None,
+    compression: int | None,
+    decimal_precision: int | None,
+) -> ExportOptions:
+    """Select the export options that apply to one of several formats.
+
+    Args:
+        output_format: Target format.
+        stl_encoding: Requested STL encoding.
+        compression: Requested 3MF deflate level.
+        decimal_precision: Requested coordinate decimals.
+
+    Returns:
+        Options relevant to output_format.
+    """
+    if output_format == "stl":
+        precision = decimal_precision if stl_encoding == "ascii" else None
+        return ExportOptions(stl_encoding=stl_encoding, decimal_precision=precision)
+    if output_format == "3mf":
+        return ExportOptions(compression=compression, decimal_precision=decimal_precision)
+    if output_format == "off":
+        return ExportOptions(decimal_precision=decimal_precision)
+    return ExportOptions()
+
+
+async def _write_from_mesh(
+    config: AppConfig,
+    mesh: CacheEntry,
+    out_path: Path,
+    options: ExportOptions,
+    cache_key: str | None,
+) -> dict[str, str | bool | list[str] | None]:
+    """Write an output from an exported mesh without running OpenSCAD.
+
+    Args:
+        config: Application configuration.
+        mesh: Exported STL mesh and the command that produced it.
+        out_path: Destination path; the suffix selects the format.
+        options: Export options for the destination.
+        cache_key: Optional result cache key for the destination.
+
+    Returns:
+        Converter result dict for out_path.
+    """
+    with job_workspace(config.workspace.scratch_dir) as scratch:
+        await asyncio.to_thread(_transcode, mesh.path, scratch / out_path.name, options)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        promote(scratch / out_path.name, out_path)
+    LOGGER.info("Wrote %s from mesh %s", out_path, mesh.path)
+    if cache_key:
+        RESULT_CACHE.put(cache_key, CacheEntry(path=out_path, command=mesh.command))
+    return {"output_path": str(out_path), "command": mesh.command, "cached": False, "transcoded_from": str(mesh.path)}
+
+
+async def _render_mesh(
+    config: AppConfig,
+    mesh_path: Path,
+    target: Path,
+    scratch: Path,
+    priority: str = "normal",
+) -> tuple[Path, list[str]]:
+    """Render a PNG thumbnail of an exported mesh.
+
+    The mesh is imported into a wrapper file and captured as a preview, so
+    OpenSCAD draws the triangles without evaluating the CSG again.
+
+    Args:
+        config: Application configuration.
+        mesh_path: Exported STL mesh.
+        target: Destination image path.
+        scratch: Job workspace for the wrapper file.
+        priority: Queue priority.
+
+    Returns:
+        Image path and the command used.
+    """
+    wrapper = scratch / f"{target.stem}.scad"
+    wrapper.write_text(f"import({json.dumps(str(mesh_path.resolve()))});\n", encoding="utf-8")
+    resolved_path = find_openscad_executable(config.openscad.path)
+    if not resolved_path:
+        LOGGER.error("OpenSCAD executable not found for thumbnail.")
+        raise RuntimeError("OpenSCAD executable not found.")
+    render_cfg = config.render
+    request = RenderRequest(
+        scad_file=wrapper,
+        projection=render_cfg.projection,
+        fov=render_cfg.fov,
+        angles=["top", "front", "right"],
+        output_dir=scratch / "png",
+        quality="draft",
+    )
+    async with WORKER_POOL.slot(priority):
+        result = await render_scad(
+            request=request,
+            openscad_path=resolved_path,
+            img_width=render_cfg.img_width,
+            img_height=render_cfg.img_height,
+            timeout=config.execution.timeout,
+        )
+    target.parent.mkdir(parents=True, exist_ok=True)
+    promote(result.image_path, target)
+    return target, result.command
+
+
+def _can_transcode(out_path: Path) -> bool:
+    """Return whether out_path can be written from a cached mesh.
+
+    Args:
+        out_path: Requested output path.
+
+    Returns:
+        True when the format has a mesh writer and NumPy is installed.
+    """
+    if out_path.suffix.lstrip(".").lower() not in MESH_WRITERS:
+        return False
+    try:
+        load_numpy()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _transcode(mesh_path: Path, target: Path, options: ExportOptions) -> None:
+    """Write a cached STL mesh in another format or encoding.
+
+    Args:
+        mesh_path: Cached STL mesh.
+        target: Destination path; the suffix selects the format.
+        options: Export options for the destination.
+    """
+    write_mesh(
+        target,
+        load_stl(mesh_path),
+        stl_encoding=options.stl_encoding or "binary",
+        compression=options.compression,
+        precision=options.decimal_precision,
+    )
@@ -4,71 +4,355 @@ from __future__ import annotations
 
 import logging
 import asyncio
+from dataclasses import replace
+from collections import OrderedDict
 from pathlib import Path
 
+from scad_mcp.cache import RESULT_CACHE, CacheEntry
 from scad_mcp.config.models import AppConfig
-from scad_mcp.models import RenderRequest
-from scad_mcp.openscad.installer import find_openscad_executable
+from scad_mcp.execution import WORKER_POOL, OverloadedError
+from scad_mcp.history import JOB_HISTORY
+from scad_mcp.imaging import encode_variant
+from scad_mcp.libraries import model_digest
+from scad_mcp.mesh import load_stl, mesh_stats
+from scad_mcp.models import BoundingBox, DefineValue, OpenScadCapabilities, RenderRequest
+from scad_mcp.openscad.camera import VIEW_PRESETS, canonical_orbit, orbit_from_angles, probe_bounds
+from scad_mcp.openscad.cli import select_backend
+from scad_mcp.openscad.installer import find_openscad_executable, probe_capabilities
 from scad_mcp.openscad.renderer import render_scad
+from scad_mcp.sources import resolve_scad_input
+from scad_mcp.validation import (
+    validate_angles,
+    validate_backend,
+    validate_framing,
+    validate_image_format,
+    validate_priority,
+    validate_thumbnail_size,
+)
+from scad_mcp.workspace import job_workspace
 
 LOGGER = logging.getLogger("scad_mcp.tools.model_renderer")
 
-# Global lock to ensure only one OpenSCAD instance runs at a time
-RENDER_LOCK = asyncio.Lock()
+# Bounding boxes by source and defines; small, so kept for the life of the process.
+BOUNDS_CACHE_SIZE = 256
+_BOUNDS: OrderedDict[str, BoundingBox] = OrderedDict()
+# Probes in flight, so concurrent views of one model share a single evaluation.
+_PENDING_BOUNDS: dict[str, asyncio.Future[BoundingBox]] = {}
 
 async def render_model(
     config: AppConfig,
-    scad_file: str,
+    scad_file: str | None,
     projection: str | None,
     fov: float | None,
     angles: list[str],
     output_dir: str | None,
     img_width: int | None = None,
     img_height: int | None = None,
-) -> dict[str, str | list[str]]:
+    scad_source: str | None = None,
+    thumbnail_size: int | None = None,
+    image_format: str | None = None,
+    defines: dict[str, DefineValue] | None = None,
+    quality: str | None = None,
+    backend: str | None = None,
+    priority: str = "normal",
+    azimuth: float | None = None,
+    elevation: float | None = None,
+    view: str | None = None,
+    framing: str | None = None,
+    bounds: BoundingBox | None = None,
+) -> dict[str, str | bool | list[str]]:
     """Render a SCAD file and return output metadata.
 
     Args:
         config: Application configuration.
-        scad_file: Path to the .scad file.
+        scad_file: Path to the .scad file. Mutually exclusive with scad_source.
         projection: Perspective or orthographic projection.
         fov: Field of view in degrees.
         angles: One or two view angles. The final angle is the mean of the two. Choices are "front", "back", "left", "right", "top", "bottom".
         output_dir: Optional output directory for renders.
         img_width: Output image width in pixels.
         img_height: Output image height in pixels.
+        scad_source: Inline SCAD source. Identical sources share cached renders.
+        thumbnail_size: Optional longest edge of a downscaled copy of the render.
+        image_format: Optional encoding of the copy, "png" or "webp".
+        defines: Optional SCAD variable overrides passed with -D.
+        quality: Quality tier, "draft", "standard", or "high".
+        backend: Geometry backend, "auto", "manifold", or "cgal". Defaults to the configured backend.
+        priority: Queue priority, "high", "normal", or "low". Low priority work is shed first under load.
+        azimuth: Optional orbit angle in degrees around Z, replacing angles; 0 is the front.
+        elevation: Orbit elevation in degrees above the XY plane, used with azimuth.
+        view: Optional preset such as "isometric", replacing angles and azimuth.
+        framing: "auto" lets OpenSCAD center and fit the model; "bbox" frames the
+            model's cached bounding box. Defaults to the configured framing.
+        bounds: Known bounding box for bbox framing, skipping the lookup.
 
     Returns:
-        Dict with rendered image path and command used.
+        Dict with rendered image path, command used, and whether the render was cached.
+        When a thumbnail or format is requested, encoded_path points to the encoded copy.
     """
     render_cfg = config.render
     angle_list = angles or ["front"]
+    scad_path, digest = await resolve_scad_input(config, scad_file, scad_source)
+    width = img_width if img_width is not None else render_cfg.img_width
+    height = img_height if img_height is not None else render_cfg.img_height
+    if thumbnail_size is not None:
+        validate_thumbnail_size(thumbnail_size)
+    if image_format is not None:
+        validate_image_format(image_format)
+    requested_backend = backend or config.openscad.backend
+    validate_backend(requested_backend)
+    validate_priority(priority)
+    framing = framing or render_cfg.framing
+    validate_framing(framing)
+    if view is not None:
+        if view not in VIEW_PRESETS:
+            raise ValueError(f"View must be one of {', '.join(sorted(VIEW_PRESETS))}.")
+        azimuth, elevation = VIEW_PRESETS[view]
+    # Equivalent views share a cache entry however they were specified.
+    if azimuth is not None:
+        orbit = canonical_orbit(azimuth, elevation or 0.0)
+    else:
+        orbit = canonical_orbit(*orbit_from_angles(validate_angles(angle_list)))
     request = RenderRequest(
-        scad_file=Path(scad_file),
+        scad_file=scad_path,
         projection=projection or render_cfg.projection,
         fov=fov if fov is not None else render_cfg.fov,
         angles=angle_list,
         output_dir=Path(output_dir) if output_dir else render_cfg.output_dir,
+        defines=defines or {},
+        quality=quality or render_cfg.quality,
+        azimuth=orbit[0] if azimuth is not None else None,
+        elevation=orbit[1],
     )
-    
+    parameters = {
+        "projection": request.projection, "fov": request.fov, "angles": angle_list, "width": width,
+        "height": height, "output_dir": request.output_dir, "defines": request.defines,
+        "quality": request.quality, "backend": requested_backend, "orbit": orbit, "framing": framing,
+    }
+
+    cache_key = None
+    if digest:
+        cache_key = RESULT_CACHE.key(
+            "render", digest, request.projection, request.fov, orbit, width, height, request.output_dir,
+            request.defines, request.quality, requested_backend, framing, bounds,
+        )
+        cached = RESULT_CACHE.get(cache_key)
+        if cached:
+            LOGGER.info("Render cache hit for source %s", digest)
+            JOB_HISTORY.record_cache_hit("render", scad_path, digest, parameters, cached.path)
+            return await _with_encoded_variant(
+                config,
+                {"image_path": str(cached.path), "command": cached.command, "cached": True},
+                thumbnail_size,
+                image_format,
+            )
+
     executable_path = config.openscad.path
     resolved_path = find_openscad_executable(executable_path)
     
     if not resolved_path:
         LOGGER.error("OpenSCAD executable not found for render.")
         raise RuntimeError("OpenSCAD executable not found.")
+    capabilities = await probe_capabilities(resolved_path)
+    # Draft renders are previews and never reach a geometry backend.
+    selected = None if request.quality == "draft" else select_backend(requested_backend, capabilities)
+    if framing == "bbox":
+        request = replace(request, bounds=bounds or await _model_bounds(
+            config, scad_path, digest, request.defines, requested_backend, resolved_path, capabilities, priority,
+        ))
     try:
-        async with RENDER_LOCK:
-            result = await render_scad(
-                request=request,
-                openscad_path=resolved_path,
-                img_width=img_width if img_width is not None else render_cfg.img_width,
-                img_height=img_height if img_height is not None else render_cfg.img_height,
-            )
+        with JOB_HISTORY.track("render", scad_path, digest, parameters) as job:
+            async with WORKER_POOL.slot(priority, JOB_HISTORY.estimate("render", job.source_hash)) as placement:
+                job.running(placement)
+                with job_workspace(config.workspace.scratch_dir) as scratch:
+                    result = await render_scad(
+                        request=request,
+                        openscad_path=resolved_path,
+                        img_width=width,
+                        img_height=height,
+                        timeout=config.execution.timeout,
+                        scratch_dir=scratch,
+                        backend=selected,
+                        capabilities=capabilities,
+                    )
+            job.finish(result.image_path, result.command)
+    except OverloadedError:
+        raise
     except Exception:
-        LOGGER.exception("Render failed for %s", scad_file)
+        LOGGER.exception("Render failed for %s", scad_path)
         raise
-    return {
-        "image_path": str(result.image_path),
-        "command": result.command,
-    }
+    if cache_key:
+        RESULT_CACHE.put(cache_key, CacheEntry(path=result.image_path, command=result.command))
+    return await _with_encoded_variant(
+        config,
+        {"image_path": str(result.image_path), "command": result.command, "cached": False},
+        thumbnail_size,
+        image_format,
+    )
+
+
+async def model_bounds(
+    config: AppConfig,
+    scad_file: str | None,
+    scad_source: str | None = None,
+    defines: dict[str, DefineValue] | None = None,
+    backend: str | None = None,
+    priority: str = "normal",
+) -> BoundingBox:
+    """Return the bounding box bbox framing would use for a model.
+
+    Callers rendering several models or frames in one shot can union these
+    boxes and pass the result as bounds, so every image shares one camera.
+
+    Args:
+        config: Application configuration.
+        scad_file: Path to the .scad file. Mutually exclusive with scad_source.
+        scad_source: Inline SCAD source.
+        defines: Optional SCAD variable overrides passed with -D.
+        backend: Geometry backend, "auto", "manifold", or "cgal". Defaults to the configured backend.
+        priority: Queue priority for the probe.
+
+    Returns:
+        Bounding box of the model.
+
+    Raises:
+        RuntimeError: When OpenSCAD cannot be found or fails.
+    """
+    scad_path, digest = await resolve_scad_input(config, scad_file, scad_source)
+    requested_backend = backend or config.openscad.backend
+    validate_backend(requested_backend)
+    validate_priority(priority)
+    resolved_path = find_openscad_executable(config.openscad.path)
+    if not resolved_path:
+        LOGGER.error("OpenSCAD executable not found for bounds probe.")
+        raise RuntimeError("OpenSCAD executable not found.")
+    capabilities = await probe_capabilities(resolved_path)
+    return await _model_bounds(
+        config, scad_path, digest, defines or {}, requested_backend, resolved_path, capabilities, priority,
+    )
+
+
+async def _model_bounds(
+    config: AppConfig,
+    scad_path: Path,
+    digest: str | None,
+    defines: dict[str, DefineValue],
+    requested_backend: str,
+    openscad_path: Path,
+    capabilities: OpenScadCapabilities,
+    priority: str,
+) -> BoundingBox:
+    """Return a model's bounding box, evaluating the geometry at most once.
+
+    Boxes are reused from memory, then measured from a cached STL export of
+    the same source, and only then probed with OpenSCAD on a worker slot.
+    Concurrent callers for one model wait on the same probe.
+
+    Args:
+        config: Application configuration.
+        scad_path: Model file.
+        digest: Digest of an inline source, or None for files.
+        defines: SCAD variable overrides.
+        requested_backend: Backend the render was requested with.
+        openscad_path: OpenSCAD executable.
+        capabilities: Features of the OpenSCAD build.
+        priority: Queue priority for the probe.
+
+    Returns:
+        Bounding box of the model.
+    """
+    # Files are re-hashed on every call, with their libraries, so edits to either are picked up.
+    source_hash = digest or await asyncio.to_thread(model_digest, config, scad_path)
+    key = RESULT_CACHE.key("bounds", source_hash, defines, requested_backend)
+    if key in _BOUNDS:
+        _BOUNDS.move_to_end(key)
+        return _BOUNDS[key]
+    pending = _PENDING_BOUNDS.get(key)
+    if pending is None:
+        pending = asyncio.ensure_future(_measure_bounds(
+            config, scad_path, digest, defines, requested_backend, openscad_path, capabilities, priority,
+        ))
+        _PENDING_BOUNDS[key] = pending
+        pending.add_done_callback(lambda _: _PENDING_BOUNDS.pop(key, None))
+    # Shielded so one cancelled caller does not abort the probe for the others.
+    bounds = await asyncio.shield(pending)
+    _BOUNDS[key] = bounds
+    while len(_BOUNDS) > BOUNDS_CACHE_SIZE:
+        _BOUNDS.popitem(last=False)
+    return bounds
+
+
+async def _measure_bounds(
+    config: AppConfig,
+    scad_path: Path,
+    digest: str | None,
+    defines: dict[str, DefineValue],
+    requested_backend: str,
+    openscad_path: Path,
+    capabilities: OpenScadCapabilities,
+    priority: str,
+) -> BoundingBox:
+    """Measure a bounding box from a cached mesh or an OpenSCAD probe."""
+    mesh = RESULT_CACHE.get(RESULT_CACHE.key("mesh", digest, defines, requested_backend)) if digest else None
+    if mesh:
+        try:
+            stats = mesh_stats(await asyncio.to_thread(load_stl, mesh.path))
+            return BoundingBox(minimum=stats.bbox_min, maximum=stats.bbox_max)
+        except RuntimeError:
+            LOGGER.debug("NumPy unavailable; probing bounds of %s with OpenSCAD", scad_path)
+    LOGGER.info("Probing bounding box of %s", scad_path)
+    async with WORKER_POOL.slot(priority):
+        with job_workspace(config.workspace.scratch_dir) as scratch:
+            return await probe_bounds(
+                scad_file=scad_path,
+                defines=defines,
+                openscad_path=openscad_path,
+                scratch_dir=scratch,
+                timeout=config.execution.timeout,
+                backend=select_backend(requested_backend, capabilities),
+                capabilities=capabilities,
+            )
+
+
+async def _with_encoded_variant(
+    config: AppConfig,
+    response: dict[str, str | bool | list[str]],
+    thumbnail_size: int | None,
+    image_format: str | None,
+) -> dict[str, str | bool | list[str]]:
+    """Attach an encoded copy of the rendered image to a tool response.
+
+    A full-size PNG copy is re-encoded at the configured compression level.
+    Without Pillow it falls back to the render itself, which is already a
+    PNG of that size.
+
+    Args:
+        config: Application configuration.
+        response: Render tool response containing image_path.
+        thumbnail_size: Optional longest edge of the encoded copy.
+        image_format: Optional encoding of the copy.
+
+    Returns:
+        The response, with encoded_path added when a copy was requested.
+    """
+    if thumbnail_size is None and image_format is None:
+        return response
+    render_cfg = config.render
+    image_path = Path(str(response["image_path"]))
+    target_format = image_format or render_cfg.image_format
+    try:
+        encoded = await asyncio.to_thread(
+            encode_variant,
+            image_path,
+            thumbnail_size,
+            target_format,
+            render_cfg.png_compress_level,
+            render_cfg.webp_quality,
+        )
+    except RuntimeError:
+        if thumbnail_size is not None or target_format != "png":
+            raise
+        LOGGER.debug("Pillow is not installed; returning %s without re-encoding", image_path)
+        encoded = image_path
+    response["encoded_path"] = str(encoded)
+    return response
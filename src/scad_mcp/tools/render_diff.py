@@ -0,0 +1,104 @@
+"""MCP tool for visual regression between two renders."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+
+from scad_mcp.config.models import AppConfig
+from scad_mcp.imaging import diff_images
+from scad_mcp.models import DefineValue
+from scad_mcp.openscad.camera import union_bounds
+from scad_mcp.tools.model_renderer import model_bounds, render_model
+
+LOGGER = logging.getLogger("scad_mcp.tools.render_diff")
+
+
+async def diff_renders(
+    config: AppConfig,
+    scad_file_a: str | None = None,
+    scad_source_a: str | None = None,
+    scad_file_b: str | None = None,
+    scad_source_b: str | None = None,
+    defines_a: dict[str, DefineValue] | None = None,
+    defines_b: dict[str, DefineValue] | None = None,
+    projection: str | None = None,
+    fov: float | None = None,
+    angles: list[str] | None = None,
+    output_dir: str | None = None,
+    img_width: int | None = None,
+    img_height: int | None = None,
+    threshold: int = 0,
+) -> dict[str, str | int | float | bool | list[int] | None]:
+    """Render two variants with an identical camera and compare the images.
+
+    Variant B defaults to the source of variant A, so two parameter sets of
+    one model can be compared by passing only defines_b. Both renders frame
+    the union of the two bounding boxes, so a part that was only moved or
+    scaled shows up as a change instead of being refitted to the image.
+
+    Args:
+        config: Application configuration.
+        scad_file_a: Path to the baseline .scad file.
+        scad_source_a: Inline baseline SCAD source.
+        scad_file_b: Path to the .scad file to compare.
+        scad_source_b: Inline SCAD source to compare.
+        defines_a: SCAD variable overrides for the baseline.
+        defines_b: SCAD variable overrides for the comparison.
+        projection: Perspective or orthographic projection.
+        fov: Field of view in degrees.
+        angles: One, two, or three view angles.
+        output_dir: Optional output directory for renders and the heatmap.
+        img_width: Output image width in pixels.
+        img_height: Output image height in pixels.
+        threshold: Per-channel difference (0-255) ignored as noise.
+
+    Returns:
+        Dict with both image paths, heatmap path, changed pixel counts,
+        similarity score, and changed-region bounding box.
+    """
+    if not 0 <= threshold <= 255:
+        raise ValueError("Threshold must be between 0 and 255.")
+    if scad_file_b is None and scad_source_b is None:
+        scad_file_b, scad_source_b = scad_file_a, scad_source_a
+
+    # Separate directories keep same-named revisions from overwriting each other.
+    base_dir = Path(output_dir) if output_dir else config.render.output_dir
+    bounds_a, bounds_b = await asyncio.gather(
+        model_bounds(config, scad_file_a, scad_source_a, defines_a),
+        model_bounds(config, scad_file_b, scad_source_b, defines_b),
+    )
+    view = dict(
+        config=config,
+        projection=projection,
+        fov=fov,
+        angles=angles or ["front"],
+        img_width=img_width,
+        img_height=img_height,
+        framing="bbox",
+        bounds=union_bounds([bounds_a, bounds_b]),
+    )
+    render_a = await render_model(
+        **view, scad_file=scad_file_a, scad_source=scad_source_a, defines=defines_a, output_dir=str(base_dir / "a"),
+    )
+    render_b = await render_model(
+        **view, scad_file=scad_file_b, scad_source=scad_source_b, defines=defines_b, output_dir=str(base_dir / "b"),
+    )
+
+    image_a = Path(str(render_a["image_path"]))
+    image_b = Path(str(render_b["image_path"]))
+    heatmap_path = base_dir / f"{image_a.stem}__vs__{image_b.stem}.diff.png"
+    LOGGER.info("Comparing %s with %s", image_a, image_b)
+    diff = await asyncio.to_thread(diff_images, image_a, image_b, heatmap_path, threshold)
+
+    return {
+        "image_a": str(image_a),
+        "image_b": str(image_b),
+        "heatmap_path": str(diff.heatmap_path),
+        "changed": diff.changed_pixels > 0,
+        "changed_pixels": diff.changed_pixels,
+        "changed_fraction": diff.changed_pixels / diff.total_pixels,
+        "similarity": diff.similarity,
+        "bbox": list(diff.bbox) if diff.bbox else None,
+    }
@@ -3,10 +3,20 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Iterable
+import re
+from typing import Iterable, Mapping
 
 
 VALID_ANGLES = {"top", "bottom", "front", "back", "left", "right"}
+VALID_QUALITIES = {"draft", "standard", "high"}
+VALID_BACKENDS = {"auto", "manifold", "cgal"}
+VALID_FRAMINGS = {"auto", "bbox"}
+VALID_PRIORITIES = {"high", "normal", "low"}
+VALID_ANIMATION_MODES = {"turntable", "animate"}
+VALID_ANIMATION_FORMATS = {"gif", "webp", "sprite"}
+MAX_ANIMATION_FRAMES = 360
+IONICE_CLASSES = {"none", "idle", "best-effort"}
+DEFINE_NAME = re.compile(r"^\$?[A-Za-z_][A-Za-z0-9_]*$")
 OPPOSITES = {
     ("top", "bottom"),
     ("front", "back"),
@@ -30,6 +40,19 @@ def validate_scad_file(scad_file: Path) -> None:
         raise FileNotFoundError(f"SCAD file not found: {scad_file}")
 
 
+def validate_scad_source(scad_source: str) -> None:
+    """Validate inline SCAD source text.
+
+    Args:
+        scad_source: SCAD source code.
+
+    Raises:
+        ValueError: When the source is empty.
+    """
+    if not scad_source.strip():
+        raise ValueError("SCAD source must not be empty.")
+
+
 def validate_projection(projection: str) -> None:
     """Validate projection name.
 
@@ -43,6 +66,141 @@ def validate_projection(projection: str) -> None:
         raise ValueError("Projection must be perspective or orthographic.")
 
 
+def validate_quality(quality: str) -> None:
+    """Validate render quality tier.
+
+    Args:
+        quality: Quality tier name to validate.
+
+    Raises:
+        ValueError: When the tier is not supported.
+    """
+    if quality not in VALID_QUALITIES:
+        raise ValueError("Quality must be draft, standard, or high.")
+
+
+def validate_framing(framing: str) -> None:
+    """Validate camera framing mode.
+
+    Args:
+        framing: Framing mode to validate.
+
+    Raises:
+        ValueError: When the mode is not supported.
+    """
+    if framing not in VALID_FRAMINGS:
+        raise ValueError("Framing must be auto or bbox.")
+
+
+def validate_backend(backend: str) -> None:
+    """Validate geometry backend name.
+
+    Args:
+        backend: Backend name to validate.
+
+    Raises:
+        ValueError: When the backend is not supported.
+    """
+    if backend not in VALID_BACKENDS:
+        raise ValueError("Backend must be auto, manifold, or cgal.")
+
+
+def validate_priority(priority: str) -> None:
+    """Validate request priority.
+
+    Args:
+        priority: Priority name to validate.
+
+    Raises:
+        ValueError: When the priority is not supported.
+    """
+    if priority not in VALID_PRIORITIES:
+        raise ValueError("Priority must be high, normal, or low.")
+
+
+def parse_cpu_list(cpu_list: str) -> tuple[int, ...]:
+    """Parse a Linux CPU list such as "0-3,8,10-11".
+
+    Args:
+        cpu_list: Comma-separated CPU numbers and inclusive ranges.
+
+    Returns:
+        Sorted CPU numbers without duplicates.
+
+    Raises:
+        ValueError: When the list is empty or malformed.
+    """
+    cpus: set[int] = set()
+    for item in cpu_list.split(","):
+        first, dash, last = item.strip().partition("-")
+        if not first.isdigit() or (dash and not last.isdigit()):
+            raise ValueError(f"Invalid CPU list: {cpu_list!r}.")
+        start, end = int(first), int(last) if dash else int(first)
+        if end < start:
+            raise ValueError(f"Invalid CPU list: {cpu_list!r}.")
+        cpus.update(range(start, end + 1))
+    return tuple(sorted(cpus))
+
+
+def validate_cpu_affinity(cpu_affinity: str) -> None:
+    """Validate a worker CPU affinity setting.
+
+    Args:
+        cpu_affinity: "off", "auto", or a CPU list such as "0-7,16-23".
+
+    Raises:
+        ValueError: When the setting is not one of those.
+    """
+    if cpu_affinity not in {"off", "auto"}:
+        parse_cpu_list(cpu_affinity)
+
+
+def validate_ionice(ionice: str) -> None:
+    """Validate an I/O scheduling class.
+
+    Args:
+        ionice: "none", "idle", or "best-effort:N" with N from 0 (highest) to 7.
+
+    Raises:
+        ValueError: When the class or level is not supported.
+    """
+    name, colon, level = ionice.partition(":")
+    if name not in IONICE_CLASSES or (colon and (name != "best-effort" or level not in set("01234567"))):
+        raise ValueError("I/O priority must be none, idle, or best-effort:0 to best-effort:7.")
+
+
+def validate_elevation(elevation: float) -> None:
+    """Validate camera elevation above the XY plane.
+
+    Args:
+        elevation: Elevation in degrees.
+
+    Raises:
+        ValueError: When the elevation is outside -90 to 90 degrees.
+    """
+    if not -90.0 <= elevation <= 90.0:
+        raise ValueError("Elevation must be between -90 and 90 degrees.")
+
+
+def validate_animation(mode: str, frames: int, output_format: str) -> None:
+    """Validate animation options.
+
+    Args:
+        mode: "turntable" or "animate".
+        frames: Number of frames to render.
+        output_format: "gif", "webp", or "sprite".
+
+    Raises:
+        ValueError: When an option is not supported.
+    """
+    if mode not in VALID_ANIMATION_MODES:
+        raise ValueError("Animation mode must be turntable or animate.")
+    if not 2 <= frames <= MAX_ANIMATION_FRAMES:
+        raise ValueError(f"Frames must be between 2 and {MAX_ANIMATION_FRAMES}.")
+    if output_format not in VALID_ANIMATION_FORMATS:
+        raise ValueError("Animation format must be gif, webp, or sprite.")
+
+
 def validate_fov(fov: float) -> None:
     """Validate field of view range.
 
@@ -55,6 +213,84 @@ def validate_fov(fov: float) -> None:
     if not 1.0 <= fov <= 120.0:
         raise ValueError("FOV must be between 1 and 120 degrees.")
 
+def validate_defines(defines: Mapping[str, object]) -> None:
+    """Validate parameter overrides passed to OpenSCAD with -D.
+
+    Args:
+        defines: Mapping of SCAD variable names to values.
+
+    Raises:
+        ValueError: When a name is not a SCAD identifier or a value is not a scalar.
+    """
+    for name, value in defines.items():
+        if not DEFINE_NAME.match(name):
+            raise ValueError(f"Invalid SCAD variable name: {name!r}.")
+        if not isinstance(value, (bool, int, float, str)):
+            raise ValueError(f"Value for {name} must be a number, boolean, or string.")
+
+
+def validate_export_options(
+    output_format: str,
+    stl_encoding: str | None,
+    compression: int | None,
+    decimal_precision: int | None,
+) -> None:
+    """Validate export format options.
+
+    Args:
+        output_format: Target file extension without the dot.
+        stl_encoding: Optional "binary" or "ascii" STL encoding.
+        compression: Optional 3MF deflate level.
+        decimal_precision: Optional decimal places for text coordinates.
+
+    Raises:
+        ValueError: When an option is invalid or does not apply to the format.
+    """
+    if stl_encoding is not None:
+        if stl_encoding not in {"binary", "ascii"}:
+            raise ValueError("STL encoding must be binary or ascii.")
+        if output_format != "stl":
+            raise ValueError("STL encoding only applies to STL output.")
+    if compression is not None:
+        if not 0 <= compression <= 9:
+            raise ValueError("Compression level must be between 0 and 9.")
+        if output_format != "3mf":
+            raise ValueError("Compression only applies to 3MF output.")
+    if decimal_precision is not None:
+        if not 1 <= decimal_precision <= 15:
+            raise ValueError("Decimal precision must be between 1 and 15.")
+        if output_format not in {"stl", "off", "3mf"}:
+            raise ValueError("Decimal precision only applies to STL, OFF, and 3MF output.")
+        if output_format == "stl" and stl_encoding != "ascii":
+            raise ValueError("Decimal precision only applies to ASCII STL output.")
+
+
+def validate_image_format(image_format: str) -> None:
+    """Validate encoded image format.
+
+    Args:
+        image_format: Image format name to validate.
+
+    Raises:
+        ValueError: When the format is not supported.
+    """
+    if image_format not in {"png", "webp"}:
+        raise ValueError("Image format must be png or webp.")
+
+
+def validate_thumbnail_size(thumbnail_size: int) -> None:
+    """Validate thumbnail edge length.
+
+    Args:
+        thumbnail_size: Longest thumbnail edge in pixels.
+
+    Raises:
+        ValueError: When the size is out of range.
+    """
+    if not 16 <= thumbnail_size <= 4096:
+        raise ValueError("Thumbnail size must be between 16 and 4096 pixels.")
+
+
 def validate_angles(angles: Iterable[str]) -> list[str]:
     """Validate view angles and return normalized list.
 
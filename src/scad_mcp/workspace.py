@@ -0,0 +1,93 @@
+"""Per-job scratch directories on fast storage for intermediate files."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+import logging
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import Iterator
+import uuid
+
+LOGGER = logging.getLogger("scad_mcp.workspace")
+
+TMPFS_CANDIDATES = (Path("/dev/shm"),)
+
+
+def default_scratch_root() -> Path:
+    """Return a RAM-backed directory when available, else the system temp directory.
+
+    Returns:
+        Directory under which job workspaces are created.
+    """
+    for candidate in TMPFS_CANDIDATES:
+        if candidate.is_dir() and os.access(candidate, os.W_OK | os.X_OK):
+            return candidate
+    return Path(tempfile.gettempdir())
+
+
+@contextmanager
+def job_workspace(scratch_root: Path | None = None) -> Iterator[Path]:
+    """Create an isolated scratch directory that is removed when the job ends.
+
+    Args:
+        scratch_root: Configured scratch location, or None for the default.
+
+    Yields:
+        Path of the job's private directory.
+    """
+    base = (scratch_root or default_scratch_root()) / "scad-mcp"
+    base.mkdir(parents=True, exist_ok=True)
+    workspace = Path(tempfile.mkdtemp(prefix="job-", dir=base))
+    try:
+        yield workspace
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+
+@contextmanager
+def partial_file(target: Path) -> Iterator[Path]:
+    """Yield a temporary path that atomically replaces target once written.
+
+    The temporary file sits next to target, so the final rename stays on one
+    filesystem, and its name is unique per call, so concurrent writers in
+    the same process never share it. It is removed if writing fails.
+
+    Args:
+        target: Final file path.
+
+    Yields:
+        Path to write the new contents to.
+    """
+    partial = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        yield partial
+        os.replace(partial, target)
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+def promote(source: Path, target: Path) -> Path:
+    """Atomically move a finished artifact to its final location.
+
+    Readers of target never observe a partially written file: across
+    filesystems the artifact is first copied next to target, then renamed.
+
+    Args:
+        source: Finished file in a scratch workspace.
+        target: Final artifact path.
+
+    Returns:
+        The target path.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.replace(source, target)
+    except OSError:
+        with partial_file(target) as partial:
+            shutil.copyfile(source, partial)
+        source.unlink(missing_ok=True)
+    LOGGER.debug("Promoted %s to %s", source, target)
+    return target
@@ -0,0 +1,148 @@
+"""Tests for turntable and $t animations."""
+
+import asyncio
+from pathlib import Path
+import struct
+from types import SimpleNamespace
+
+import pytest
+
+from scad_mcp.config.models import AppConfig, CacheConfig, OpenScadConfig, RenderConfig
+from scad_mcp.execution import WORKER_POOL
+from scad_mcp.models import OpenScadCapabilities
+from scad_mcp.openscad import camera, converter, renderer
+from scad_mcp.tools import model_converter, model_renderer
+from scad_mcp.tools.animation import render_animation
+
+
+def animation_config(tmp_path: Path) -> AppConfig:
+    return AppConfig(
+        openscad=OpenScadConfig(path=Path("openscad")),
+        render=RenderConfig(output_dir=tmp_path / "renders", img_width=16, img_height=12),
+        cache=CacheConfig(directory=tmp_path / "cache"),
+    )
+
+
+@pytest.fixture
+def fake_openscad(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    image_module = pytest.importorskip("PIL.Image")
+    calls = SimpleNamespace(convert=[], probe=[], render=[], running=0, peak=0)
+
+    async def fake_convert(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        calls.convert.append(command)
+        # The triangle grows with the source, so edited models export different meshes.
+        size = float(len(Path(command[3]).read_bytes()))
+        triangle = struct.pack("<3f", 0, 0, 0) + struct.pack("<9f", 0, 0, 0, size, 0, 0, 0, size, 0) + b"\0\0"
+        Path(command[2]).write_bytes(b"\0" * 80 + struct.pack("<I", 1) + triangle)
+        return 0, "ok", ""
+
+    async def fake_probe_run(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        calls.probe.append(command)
+        # The triangle grows with $t, so later steps need a wider frame.
+        step = next((float(arg.split("=")[1]) for arg in command if arg.startswith("$t=")), 0.0)
+        size = 1.0 + step
+        triangle = struct.pack("<3f", 0, 0, 0) + struct.pack("<9f", 0, 0, 0, size, 0, 0, 0, size, 0) + b"\0\0"
+        Path(command[2]).write_bytes(b"\0" * 80 + struct.pack("<I", 1) + triangle)
+        return 0, "ok", ""
+
+    async def fake_render(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        calls.running += 1
+        calls.peak = max(calls.peak, calls.running)
+        await asyncio.sleep(0.01)
+        calls.running -= 1
+        calls.render.append(command)
+        shade = len(calls.render) * 20 % 256
+        image_module.new("RGB", (16, 12), (shade, 0, 0)).save(command[2], format="PNG")
+        return 0, "ok", ""
+
+    async def fake_probe(path: Path) -> OpenScadCapabilities:
+        return OpenScadCapabilities()
+
+    monkeypatch.setattr(converter, "run_openscad", fake_convert)
+    monkeypatch.setattr(camera, "run_openscad", fake_probe_run)
+    monkeypatch.setattr(renderer, "run_openscad", fake_render)
+    for module in (model_converter, model_renderer):
+        monkeypatch.setattr(module, "find_openscad_executable", lambda _: Path("openscad"))
+        monkeypatch.setattr(module, "probe_capabilities", fake_probe)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_turntable_exports_once_and_renders_in_parallel(
+    tmp_path: Path, fake_openscad: SimpleNamespace,
+) -> None:
+    """Orbit the camera around one cached mesh and build a looping GIF."""
+    image_module = pytest.importorskip("PIL.Image")
+    config = animation_config(tmp_path)
+    source = "cylinder(h=4, r=1); // turntable"
+    WORKER_POOL.resize(4)
+    try:
+        result = await render_animation(config=config, scad_source=source, frames=8)
+    finally:
+        WORKER_POOL.resize(1)
+
+    assert fake_openscad.peak == 4
+    assert len(fake_openscad.convert) == 1
+    cameras = {next(arg for arg in command if arg.startswith("--camera=")) for command in fake_openscad.render}
+    assert len(cameras) == 8
+    assert all("--render" not in command for command in fake_openscad.render)
+    assert "_az90_el30_draft_16x12_b" in result["frames"][2]
+    with image_module.open(result["animation_path"]) as animation:
+        assert animation.format == "GIF" and animation.n_frames == 8
+
+    again = await render_animation(config=config, scad_source=source, frames=8, output_format="sprite")
+    assert again["cached_frames"] == 8
+    assert len(fake_openscad.convert) == 1
+    with image_module.open(again["animation_path"]) as sheet:
+        assert sheet.size == (3 * 16, 3 * 12)
+
+
+@pytest.mark.asyncio
+async def test_turntable_rerenders_edited_file(tmp_path: Path, fake_openscad: SimpleNamespace) -> None:
+    """Render fresh frames when a source file changes between turntables."""
+    config = animation_config(tmp_path)
+    scad_file = tmp_path / "model.scad"
+    scad_file.write_text("cube(1);\n", encoding="utf-8")
+    first = await render_animation(config=config, scad_file=str(scad_file), frames=2)
+    assert first["cached_frames"] == 0
+    assert (await render_animation(config=config, scad_file=str(scad_file), frames=2))["cached_frames"] == 2
+
+    scad_file.write_text("cube(10); // edited\n", encoding="utf-8")
+    renders = len(fake_openscad.render)
+    edited = await render_animation(config=config, scad_file=str(scad_file), frames=2)
+    assert edited["cached_frames"] == 0
+    assert len(fake_openscad.render) == renders + 2
+    # The intermediate mesh lives in the cache, not beside the user's source.
+    assert Path(edited["mesh_path"]).is_relative_to(config.cache.directory)
+    assert sorted(path.name for path in tmp_path.iterdir() if path.is_file()) == ["model.scad"]
+
+
+@pytest.mark.asyncio
+async def test_animate_steps_time_variable(tmp_path: Path, fake_openscad: SimpleNamespace) -> None:
+    """Render one frame per $t step, framed on the union of every step's bounds."""
+    pytest.importorskip("numpy")
+    config = animation_config(tmp_path)
+    result = await render_animation(
+        config=config, scad_source="rotate([0, 0, 360 * $t]) cube(2); // animate", mode="animate", frames=4,
+        output_format="webp",
+    )
+    assert not fake_openscad.convert
+    steps = sorted(command[command.index("-D") + 1] for command in fake_openscad.render)
+    assert steps == ["$t=0.0", "$t=0.25", "$t=0.5", "$t=0.75"]
+    assert len(fake_openscad.probe) == 4
+    assert all("--viewall" not in command for command in fake_openscad.render)
+    cameras = {next(arg for arg in command if arg.startswith("--camera=")) for command in fake_openscad.render}
+    assert len(cameras) == 1
+    assert result["animation_path"].endswith(".webp") and len(result["frames"]) == 4
+
+
+@pytest.mark.asyncio
+async def test_animation_rejects_invalid_options(tmp_path: Path) -> None:
+    """Validate mode, frame count and format before rendering."""
+    config = animation_config(tmp_path)
+    with pytest.raises(ValueError):
+        await render_animation(config=config, scad_source="cube(1);", mode="spin")
+    with pytest.raises(ValueError):
+        await render_animation(config=config, scad_source="cube(1);", frames=1)
+    with pytest.raises(ValueError):
+        await render_animation(config=config, scad_source="cube(1);", output_format="mp4")
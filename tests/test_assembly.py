@@ -0,0 +1,112 @@
+"""Tests for assembly splitting and parallel part export."""
+
+import asyncio
+from pathlib import Path
+import struct
+import zipfile
+
+import pytest
+
+from scad_mcp.assembly import split_assembly
+from scad_mcp.config.models import AppConfig, CacheConfig, OpenScadConfig
+from scad_mcp.execution import WORKER_POOL
+from scad_mcp.models import OpenScadCapabilities
+from scad_mcp.openscad import converter
+from scad_mcp.tools import model_converter
+from scad_mcp.tools.assembly_export import export_assembly
+
+ASSEMBLY = """include <parts.scad>
+$fn = 32;
+module wheel(r = 5) { cylinder(r = r, h = 2); }
+/* translate([9, 9, 9]) cube(1); */
+translate([0, 0, 1]) wheel();
+union() { cube(5); sphere(3); }
+if (true) cube(1); else sphere(1);
+*cube(9);
+echo("a;b");
+"""
+
+
+def test_split_assembly_keeps_shared_statements() -> None:
+    """Keep definitions in every part and one top-level object each."""
+    parts = split_assembly(ASSEMBLY)
+
+    assert [part.name for part in parts] == ["00_wheel", "01_union", "02_cube"]
+    for part in parts:
+        assert "module wheel(r = 5)" in part.source
+        assert "$fn = 32;" in part.source
+        assert 'echo("a;b");' in part.source
+        assert part.source.count("\n") == ASSEMBLY.count("\n")
+    assert "translate([0, 0, 1]) wheel();" in parts[0].source
+    assert "union()" not in parts[0].source
+    assert "if (true) cube(1); else sphere(1);" in parts[2].source
+
+
+def test_split_assembly_tagged_parts_and_paths(tmp_path: Path) -> None:
+    """Export only tagged objects and resolve relative paths."""
+    (tmp_path / "parts.scad").write_text("", encoding="utf-8")
+    source = 'include <parts.scad>\nuse <MCAD/gears.scad>\n// @part base\ncube(4);\nsphere(2);\n// @part lid\nimport("lid.stl");\n'
+    (tmp_path / "lid.stl").write_text("solid lid\nendsolid lid\n", encoding="utf-8")
+
+    parts = split_assembly(source, tmp_path)
+
+    assert [part.name for part in parts] == ["base", "lid"]
+    assert f"include <{(tmp_path / 'parts.scad').resolve().as_posix()}>" in parts[0].source
+    assert "use <MCAD/gears.scad>" in parts[0].source
+    assert "sphere(2);" not in parts[0].source
+    assert f'import("{(tmp_path / "lid.stl").resolve().as_posix()}")' in parts[1].source
+
+
+def test_split_assembly_without_objects() -> None:
+    """Reject sources that only define modules."""
+    with pytest.raises(ValueError):
+        split_assembly("module a() { cube(1); }\nx = 2;\n")
+
+
+@pytest.mark.asyncio
+async def test_export_assembly_runs_parts_concurrently(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Export parts on parallel workers and merge them into one 3MF."""
+    pytest.importorskip("numpy")
+    scad_file = tmp_path / "robot.scad"
+    scad_file.write_text("cube(1);\ntranslate([2, 0, 0]) cube(1);\nsphere(1);\n", encoding="utf-8")
+    config = AppConfig(
+        openscad=OpenScadConfig(path=Path("openscad")),
+        cache=CacheConfig(directory=tmp_path / "cache"),
+    )
+    running = 0
+    peak = 0
+
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        triangle = struct.pack("<3f", 0, 0, 0) + struct.pack("<9f", 0, 0, 0, 1, 0, 0, 0, 1, 0) + b"\0\0"
+        Path(command[2]).write_bytes(b"\0" * 80 + struct.pack("<I", 1) + triangle)
+        return 0, "ok", ""
+
+    async def fake_probe(path: Path) -> OpenScadCapabilities:
+        return OpenScadCapabilities()
+
+    monkeypatch.setattr(converter, "run_openscad", fake_run_openscad)
+    monkeypatch.setattr(model_converter, "find_openscad_executable", lambda _: Path("openscad"))
+    monkeypatch.setattr(model_converter, "probe_capabilities", fake_probe)
+    WORKER_POOL.resize(3)
+    try:
+        result = await export_assembly(config=config, scad_file=str(scad_file), merge_3mf=True)
+    finally:
+        WORKER_POOL.resize(1)
+
+    assert peak == 3
+    names = [part["name"] for part in result["parts"]]
+    assert names == ["00_cube", "01_cube", "02_sphere"]
+    parts_dir = tmp_path / "robot_parts"
+    assert [part["output_path"] for part in result["parts"]] == [
+        str(parts_dir / f"robot.{name}.stl") for name in names
+    ]
+    assert result["merged_path"] == str(parts_dir / "robot.3mf")
+    with zipfile.ZipFile(result["merged_path"]) as package:
+        model = package.read("3D/3dmodel.model").decode("utf-8")
+    assert model.count("<object ") == 3
+    assert 'name="02_sphere"' in model
@@ -0,0 +1,134 @@
+"""Tests for layered configuration loading."""
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+import signal
+
+import pytest
+
+from scad_mcp.config.loader import load_config
+from scad_mcp.cache import RESULT_CACHE
+from scad_mcp.config.models import AppConfig, CacheConfig, ExecutionConfig, HistoryConfig
+from scad_mcp.execution import OUTPUT_LIMITS, PLACEMENT, WORKER_POOL
+
+
+def test_load_config_defaults(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Return model defaults when no file, environment, or CLI settings exist."""
+    monkeypatch.chdir(tmp_path)
+    config = load_config(environ={})
+    assert config.execution.max_workers == 1
+    assert config.execution.timeout is None
+    assert config.render.quality == "standard"
+
+
+def test_load_config_layers(tmp_path: Path) -> None:
+    """Apply TOML, then environment, then CLI settings."""
+    config_file = tmp_path / "scad-mcp.toml"
+    config_file.write_text(
+        "[execution]\nmax_workers = 2\ntimeout = 30\n\n"
+        "[render]\nimg_width = 800\nquality = \"draft\"\n\n"
+        "[cache]\ndirectory = \"/tmp/scad-cache\"\n",
+        encoding="utf-8",
+    )
+    environ = {
+        "SCAD_MCP_CONFIG": str(config_file),
+        "SCAD_MCP_EXECUTION_MAX_WORKERS": "4",
+        "SCAD_MCP_CACHE_MAX_ENTRIES": "64",
+    }
+    config = load_config(
+        openscad_path="/opt/openscad",
+        overrides=["execution.timeout=none", "render.img_height=600"],
+        environ=environ,
+    )
+    assert config.execution.max_workers == 4
+    assert config.execution.timeout is None
+    assert config.render.img_width == 800
+    assert config.render.img_height == 600
+    assert config.render.quality == "draft"
+    assert config.cache.directory == Path("/tmp/scad-cache")
+    assert config.cache.max_entries == 64
+    assert config.openscad.path == Path("/opt/openscad")
+
+
+def test_load_config_ignores_unknown_environment(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Warn about, but do not reject, SCAD_MCP_* names that are not settings."""
+    monkeypatch.chdir(tmp_path)
+    environ = {"SCAD_MCP_EXECUTION_WORKERS": "2", "SCAD_MCP_RENDERING_FOV": "30", "SCAD_MCP_RENDER_FOV": "30"}
+    with caplog.at_level(logging.WARNING, logger="scad_mcp.config.loader"):
+        config = load_config(environ=environ)
+    assert config.render.fov == 30
+    assert "SCAD_MCP_EXECUTION_WORKERS" in caplog.text
+    assert "SCAD_MCP_RENDERING_FOV" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "environ",
+    [
+        {"SCAD_MCP_EXECUTION_MAX_WORKERS": "0"},
+        {"SCAD_MCP_EXECUTION_MAX_WORKERS": "many"},
+        {"SCAD_MCP_RENDER_QUALITY": "ultra"},
+        {"SCAD_MCP_RENDER_PNG_COMPRESS_LEVEL": "12"},
+        {"SCAD_MCP_LOGGING_LEVEL": "chatty"},
+        {"SCAD_MCP_OPENSCAD_BACKEND": "opencsg"},
+    ],
+)
+def test_load_config_rejects_invalid(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, environ: dict[str, str]) -> None:
+    """Reject unknown settings and out-of-range values."""
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError):
+        load_config(environ=environ)
+
+
+def test_load_config_missing_explicit_file(tmp_path: Path) -> None:
+    """Fail when an explicitly requested config file does not exist."""
+    with pytest.raises(FileNotFoundError):
+        load_config(config_file=str(tmp_path / "missing.toml"), environ={})
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="SIGHUP not available.")
+async def test_sighup_reloads_config(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Swap configuration and resize the worker pool on SIGHUP, from the event loop."""
+    from scad_mcp import server
+
+    # A reload reconfigures process-wide state; record it all so teardown restores it.
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(server, "app_config", server.app_config)
+    monkeypatch.delenv("OPENSCADPATH", raising=False)
+    monkeypatch.setattr(RESULT_CACHE, "max_entries", RESULT_CACHE.max_entries)
+    for name in ("max_queue_depth", "max_wait"):
+        monkeypatch.setattr(WORKER_POOL, name, getattr(WORKER_POOL, name))
+    for runtime in (OUTPUT_LIMITS, PLACEMENT):
+        for name, value in vars(runtime).items():
+            monkeypatch.setattr(runtime, name, value)
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", list(root.handlers))
+    previous_level = root.level
+    previous = signal.getsignal(signal.SIGHUP)
+    reloaded = AppConfig(
+        execution=ExecutionConfig(max_workers=3),
+        cache=CacheConfig(directory=tmp_path / "cache"),
+        history=HistoryConfig(enabled=False),
+    )
+    loop = asyncio.get_running_loop()
+    try:
+        server.install_reload_handler(lambda: reloaded)
+        os.kill(os.getpid(), signal.SIGHUP)
+        # The signal only schedules the reload; it is applied once the loop runs again.
+        assert WORKER_POOL.max_workers == 1
+        for _ in range(100):
+            if WORKER_POOL.max_workers == 3:
+                break
+            await asyncio.sleep(0.01)
+        assert server.app_config.execution.max_workers == 3
+        assert WORKER_POOL.max_workers == 3
+        assert not any(tmp_path.iterdir())
+    finally:
+        loop.remove_signal_handler(signal.SIGHUP)
+        signal.signal(signal.SIGHUP, previous)
+        WORKER_POOL.resize(1)
+        root.setLevel(previous_level)
@@ -1,9 +1,14 @@
 """Tests for model converter."""
 
+import asyncio
 from pathlib import Path
+import zipfile
+
 import pytest
-from scad_mcp.models import ConvertRequest
+from scad_mcp.models import ConvertRequest, ExportOptions, OpenScadCapabilities
 from scad_mcp.openscad import converter
+from scad_mcp.openscad.cli import backend_args, select_backend
+from scad_mcp.validation import validate_export_options
 
 @pytest.mark.asyncio
 async def test_convert_scad_happy_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -17,7 +22,7 @@ async def test_convert_scad_happy_path(tmp_path: Path, monkeypatch: pytest.Monke
         output_file=output_file,
     )
 
-    async def fake_run_openscad(command: list[str]) -> tuple[int, str, str]:
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
         # command should be [openscad, -o, output_file, scad_file]
         # Simulate creating the output file
         Path(command[2]).write_text("stl data", encoding="utf-8")
@@ -46,7 +51,7 @@ async def test_convert_scad_failure(tmp_path: Path, monkeypatch: pytest.MonkeyPa
         output_file=output_file,
     )
 
-    async def fake_run_openscad(command: list[str]) -> tuple[int, str, str]:
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
         return 1, "", "Syntax error"
 
     monkeypatch.setattr(converter, "run_openscad", fake_run_openscad)
@@ -56,3 +61,167 @@ async def test_convert_scad_failure(tmp_path: Path, monkeypatch: pytest.MonkeyPa
             request=request,
             openscad_path=Path("openscad"),
         )
+
+
+def test_export_format_args_prefers_binary_stl() -> None:
+    """Pick binary STL when the build supports --export-format."""
+    supported = OpenScadCapabilities(export_format=True)
+    assert converter.export_format_args("stl", None, supported) == ["--export-format", "binstl"]
+    assert converter.export_format_args("stl", "ascii", supported) == ["--export-format", "asciistl"]
+    assert converter.export_format_args("stl", None, OpenScadCapabilities()) == []
+    assert converter.export_format_args("3mf", None, supported) == []
+
+
+@pytest.mark.asyncio
+async def test_convert_scad_3mf_compression(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Rewrite OpenSCAD's 3MF package at the requested compression level."""
+    scad_file = tmp_path / "model.scad"
+    scad_file.write_text("cube([1,1,1]);", encoding="utf-8")
+
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        with zipfile.ZipFile(command[2], "w", compression=zipfile.ZIP_DEFLATED) as package:
+            package.writestr("3D/3dmodel.model", "<model/>" * 100)
+        return 0, "ok", ""
+
+    monkeypatch.setattr(converter, "run_openscad", fake_run_openscad)
+    request = ConvertRequest(
+        scad_file=scad_file,
+        output_file=tmp_path / "model.3mf",
+        options=ExportOptions(compression=0),
+    )
+    result = await converter.convert_scad(request=request, openscad_path=Path("openscad"))
+    with zipfile.ZipFile(result.output_path) as package:
+        assert [info.compress_type for info in package.infolist()] == [zipfile.ZIP_STORED]
+        assert package.read("3D/3dmodel.model") == b"<model/>" * 100
+
+
+def test_convert_scad_rejects_mismatched_options(tmp_path: Path) -> None:
+    """Reject options that do not apply to the output format."""
+    with pytest.raises(ValueError):
+        validate_export_options("3mf", "ascii", None, None)
+    with pytest.raises(ValueError):
+        validate_export_options("stl", None, 6, None)
+    with pytest.raises(ValueError):
+        validate_export_options("stl", "binary", None, 4)
+    validate_export_options("stl", "ascii", None, 4)
+
+
+def test_select_backend_prefers_manifold() -> None:
+    """Resolve auto to Manifold only when the build has it."""
+    manifold = OpenScadCapabilities(backend_option=True, manifold=True)
+    assert select_backend("auto", manifold) == "manifold"
+    assert select_backend("auto", OpenScadCapabilities()) == "cgal"
+    assert backend_args("manifold", manifold) == ["--backend=manifold"]
+    assert backend_args("manifold", OpenScadCapabilities(manifold=True)) == ["--enable=manifold"]
+    assert backend_args("cgal", OpenScadCapabilities()) == []
+    with pytest.raises(ValueError):
+        select_backend("manifold", OpenScadCapabilities())
+
+
+@pytest.mark.asyncio
+async def test_convert_scad_falls_back_to_cgal(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Retry a failed Manifold export with CGAL."""
+    scad_file = tmp_path / "model.scad"
+    scad_file.write_text("cube([1,1,1]);", encoding="utf-8")
+    commands: list[list[str]] = []
+
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        commands.append(command)
+        if "--backend=manifold" in command:
+            return 1, "", "ERROR: manifold failed"
+        Path(command[2]).write_text("solid", encoding="utf-8")
+        return 0, "ok", ""
+
+    monkeypatch.setattr(converter, "run_openscad", fake_run_openscad)
+    request = ConvertRequest(scad_file=scad_file, output_file=tmp_path / "model.stl")
+    capabilities = OpenScadCapabilities(backend_option=True, manifold=True)
+    result = await converter.convert_scad(
+        request=request, openscad_path=Path("openscad"), capabilities=capabilities, backend="manifold",
+    )
+    assert [command[-1] for command in commands] == ["--backend=manifold", "--backend=cgal"]
+    assert result.command == commands[-1]
+
+    with pytest.raises(RuntimeError):
+        await converter.convert_scad(
+            request=request, openscad_path=Path("openscad"), capabilities=capabilities,
+            backend="manifold", fallback=False,
+        )
+
+
+@pytest.mark.asyncio
+async def test_benchmark_backends_reports_winner(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Time both backends per model and recommend the faster one."""
+    from scad_mcp.config.models import AppConfig, OpenScadConfig
+    from scad_mcp.tools import backend_benchmark
+
+    fast = tmp_path / "fast.scad"
+    broken = tmp_path / "broken.scad"
+    for path in (fast, broken):
+        path.write_text("cube(1);", encoding="utf-8")
+
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        manifold = "--backend=manifold" in command
+        if manifold and command[3] == str(broken):
+            return 1, "", "ERROR: manifold failed"
+        await asyncio.sleep(0.001 if manifold else 0.02)
+        Path(command[2]).write_text("solid", encoding="utf-8")
+        return 0, "ok", ""
+
+    async def fake_probe(path: Path) -> OpenScadCapabilities:
+        return OpenScadCapabilities(backend_option=True, manifold=True)
+
+    monkeypatch.setattr(converter, "run_openscad", fake_run_openscad)
+    monkeypatch.setattr(backend_benchmark, "find_openscad_executable", lambda _: Path("openscad"))
+    monkeypatch.setattr(backend_benchmark, "probe_capabilities", fake_probe)
+
+    config = AppConfig(openscad=OpenScadConfig(path=Path("openscad")))
+    report = await backend_benchmark.benchmark_backends(config, [str(fast), str(broken)])
+
+    first, second = report["models"]
+    assert first["winner"] == "manifold" and first["speedup"] > 1
+    assert second["winner"] == "cgal" and "manifold failed" in second["manifold_error"]
+    assert report["wins"] == {"cgal": 1, "manifold": 1}
+    assert report["recommended_backend"] == "manifold"
+
+    with pytest.raises(FileNotFoundError):
+        await backend_benchmark.benchmark_backends(config, [str(fast), str(tmp_path / "missing.scad")])
+    with pytest.raises(ValueError):
+        await backend_benchmark.benchmark_backends(config, [str(fast)], defines={"bad name": 1})
+
+
+@pytest.mark.asyncio
+async def test_convert_model_formats_without_numpy(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Export each mesh format with OpenSCAD when NumPy is not installed."""
+    import sys
+
+    from scad_mcp.config.models import AppConfig, CacheConfig, OpenScadConfig
+    from scad_mcp.tools import model_converter
+
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    scad_file = tmp_path / "part.scad"
+    scad_file.write_text("cube(2);", encoding="utf-8")
+    commands: list[list[str]] = []
+
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        commands.append(command)
+        output = Path(command[2])
+        if output.suffix == ".3mf":
+            with zipfile.ZipFile(output, "w") as package:
+                package.writestr("3D/3dmodel.model", "<model/>")
+        else:
+            output.write_bytes(b"solid")
+        return 0, "ok", ""
+
+    async def fake_probe(path: Path) -> OpenScadCapabilities:
+        return OpenScadCapabilities()
+
+    monkeypatch.setattr(converter, "run_openscad", fake_run_openscad)
+    monkeypatch.setattr(model_converter, "find_openscad_executable", lambda _: Path("openscad"))
+    monkeypatch.setattr(model_converter, "probe_capabilities", fake_probe)
+
+    config = AppConfig(openscad=OpenScadConfig(path=Path("openscad")), cache=CacheConfig(directory=tmp_path / "cache"))
+    result = await model_converter.convert_model_formats(
+        config=config, scad_file=str(scad_file), output_formats=["stl", "3mf"],
+    )
+    assert result["outputs"] == {fmt: str(tmp_path / f"part.{fmt}") for fmt in ("stl", "3mf")}
+    assert [Path(command[2]).suffix for command in commands] == [".stl", ".3mf"]
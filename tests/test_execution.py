@@ -0,0 +1,265 @@
+"""Tests for OpenSCAD process scheduling."""
+
+import asyncio
+import os
+from pathlib import Path
+import sys
+
+import pytest
+
+from scad_mcp.execution import (
+    LAUNCHER,
+    OUTPUT_LIMITS,
+    PLACEMENT,
+    OverloadedError,
+    Placement,
+    PlacementPolicy,
+    WorkerPool,
+    placed_command,
+)
+from scad_mcp.openscad.cli import run_openscad
+from scad_mcp.openscad.output import OutputCapture
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_limits_and_resizes() -> None:
+    """Queue callers beyond capacity and admit them when the pool grows."""
+    pool = WorkerPool(max_workers=1)
+    release = asyncio.Event()
+    running = 0
+    peak = 0
+
+    async def job() -> None:
+        nonlocal running, peak
+        async with pool.slot():
+            running += 1
+            peak = max(peak, running)
+            await release.wait()
+            running -= 1
+
+    tasks = [asyncio.create_task(job()) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert pool.active == 1 and pool.waiting == 2
+
+    pool.resize(3)
+    await asyncio.sleep(0.01)
+    assert pool.active == 3 and pool.waiting == 0
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert peak == 3
+    assert pool.active == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_cancelled_waiter() -> None:
+    """Drop cancelled waiters without leaking slots."""
+    pool = WorkerPool(max_workers=1)
+    async with pool.slot():
+        waiter = asyncio.create_task(pool.slot().__aenter__())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert pool.waiting == 0
+    assert pool.active == 0
+
+
+@pytest.mark.asyncio
+async def test_run_openscad_timeout() -> None:
+    """Kill processes that exceed the timeout."""
+    with pytest.raises(TimeoutError):
+        await run_openscad([sys.executable, "-c", "import time; time.sleep(10)"], timeout=0.2)
+
+
+def test_output_capture_keeps_head_and_tail(tmp_path: Path) -> None:
+    """Decode split characters and spill the full stream when lines are dropped."""
+    data = "".join(f"ECHO: \"ü{index}\"\n" for index in range(10)).encode("utf-8")
+    capture = OutputCapture(head_lines=2, tail_lines=3, spill_dir=tmp_path, name="stderr")
+    for offset in range(0, len(data), 5):
+        capture.feed(data[offset:offset + 5])
+    capture.close()
+    assert capture.dropped == 5
+    lines = capture.text().splitlines()
+    assert lines[:2] == ['ECHO: "ü0"', 'ECHO: "ü1"']
+    assert lines[2] == f"... 5 lines omitted; full output in {capture.spill_path} ..."
+    assert lines[3:] == ['ECHO: "ü7"', 'ECHO: "ü8"', 'ECHO: "ü9"']
+    assert capture.spill_path.read_bytes() == data
+
+    short = OutputCapture(head_lines=2, tail_lines=3, spill_dir=tmp_path)
+    short.feed(b"one\ntwo")
+    short.close()
+    assert short.text() == "one\ntwo" and short.spill_path is None
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+@pytest.mark.asyncio
+async def test_run_openscad_failed_exec_leaves_no_logs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Create spill files only once the process has started."""
+    monkeypatch.setattr(OUTPUT_LIMITS, "log_dir", tmp_path / "logs")
+    with pytest.raises(FileNotFoundError):
+        await run_openscad([str(tmp_path / "missing-openscad"), "--version"])
+    assert not (tmp_path / "logs").exists()
+
+
+@pytest.mark.asyncio
+async def test_run_openscad_bounds_output(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep memory bounded for processes that print huge amounts of output."""
+    monkeypatch.setattr(OUTPUT_LIMITS, "head_lines", 10)
+    monkeypatch.setattr(OUTPUT_LIMITS, "tail_lines", 10)
+    script = "import sys\nfor i in range(200000): sys.stderr.write(f'ECHO: {i}\\n')\nprint('done')"
+    code, stdout, stderr = await run_openscad([sys.executable, "-c", script], timeout=60)
+    assert code == 0 and stdout == "done"
+    lines = stderr.splitlines()
+    assert len(lines) == 21
+    assert lines[0] == "ECHO: 0" and lines[-1] == "ECHO: 199999"
+    assert lines[10] == "... 199980 lines omitted ..."
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_rejects_when_queue_full() -> None:
+    """Reject over-limit requests quickly with a retry-after hint."""
+    pool = WorkerPool(max_workers=1, max_queue_depth=2)
+    release = asyncio.Event()
+
+    async def job(priority: str = "normal") -> None:
+        async with pool.slot(priority, estimate=10.0):
+            await release.wait()
+
+    running = asyncio.create_task(job())
+    queued = [asyncio.create_task(job()) for _ in range(2)]
+    await asyncio.sleep(0)
+    assert pool.active == 1 and pool.waiting == 2
+
+    with pytest.raises(OverloadedError) as rejected:
+        await job()
+    assert rejected.value.retry_after == pytest.approx(30.0, abs=0.5)
+    assert "Retry after" in str(rejected.value)
+
+    release.set()
+    await asyncio.gather(running, *queued)
+    assert pool.active == 0 and pool.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_sheds_low_priority_first() -> None:
+    """Refuse low priority work early and displace it for higher priorities."""
+    pool = WorkerPool(max_workers=1, max_queue_depth=2)
+    release = asyncio.Event()
+    order: list[str] = []
+
+    async def job(name: str, priority: str) -> None:
+        async with pool.slot(priority):
+            order.append(name)
+            await release.wait()
+
+    running = asyncio.create_task(job("running", "normal"))
+    low = asyncio.create_task(job("low", "low"))
+    await asyncio.sleep(0)
+    with pytest.raises(OverloadedError):
+        await job("second-low", "low")
+
+    normal = asyncio.create_task(job("normal", "normal"))
+    await asyncio.sleep(0)
+    high = asyncio.create_task(job("high", "high"))
+    await asyncio.sleep(0)
+    with pytest.raises(OverloadedError):
+        await low
+    assert pool.waiting == 2
+
+    release.set()
+    await asyncio.gather(running, normal, high)
+    assert order == ["running", "high", "normal"]
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_keeps_waiters_for_rejected_requests() -> None:
+    """Displace a lower priority waiter only when the newcomer is admitted."""
+    pool = WorkerPool(max_workers=1, max_queue_depth=1)
+    release = asyncio.Event()
+
+    async def job(priority: str, estimate: float | None = None) -> None:
+        async with pool.slot(priority, estimate):
+            await release.wait()
+
+    running = asyncio.create_task(job("normal", 30.0))
+    low = asyncio.create_task(job("low"))
+    await asyncio.sleep(0)
+    pool.max_wait = 5.0
+    with pytest.raises(OverloadedError, match="estimated wait"):
+        await job("high")
+    assert not low.done() and pool.waiting == 1
+
+    release.set()
+    await asyncio.gather(running, low)
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_rejects_long_estimated_wait() -> None:
+    """Reject requests whose estimated wait exceeds the limit."""
+    pool = WorkerPool(max_workers=2, max_wait=10.0)
+    release = asyncio.Event()
+
+    async def job(estimate: float) -> None:
+        async with pool.slot(estimate=estimate):
+            await release.wait()
+
+    tasks = [asyncio.create_task(job(8.0)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert pool.estimated_wait() == pytest.approx(12.0, abs=0.5)
+    with pytest.raises(OverloadedError):
+        await job(1.0)
+    assert pool.estimated_wait("high") == pytest.approx(8.0, abs=0.5)
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+def test_placement_spreads_slots_across_numa_nodes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Deal slots round-robin over NUMA nodes and pick the priority class."""
+    for node, cpus in enumerate(["0-3", "4-7"]):
+        (tmp_path / f"node{node}").mkdir()
+        (tmp_path / f"node{node}" / "cpulist").write_text(f"{cpus}\n", encoding="utf-8")
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(8)), raising=False)
+    policy = PlacementPolicy()
+    policy.configure("1-7", cpus_per_worker=2, nice={"batch": 5}, ionice={"batch": "idle"}, node_root=tmp_path)
+    assert policy.nodes == [(0, (1, 2, 3)), (1, (4, 5, 6, 7))]
+    placements = [policy.place(slot, "normal") for slot in range(4)]
+    assert [(item.node, item.cpus) for item in placements] == [(0, (1, 2)), (1, (4, 5)), (0, (1, 3)), (1, (6, 7))]
+    batch = policy.place(0, "low")
+    assert (batch.priority_class, batch.nice, batch.ionice) == ("batch", 5, "idle")
+    assert placements[0].nice == 0 and placements[0].ionice == "none"
+
+    policy.configure("off")
+    assert policy.place(3, "normal").cpus is None
+
+
+def test_placed_command_wraps_only_real_placements() -> None:
+    """Start placed commands through the launcher and leave others untouched."""
+    command = ["openscad", "-o", "out.stl", "model.scad"]
+    assert placed_command(command, Placement(slot=0, priority_class="interactive")) == command
+    placed = placed_command(command, Placement(slot=1, priority_class="batch", cpus=(2, 3), nice=5, ionice="idle"))
+    assert placed[:4] == [sys.executable, "-I", "-S", str(LAUNCHER)]
+    assert placed[4:] == ["2,3", "5", "idle", "--", *command]
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="needs sched_setaffinity")
+async def test_slot_applies_placement_to_openscad(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Pin and renice processes started within a slot, including all their threads."""
+    cpu = min(os.sched_getaffinity(0))
+    monkeypatch.setattr(PLACEMENT, "nodes", [(None, (cpu,))])
+    monkeypatch.setattr(PLACEMENT, "nice", {"interactive": 0, "batch": 3})
+    # Read straight away and from a second thread: placement must precede the program, not race it.
+    script = (
+        "import os, threading; seen = []; "
+        "thread = threading.Thread(target=lambda: seen.append(sorted(os.sched_getaffinity(0)))); "
+        "thread.start(); thread.join(); print(seen[0], os.getpriority(os.PRIO_PROCESS, 0))"
+    )
+    pool = WorkerPool(max_workers=2)
+    async with pool.slot("low") as placement:
+        _, stdout, _ = await run_openscad([sys.executable, "-c", script], timeout=30)
+    assert placement.cpus == (cpu,) and placement.slot == 0
+    assert stdout == f"[{cpu}] {os.getpriority(os.PRIO_PROCESS, 0) + 3}"
+    _, stdout, _ = await run_openscad([sys.executable, "-c", script], timeout=30)
+    assert stdout.endswith(f" {os.getpriority(os.PRIO_PROCESS, 0)}")
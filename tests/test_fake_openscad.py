@@ -0,0 +1,89 @@
+"""Tests for the fake OpenSCAD executable and the load-test driver."""
+
+from pathlib import Path
+import random
+import struct
+
+import pytest
+
+from scad_mcp.models import ConvertRequest, OpenScadCapabilities, RenderRequest
+from scad_mcp.openscad.converter import convert_scad
+from scad_mcp.openscad.installer import probe_capabilities
+from scad_mcp.openscad.renderer import render_scad
+from scad_mcp.testing.fake_openscad import sample_latency, write_launcher
+from scad_mcp.testing.load_test import run_load_test
+
+
+@pytest.fixture
+def launcher(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    for name in ("LATENCY", "FAIL", "FAIL_RATE", "ECHO", "PROGRESS"):
+        monkeypatch.delenv(f"FAKE_OPENSCAD_{name}", raising=False)
+    return write_launcher(tmp_path / "bin")
+
+
+@pytest.mark.asyncio
+async def test_fake_openscad_renders_and_exports(tmp_path: Path, launcher: Path) -> None:
+    """Honor the real command line and write valid files."""
+    scad_file = tmp_path / "model.scad"
+    scad_file.write_text("cube(1);\n", encoding="utf-8")
+    capabilities = await probe_capabilities(launcher)
+    assert capabilities == OpenScadCapabilities(export_format=True, backend_option=True, manifold=True, summary=True)
+
+    render = await render_scad(
+        RenderRequest(scad_file=scad_file, projection="perspective", fov=45.0, angles=["front"],
+                      output_dir=tmp_path / "renders"),
+        openscad_path=launcher,
+        img_width=40,
+        img_height=30,
+        timeout=30,
+    )
+    data = render.image_path.read_bytes()
+    assert data.startswith(b"\x89PNG\r\n\x1a\n")
+    assert struct.unpack(">II", data[16:24]) == (40, 30)
+
+    export = await convert_scad(
+        ConvertRequest(scad_file=scad_file, output_file=tmp_path / "model.stl", defines={"size": 4}),
+        openscad_path=launcher,
+        timeout=30,
+        capabilities=capabilities,
+    )
+    data = export.output_path.read_bytes()
+    assert struct.unpack("<I", data[80:84]) == (12,)
+    assert len(data) == 84 + 12 * 50
+
+
+@pytest.mark.asyncio
+async def test_fake_openscad_failure_modes(tmp_path: Path, launcher: Path) -> None:
+    """Simulate parser errors, crashes and hangs from a directive comment."""
+    output_dir = tmp_path / "renders"
+    for directive, error in [("fail=error", RuntimeError), ("fail=crash", RuntimeError), ("latency=30", TimeoutError)]:
+        scad_file = tmp_path / f"{directive.replace('=', '_')}.scad"
+        scad_file.write_text(f"cube(1); // fake-openscad: {directive}\n", encoding="utf-8")
+        request = RenderRequest(scad_file=scad_file, projection="perspective", fov=45.0, angles=["front"],
+                                output_dir=output_dir)
+        with pytest.raises(error):
+            await render_scad(request, openscad_path=launcher, img_width=8, img_height=8, timeout=2)
+
+
+def test_sample_latency_distributions() -> None:
+    """Parse fixed and random latency specifications."""
+    rng = random.Random(1)
+    assert sample_latency("0.25", rng) == 0.25
+    assert 0.1 <= sample_latency("uniform:0.1,0.2", rng) <= 0.2
+    assert sample_latency("lognormal:0.2,0.5", rng) > 0
+    assert sample_latency("exponential:0.2", rng) >= 0
+    with pytest.raises(ValueError):
+        sample_latency("pareto:1", rng)
+
+
+@pytest.mark.asyncio
+async def test_load_test_against_stdio_server(tmp_path: Path) -> None:
+    """Drive concurrent tool calls through a real server and count outcomes."""
+    pytest.importorskip("mcp.client.stdio")
+    summary = await run_load_test(calls=12, workers=2, latency="0", work_dir=tmp_path, call_timeout=120)
+    assert summary["ok"] == 12 and summary["error"] == 0
+    assert summary["latency_seconds"]["p50"] is not None
+
+    shed = await run_load_test(calls=12, workers=1, latency="0.2", max_queue_depth=2, work_dir=tmp_path / "shed")
+    assert shed["rejected"] > 0
+    assert shed["ok"] + shed["rejected"] == 12
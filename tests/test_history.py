@@ -0,0 +1,86 @@
+"""Tests for the job history ledger."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scad_mcp.config.models import AppConfig, CacheConfig, OpenScadConfig
+from scad_mcp.execution import OverloadedError
+from scad_mcp.history import JobHistory
+from scad_mcp.models import OpenScadCapabilities
+from scad_mcp.openscad import converter
+from scad_mcp.tools import model_converter
+from scad_mcp.tools.model_converter import convert_model
+
+
+@pytest.mark.asyncio
+async def test_history_records_jobs_and_reports(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Record misses, hits and failures and query them back."""
+    history = JobHistory()
+    database = tmp_path / "history.sqlite3"
+    history.configure(database)
+    config = AppConfig(
+        openscad=OpenScadConfig(path=Path("openscad")),
+        cache=CacheConfig(directory=tmp_path / "cache"),
+    )
+
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        if "broken" in Path(command[3]).read_text(encoding="utf-8"):
+            return 1, "", "ERROR: Parser error"
+        Path(command[2]).write_text("solid model\nendsolid model\n", encoding="utf-8")
+        return 0, "ok", ""
+
+    async def fake_probe(path: Path) -> OpenScadCapabilities:
+        return OpenScadCapabilities()
+
+    monkeypatch.setattr(converter, "run_openscad", fake_run_openscad)
+    monkeypatch.setattr(model_converter, "find_openscad_executable", lambda _: Path("openscad"))
+    monkeypatch.setattr(model_converter, "probe_capabilities", fake_probe)
+    monkeypatch.setattr(model_converter, "JOB_HISTORY", history)
+
+    for _ in range(2):
+        await convert_model(config=config, scad_file=None, output_format="amf", scad_source="cube(1);")
+    with pytest.raises(RuntimeError):
+        await convert_model(config=config, scad_file=None, output_format="amf", scad_source="broken(")
+
+    recent = await history.query("recent")
+    assert [(row["status"], row["cached"]) for row in recent] == [("error", 0), ("ok", 1), ("ok", 0)]
+    assert recent[2]["output_bytes"] > 0 and recent[2]["source_hash"]
+    assert json.loads(recent[2]["placement"])["priority_class"] == "interactive"
+    assert recent[1]["placement"] is None
+
+    failures = await history.query("failures")
+    assert failures[0]["failures"] == 1 and "Parser error" in failures[0]["last_error"]
+    cache = await history.query("cache", kind="convert")
+    assert cache[0]["requests"] == 3 and cache[0]["hits"] == 1
+    with pytest.raises(OverloadedError):
+        with history.track("convert", Path("model.scad"), "rejected-hash", {}):
+            raise OverloadedError("queue is full.", 1.0)
+    cache = await history.query("cache", kind="convert")
+    assert cache[0]["requests"] == 3 and cache[0]["hit_rate"] == pytest.approx(1 / 3)
+    capacity = await history.query("capacity", kind="convert")
+    assert capacity[0]["jobs"] == 2 and capacity[0]["rejected"] == 1
+    assert capacity[0]["max_queue_seconds"] is not None
+    slowest = await history.query("slowest")
+    assert len(slowest) == 1 and slowest[0]["runs"] == 1
+
+    source_hash = recent[2]["source_hash"]
+    assert history.estimate("convert", source_hash) == pytest.approx(slowest[0]["mean_seconds"])
+
+    reopened = JobHistory()
+    reopened.configure(database)
+    reopened.flush()
+    assert reopened.estimate("convert", source_hash) == pytest.approx(slowest[0]["mean_seconds"])
+    assert reopened.estimate("convert", "unknown") is not None
+    assert reopened.estimate("render", source_hash) is None
+
+
+@pytest.mark.asyncio
+async def test_history_disabled_and_invalid_query() -> None:
+    """Reject reports while the ledger is disabled or unknown."""
+    history = JobHistory()
+    with pytest.raises(ValueError):
+        await history.query("everything")
+    with pytest.raises(RuntimeError):
+        await history.query("recent")
@@ -0,0 +1,68 @@
+"""Tests for encoded image variants."""
+
+from pathlib import Path
+
+import pytest
+
+from scad_mcp.imaging import diff_images, encode_variant
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _write_render(path: Path) -> None:
+    Image.new("RGB", (1920, 1080), (200, 180, 40)).save(path)
+
+
+def test_encode_variant_thumbnail(tmp_path: Path) -> None:
+    """Downscale a render so its longest edge matches the thumbnail size."""
+    source = tmp_path / "demo.png"
+    _write_render(source)
+    thumb = encode_variant(source, max_size=512, image_format="webp")
+    assert thumb.parent == tmp_path
+    assert thumb.suffix == ".webp"
+    with Image.open(thumb) as image:
+        assert image.size == (512, 288)
+        assert image.format == "WEBP"
+
+
+def test_encode_variant_reuses_cached_copy(tmp_path: Path) -> None:
+    """Serve a variant from disk until the source render changes."""
+    source = tmp_path / "demo.png"
+    _write_render(source)
+    first = encode_variant(source, max_size=256)
+    stamp = first.stat().st_mtime_ns
+    assert encode_variant(source, max_size=256).stat().st_mtime_ns == stamp
+    assert encode_variant(source, max_size=128) != first
+
+
+def test_diff_images_reports_changed_region(tmp_path: Path) -> None:
+    """Locate the changed region and score similarity."""
+    pytest.importorskip("numpy")
+    first = tmp_path / "a.png"
+    second = tmp_path / "b.png"
+    Image.new("RGB", (100, 50), (255, 255, 255)).save(first)
+    changed = Image.new("RGB", (100, 50), (255, 255, 255))
+    changed.paste((0, 0, 0), (10, 20, 30, 25))
+    changed.save(second)
+
+    diff = diff_images(first, second, tmp_path / "diff.png")
+    assert diff.changed_pixels == 20 * 5
+    assert diff.bbox == (10, 20, 30, 25)
+    assert 0.9 < diff.similarity < 1.0
+    assert diff.heatmap_path.exists()
+
+    same = diff_images(first, first, tmp_path / "same.png")
+    assert same.changed_pixels == 0
+    assert same.bbox is None
+    assert same.similarity == 1.0
+
+
+def test_diff_images_rejects_size_mismatch(tmp_path: Path) -> None:
+    """Refuse to compare renders of different sizes."""
+    pytest.importorskip("numpy")
+    first = tmp_path / "a.png"
+    second = tmp_path / "b.png"
+    Image.new("RGB", (10, 10)).save(first)
+    Image.new("RGB", (20, 10)).save(second)
+    with pytest.raises(ValueError):
+        diff_images(first, second, tmp_path / "diff.png")
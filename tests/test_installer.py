@@ -44,3 +44,56 @@ def test_load_config_uses_args(tmp_path: Path) -> None:
     config = load_config(openscad_path=custom_path)
     assert config.openscad.path is not None
     assert str(config.openscad.path) == custom_path 
+
+
+@pytest.mark.asyncio
+async def test_probe_capabilities_cached(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Parse --help once per executable."""
+    calls: list[list[str]] = []
+
+    async def fake_run(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        calls.append(command)
+        return 0, "", (
+            "  --export-format arg  overrides format of exported scad file\n"
+            "  --backend arg  3D rendering backend to use: 'CGAL' (old/slow) [default] or 'Manifold' (new/fast)\n"
+            "  --summary-file arg  output summary information in JSON format to the given file"
+        )
+
+    monkeypatch.setattr(installer, "run_openscad", fake_run)
+    openscad_path = tmp_path / "openscad"
+    first = await installer.probe_capabilities(openscad_path)
+    second = await installer.probe_capabilities(openscad_path)
+    assert first.export_format is True
+    assert first.backend_option is True and first.manifold is True
+    assert first.summary is True
+    assert second is first
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_probe_capabilities_reads_backend_choices(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Detect Manifold from the backend or feature choices only."""
+    help_texts = {
+        "release": (
+            "  --backend arg  3D rendering backend to use: 'CGAL'\n"
+            "                 (old/slow) [default] or 'Manifold' (new/fast)\n"
+            "  --check-parameters arg  =true/false, configure the parameter check\n"
+        ),
+        "snapshot": (
+            "  --enable arg  enable experimental features (can be used multiple times):\n"
+            "                lazy-union | manifold | roof\n"
+        ),
+        "legacy": (
+            "  --enable arg  enable experimental features: lazy-union | roof\n"
+            "  --hardwarnings  stop on the first warning, e.g. a non-manifold mesh\n"
+        ),
+    }
+
+    async def fake_run(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        return 0, help_texts[Path(command[0]).name], ""
+
+    monkeypatch.setattr(installer, "run_openscad", fake_run)
+    detected = {name: await installer.probe_capabilities(tmp_path / name) for name in help_texts}
+    assert detected["release"].backend_option and detected["release"].manifold
+    assert not detected["snapshot"].backend_option and detected["snapshot"].manifold
+    assert not detected["legacy"].manifold
@@ -0,0 +1,115 @@
+"""Tests for the library index, dependency digests and flattening."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from scad_mcp.config.loader import load_config
+from scad_mcp.config.models import AppConfig, CacheConfig, LibrariesConfig
+from scad_mcp.libraries import LIBRARY_INDEX, library_roots, prewarm
+from scad_mcp.sources import resolve_scad_input
+from scad_mcp.tools.library_index import check_libraries
+
+
+@pytest.fixture
+def library(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.delenv("OPENSCADPATH", raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    root = tmp_path / "libraries"
+    (root / "Shapes").mkdir(parents=True)
+    (root / "Shapes" / "std.scad").write_text(
+        "include <shapes.scad>\nuse <util.scad>\n", encoding="utf-8",
+    )
+    (root / "Shapes" / "shapes.scad").write_text(
+        "// module fake(x) in a comment\n"
+        "module box(size) {\n  module inner() { cube(size); }\n  inner();\n}\n"
+        "function half(x) = x / 2;\n"
+        "module logo() { import(\"logo.stl\"); }\n",
+        encoding="utf-8",
+    )
+    (root / "Shapes" / "util.scad").write_text("function twice(x) = 2 * x;\ncube(99);\n", encoding="utf-8")
+    (root / "Shapes" / "logo.stl").write_text("solid logo\nendsolid logo\n", encoding="utf-8")
+    return root
+
+
+def config_for(tmp_path: Path, library: Path, flatten: bool = False) -> AppConfig:
+    return AppConfig(
+        cache=CacheConfig(directory=tmp_path / "cache"),
+        libraries=LibrariesConfig(paths=(library,), flatten=flatten),
+    )
+
+
+@pytest.mark.asyncio
+async def test_check_libraries_reports_definitions_and_references(tmp_path: Path, library: Path) -> None:
+    """Index top-level definitions and find unresolved and undefined references."""
+    config = config_for(tmp_path, library)
+    source = (
+        "include <Shapes/std.scad>\nuse <Missing/lib.scad>\n"
+        "box(twice(half(4)));\ncuboid(1);\nlogo();\n"
+    )
+    result = await check_libraries(config, scad_source=source, names=["box", "inner", "fake", "twice"])
+    shapes = str((library / "Shapes" / "shapes.scad").resolve())
+    assert result["roots"] == [str(library.resolve())]
+    assert result["definitions"]["box"] == [{"kind": "module", "path": shapes}]
+    assert result["unknown"] == ["inner", "fake"]
+    assert [Path(item["path"]).name for item in result["dependencies"]] == ["shapes.scad", "std.scad", "util.scad"]
+    assert result["unresolved"][0].startswith("use <Missing/lib.scad> in ")
+    assert result["undefined"] == [{"name": "cuboid", "defined_in": []}]
+
+
+@pytest.mark.asyncio
+async def test_inline_digest_covers_library_contents(tmp_path: Path, library: Path) -> None:
+    """Change the cache digest of a source when a library it uses changes."""
+    config = config_for(tmp_path, library)
+    source = "include <Shapes/std.scad>\nbox(1);\n"
+    path, digest = await resolve_scad_input(config, None, source)
+    assert digest != path.stem
+    assert await resolve_scad_input(config, None, source) == (path, digest)
+    plain, plain_digest = await resolve_scad_input(config, None, "cube(1);\n")
+    assert plain_digest == plain.stem
+
+    util = library / "Shapes" / "util.scad"
+    util.write_text("function twice(x) = 3 * x;\n", encoding="utf-8")
+    os.utime(util, ns=(util.stat().st_atime_ns, util.stat().st_mtime_ns + 1_000_000))
+    changed_path, changed_digest = await resolve_scad_input(config, None, source)
+    assert changed_path == path and changed_digest != digest
+    assert prewarm(config, path) == 3
+
+
+@pytest.mark.asyncio
+async def test_flatten_inlines_includes(tmp_path: Path, library: Path) -> None:
+    """Point inline sources at single-file copies of the libraries they use."""
+    config = config_for(tmp_path, library, flatten=True)
+    path, digest = await resolve_scad_input(config, None, "include <Shapes/std.scad>\nbox(1);\n")
+    assert path.parent == tmp_path / "cache" / "sources" / "flat"
+    assert (tmp_path / "cache" / "sources" / path.name).exists()
+
+    roots = library_roots(config.libraries.paths)
+    files, unresolved = LIBRARY_INDEX.dependencies(path, roots)
+    assert not unresolved
+    names = sorted(item.path.name.split("-")[0] for item in files)
+    assert names == ["std", "util"]
+    flat_std = next(item.path for item in files if item.path.name.startswith("std-"))
+    text = flat_std.read_text(encoding="utf-8")
+    assert "module box(size)" in text and "include <" not in text.replace("// include <", "")
+    assert f'import("{(library / "Shapes" / "logo.stl").resolve().as_posix()}")' in text
+    assert LIBRARY_INDEX.undefined_calls(path, roots) == []
+    assert await resolve_scad_input(config, None, "include <Shapes/std.scad>\nbox(1);\n") == (path, digest)
+
+    std = library / "Shapes" / "std.scad"
+    std.write_text("include <shapes.scad>\nuse <util.scad>\nmodule plate() { cube([4, 4, 1]); }\n", encoding="utf-8")
+    os.utime(std, ns=(std.stat().st_atime_ns, std.stat().st_mtime_ns + 1_000_000))
+    reflattened = LIBRARY_INDEX.flatten(std, roots, tmp_path / "cache" / "libraries")
+    assert reflattened != flat_std and "module plate()" in reflattened.read_text(encoding="utf-8")
+
+
+def test_library_paths_setting(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Accept TOML lists and path-separated strings for libraries.paths."""
+    monkeypatch.chdir(tmp_path)
+    config_file = tmp_path / "scad-mcp.toml"
+    config_file.write_text('[libraries]\npaths = ["/opt/a", "~/b"]\n', encoding="utf-8")
+    config = load_config(config_file=str(config_file), environ={})
+    assert config.libraries.paths == (Path("/opt/a"), Path("~/b").expanduser())
+    config = load_config(environ={"SCAD_MCP_LIBRARIES_PATHS": os.pathsep.join(["/x", "/y"])})
+    assert config.libraries.paths == (Path("/x"), Path("/y"))
@@ -0,0 +1,286 @@
+"""Tests for STL loading and mesh comparison."""
+
+import asyncio
+from pathlib import Path
+import struct
+import zipfile
+
+import pytest
+
+from scad_mcp.config.models import AppConfig, CacheConfig, OpenScadConfig
+from scad_mcp.models import ConvertRequest, ExportOptions, OpenScadCapabilities
+from scad_mcp.openscad import converter
+from scad_mcp.tools import model_converter
+from scad_mcp.tools.mesh_diff import diff_meshes
+from scad_mcp.tools.model_converter import convert_model
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+from scad_mcp.mesh import load_stl, mesh_stats, surface_distance  # noqa: E402
+
+
+def cube_triangles(size: float, split: bool = False) -> list[tuple[tuple[float, float, float], ...]]:
+    """Return the outward-facing triangles of an axis-aligned cube.
+
+    With split, the first face is fanned around its centre into four
+    triangles instead of two, giving the same surface.
+    """
+    s = size
+    corners = [(x, y, z) for x in (0, s) for y in (0, s) for z in (0, s)]
+    faces = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    triangles = []
+    for index, (a, b, c, d) in enumerate(faces):
+        if split and index == 0:
+            quad = [corners[a], corners[b], corners[c], corners[d]]
+            centre = tuple(sum(axis) / 4 for axis in zip(*quad))
+            triangles.extend((quad[i], quad[(i + 1) % 4], centre) for i in range(4))
+            continue
+        triangles.append((corners[a], corners[b], corners[c]))
+        triangles.append((corners[a], corners[c], corners[d]))
+    return triangles
+
+
+def write_ascii_stl(path: Path, size: float) -> None:
+    lines = ["solid test"]
+    for triangle in cube_triangles(size):
+        lines.append("facet normal 0 0 0\nouter loop")
+        lines.extend(f"vertex {x} {y} {z}" for x, y, z in triangle)
+        lines.append("endloop\nendfacet")
+    lines.append("endsolid test")
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+
+def write_binary_stl(path: Path, size: float, split: bool = False) -> None:
+    triangles = cube_triangles(size, split)
+    data = bytearray(b"\0" * 80 + struct.pack("<I", len(triangles)))
+    for triangle in triangles:
+        data += struct.pack("<3f", 0, 0, 0)
+        for vertex in triangle:
+            data += struct.pack("<3f", *vertex)
+        data += b"\0\0"
+    path.write_bytes(bytes(data))
+
+
+def test_load_stl_ascii_and_binary(tmp_path: Path) -> None:
+    """Parse both STL encodings into the same triangles."""
+    write_ascii_stl(tmp_path / "ascii.stl", 2.0)
+    write_binary_stl(tmp_path / "binary.stl", 2.0)
+    ascii_mesh = load_stl(tmp_path / "ascii.stl")
+    binary_mesh = load_stl(tmp_path / "binary.stl")
+    assert ascii_mesh.shape == (12, 3, 3)
+    assert np.allclose(ascii_mesh, binary_mesh)
+
+
+def test_mesh_stats_and_distance(tmp_path: Path) -> None:
+    """Compute volume, bounding box, and surface distance of two cubes."""
+    write_binary_stl(tmp_path / "small.stl", 2.0)
+    write_binary_stl(tmp_path / "large.stl", 3.0)
+    small = load_stl(tmp_path / "small.stl")
+    large = load_stl(tmp_path / "large.stl")
+    stats = mesh_stats(small)
+    assert stats.triangles == 12
+    assert stats.volume == pytest.approx(8.0)
+    assert stats.bbox_max == (2.0, 2.0, 2.0)
+    same, _ = surface_distance(small, small, 500)
+    moved, _ = surface_distance(small, large, 500)
+    assert same == pytest.approx(0.0, abs=1e-12)
+    assert moved == pytest.approx(3 ** 0.5, rel=1e-6)
+
+
+@pytest.mark.asyncio
+async def test_diff_meshes_parameter_sets(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Export two parameter sets and report geometry deltas."""
+    config = AppConfig(
+        openscad=OpenScadConfig(path=Path("openscad")),
+        cache=CacheConfig(directory=tmp_path / "cache"),
+    )
+    exports: list[list[str]] = []
+
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        exports.append(command)
+        write_binary_stl(Path(command[2]), 3.0 if "size=3" in command else 2.0)
+        return 0, "ok", ""
+
+    monkeypatch.setattr(converter, "run_openscad", fake_run_openscad)
+    monkeypatch.setattr(model_converter, "find_openscad_executable", lambda _: Path("openscad"))
+
+    kwargs = dict(config=config, scad_source_a="cube(size);", defines_a={"size": 2}, sample_count=200)
+    result = await diff_meshes(**kwargs, defines_b={"size": 3})
+    assert result["changed"] is True
+    assert result["triangle_delta"] == 0
+    assert result["volume_delta"] == pytest.approx(19.0)
+    assert result["bbox_size_delta"] == pytest.approx([1.0, 1.0, 1.0])
+
+    again = await diff_meshes(**kwargs, defines_b={"size": 2})
+    assert again["cached_a"] is True
+    assert again["cached_b"] is True
+    assert again["changed"] is False
+    assert len(exports) == 2
+
+
+@pytest.mark.asyncio
+async def test_diff_meshes_ignores_retriangulation(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Treat the same surface with one face split into more triangles as unchanged."""
+    config = AppConfig(
+        openscad=OpenScadConfig(path=Path("openscad")),
+        cache=CacheConfig(directory=tmp_path / "cache"),
+    )
+
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        write_binary_stl(Path(command[2]), 2.0, split="split=true" in command)
+        return 0, "ok", ""
+
+    monkeypatch.setattr(converter, "run_openscad", fake_run_openscad)
+    monkeypatch.setattr(model_converter, "find_openscad_executable", lambda _: Path("openscad"))
+
+    result = await diff_meshes(config=config, scad_source_a="cube(2);", defines_b={"split": True}, sample_count=2000)
+    assert result["triangle_delta"] == 2
+    assert result["hausdorff_distance"] < 1e-9
+    assert result["changed"] is False
+
+
+@pytest.mark.asyncio
+async def test_diff_meshes_concurrent_inline_sources(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Export each inline source to its own mesh when comparisons overlap."""
+    config = AppConfig(
+        openscad=OpenScadConfig(path=Path("openscad")),
+        cache=CacheConfig(directory=tmp_path / "cache"),
+    )
+
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        source = Path(command[-1]).read_text(encoding="utf-8")
+        await asyncio.sleep(0)
+        write_binary_stl(Path(command[2]), 3.0 if "cube(3)" in source else 2.0)
+        return 0, "ok", ""
+
+    monkeypatch.setattr(converter, "run_openscad", fake_run_openscad)
+    monkeypatch.setattr(model_converter, "find_openscad_executable", lambda _: Path("openscad"))
+
+    small, large = await asyncio.gather(
+        diff_meshes(config=config, scad_source_a="cube(2);", sample_count=50),
+        diff_meshes(config=config, scad_source_a="cube(3);", sample_count=50),
+    )
+    assert small["mesh_a"] != large["mesh_a"]
+    assert small["volume_a"] == pytest.approx(8.0)
+    assert large["volume_a"] == pytest.approx(27.0)
+
+
+@pytest.mark.asyncio
+async def test_convert_scad_decimal_precision(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Write ASCII STL with fixed precision from a binary intermediate."""
+    scad_file = tmp_path / "model.scad"
+    scad_file.write_text("cube(2);", encoding="utf-8")
+    commands: list[list[str]] = []
+
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        commands.append(command)
+        write_binary_stl(Path(command[2]), 2.0)
+        return 0, "ok", ""
+
+    monkeypatch.setattr(converter, "run_openscad", fake_run_openscad)
+    request = ConvertRequest(
+        scad_file=scad_file,
+        output_file=tmp_path / "model.stl",
+        options=ExportOptions(stl_encoding="ascii", decimal_precision=3),
+    )
+    result = await converter.convert_scad(
+        request=request,
+        openscad_path=Path("openscad"),
+        capabilities=OpenScadCapabilities(export_format=True),
+    )
+    assert commands[0][-2:] == ["--export-format", "binstl"]
+    text = result.output_path.read_text(encoding="ascii")
+    assert "vertex 2.000 2.000 0.000" in text
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["model.scad", "model.stl"]
+
+
+@pytest.mark.asyncio
+async def test_convert_model_transcodes_cached_mesh(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Write 3MF and OFF from a cached STL without re-running OpenSCAD."""
+    config = AppConfig(
+        openscad=OpenScadConfig(path=Path("openscad")),
+        cache=CacheConfig(directory=tmp_path / "cache"),
+    )
+    commands: list[list[str]] = []
+
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        commands.append(command)
+        write_binary_stl(Path(command[2]), 2.0)
+        return 0, "ok", ""
+
+    async def fake_probe(path: Path) -> OpenScadCapabilities:
+        return OpenScadCapabilities(export_format=True)
+
+    monkeypatch.setattr(converter, "run_openscad", fake_run_openscad)
+    monkeypatch.setattr(model_converter, "find_openscad_executable", lambda _: Path("openscad"))
+    monkeypatch.setattr(model_converter, "probe_capabilities", fake_probe)
+
+    source = "cube(2); // transcode"
+    stl = await convert_model(config=config, scad_file=None, output_format="stl", scad_source=source)
+    three_mf = await convert_model(config=config, scad_file=None, output_format="3mf", scad_source=source)
+    off = await convert_model(config=config, scad_file=None, output_format="off", scad_source=source)
+
+    assert len(commands) == 1
+    assert three_mf["transcoded_from"] == stl["output_path"]
+    with zipfile.ZipFile(three_mf["output_path"]) as package:
+        model = package.read("3D/3dmodel.model").decode("utf-8")
+    assert model.count("<vertex ") == 8
+    assert model.count("<triangle ") == 12
+    assert Path(off["output_path"]).read_text(encoding="ascii").startswith("OFF\n8 12 0\n")
+    with pytest.raises(ValueError, match="STL encoding"):
+        await convert_model(config=config, scad_file=None, output_format="off", scad_source=source, stl_encoding="ascii")
+    with pytest.raises(ValueError, match="Compression"):
+        await convert_model(config=config, scad_file=None, output_format="stl", scad_source=source, compression=6)
+
+
+@pytest.mark.asyncio
+async def test_convert_model_formats_single_evaluation(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Export STL, 3MF and a PNG thumbnail with one CSG evaluation."""
+    from scad_mcp.openscad import renderer
+    from scad_mcp.tools.model_converter import convert_model_formats
+
+    scad_file = tmp_path / "part.scad"
+    scad_file.write_text("cube(2);", encoding="utf-8")
+    config = AppConfig(
+        openscad=OpenScadConfig(path=Path("openscad")),
+        cache=CacheConfig(directory=tmp_path / "cache"),
+    )
+    commands: list[list[str]] = []
+
+    async def fake_export(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        commands.append(command)
+        write_binary_stl(Path(command[2]), 2.0)
+        return 0, "ok", ""
+
+    async def fake_render(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        commands.append(command)
+        Path(command[2]).write_bytes(b"png")
+        return 0, "ok", ""
+
+    async def fake_probe(path: Path) -> OpenScadCapabilities:
+        return OpenScadCapabilities()
+
+    monkeypatch.setattr(converter, "run_openscad", fake_export)
+    monkeypatch.setattr(renderer, "run_openscad", fake_render)
+    monkeypatch.setattr(model_converter, "find_openscad_executable", lambda _: Path("openscad"))
+    monkeypatch.setattr(model_converter, "probe_capabilities", fake_probe)
+
+    result = await convert_model_formats(
+        config=config,
+        scad_file=str(scad_file),
+        output_formats=["stl", "3mf", "png"],
+        compression=9,
+    )
+
+    outputs = result["outputs"]
+    assert outputs == {fmt: str(tmp_path / f"part.{fmt}") for fmt in ("stl", "3mf", "png")}
+    assert result["mesh_path"] == outputs["stl"]
+    assert result["evaluated"] is True
+    assert len(commands) == 2
+    assert "--render" not in commands[1]
+    wrapper = Path(commands[1][3])
+    assert wrapper.name == "part.scad" and wrapper.parent != tmp_path
+    with zipfile.ZipFile(outputs["3mf"]) as package:
+        assert package.read("3D/3dmodel.model").count(b"<triangle ") == 12
+    assert Path(outputs["png"]).read_bytes() == b"png"
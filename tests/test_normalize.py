@@ -0,0 +1,74 @@
+"""Tests for deterministic output normalization."""
+
+import struct
+from pathlib import Path
+import zipfile
+import zlib
+
+import pytest
+
+from scad_mcp.mesh import write_3mf
+from scad_mcp.normalize import ZIP_EPOCH, normalize_output, normalize_png
+
+
+def png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data))
+
+
+def make_png(stamp: bytes) -> bytes:
+    header = png_chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 0, 0, 0, 0))
+    pixels = png_chunk(b"IDAT", zlib.compress(b"\x00\x80"))
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        header,
+        png_chunk(b"tIME", stamp),
+        png_chunk(b"tEXt", b"Creation Time\x00" + stamp),
+        pixels,
+        png_chunk(b"IEND", b""),
+    ])
+
+
+def test_normalize_png_strips_timestamps(tmp_path: Path) -> None:
+    """Renders made at different times end up byte-identical."""
+    first, second = tmp_path / "a.png", tmp_path / "b.png"
+    first.write_bytes(make_png(b"\x07\xea\x01\x01\x00\x00\x00"))
+    second.write_bytes(make_png(b"\x07\xea\x0a\x13\x0c\x22\x01"))
+    normalize_output(first)
+    normalize_output(second)
+    assert first.read_bytes() == second.read_bytes()
+    assert b"tIME" not in first.read_bytes() and b"tEXt" not in first.read_bytes()
+    assert b"IDAT" in first.read_bytes()
+    assert normalize_png(first) is False
+
+
+def test_normalize_3mf_fixes_order_and_timestamps(tmp_path: Path) -> None:
+    """Zip packages written in any order at any time normalize identically."""
+    entries = {"3D/3dmodel.model": "<model/>", "[Content_Types].xml": "<Types/>", "_rels/.rels": "<Relationships/>"}
+    first, second = tmp_path / "a.3mf", tmp_path / "b.3mf"
+    for path, names, stamp in [
+        (first, list(entries), (2024, 1, 2, 3, 4, 6)),
+        (second, sorted(entries, reverse=True), (2026, 10, 19, 12, 0, 0)),
+    ]:
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+            for name in names:
+                package.writestr(zipfile.ZipInfo(name, date_time=stamp), entries[name])
+    normalize_output(first)
+    normalize_output(second, compression=9)
+    normalize_output(first, compression=9)
+    assert first.read_bytes() == second.read_bytes()
+    with zipfile.ZipFile(first) as package:
+        infos = package.infolist()
+    assert infos[0].filename == "[Content_Types].xml"
+    assert {info.date_time for info in infos} == {ZIP_EPOCH}
+
+
+def test_write_3mf_is_deterministic(tmp_path: Path) -> None:
+    """Writing the same mesh twice gives the same bytes."""
+    np = pytest.importorskip("numpy")
+    triangles = np.array([[[0, 0, 0], [1, 0, 0], [0, 1, 0]]], dtype=np.float32)
+    first, second = tmp_path / "a.3mf", tmp_path / "b.3mf"
+    write_3mf(first, [("part", triangles)], compression=6)
+    write_3mf(second, [("part", triangles)], compression=6)
+    assert first.read_bytes() == second.read_bytes()
+    with zipfile.ZipFile(first) as package:
+        assert {info.date_time for info in package.infolist()} == {ZIP_EPOCH}
@@ -1,14 +1,16 @@
 """Renderer tests for OpenSCAD integration."""
 
+import math
 from pathlib import Path
 
 import pytest
 
-from scad_mcp.config.models import AppConfig, LoggingConfig, OpenScadConfig, RenderConfig, ServerConfig
+from scad_mcp.config.models import AppConfig, CacheConfig, LoggingConfig, OpenScadConfig, RenderConfig, ServerConfig
 from scad_mcp.models import RenderRequest
 from scad_mcp.openscad import renderer
 from scad_mcp.tools import model_renderer
 from scad_mcp.tools.model_renderer import render_model
+from scad_mcp.tools.render_diff import diff_renders
 
 
 @pytest.mark.asyncio
@@ -25,7 +27,7 @@ async def test_render_scad_happy_path(tmp_path: Path, monkeypatch: pytest.Monkey
         output_dir=output_dir,
     )
 
-    async def fake_run_openscad(command: list[str]) -> tuple[int, str, str]:
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
         Path(command[2]).write_text("image", encoding="utf-8")
         return 0, "ok", ""
 
@@ -85,3 +87,332 @@ async def test_render_model_tool(tmp_path: Path, monkeypatch: pytest.MonkeyPatch
         output_dir=None,
     )
     assert result["image_path"].endswith("demo.png")
+
+
+@pytest.mark.asyncio
+async def test_render_model_inline_source_cached(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Render inline source once and serve identical sources from the cache."""
+    config = AppConfig(
+        openscad=OpenScadConfig(path=Path("openscad")),
+        render=RenderConfig(output_dir=tmp_path / "renders"),
+        cache=CacheConfig(directory=tmp_path / "cache"),
+    )
+    calls: list[Path] = []
+
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        calls.append(Path(command[3]))
+        Path(command[2]).write_text("image", encoding="utf-8")
+        return 0, "ok", ""
+
+    monkeypatch.setattr(renderer, "run_openscad", fake_run_openscad)
+    monkeypatch.setattr(model_renderer, "find_openscad_executable", lambda _: Path("openscad"))
+
+    kwargs = dict(config=config, scad_file=None, projection=None, fov=None, angles=["top"], output_dir=None)
+    first = await render_model(**kwargs, scad_source="cube(3);")
+    second = await render_model(**kwargs, scad_source="cube(3);")
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["image_path"] == first["image_path"]
+    assert len(calls) == 1
+    assert calls[0].parent == tmp_path / "cache" / "sources"
+
+    # Equivalent camera specs hash to the same entry.
+    iso = await render_model(**{**kwargs, "angles": ["right", "top", "front"]}, scad_source="sphere(2);")
+    preset = await render_model(**{**kwargs, "angles": []}, scad_source="sphere(2);", view="isometric")
+    orbit = await render_model(**kwargs, scad_source="sphere(2);", azimuth=-315.0, elevation=35.2644)
+    assert iso["cached"] is False and preset["cached"] is True and orbit["cached"] is True
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_render_model_concurrent_sizes_use_own_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Write concurrent renders that differ only in image settings to separate files."""
+    import asyncio
+
+    from scad_mcp.models import BoundingBox
+
+    config = AppConfig(
+        openscad=OpenScadConfig(path=Path("openscad")),
+        render=RenderConfig(output_dir=tmp_path / "renders"),
+        cache=CacheConfig(directory=tmp_path / "cache"),
+    )
+
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        size = next(arg for arg in command if arg.startswith("--imgsize="))
+        await asyncio.sleep(0)
+        Path(command[2]).write_text(size, encoding="utf-8")
+        return 0, "ok", ""
+
+    monkeypatch.setattr(renderer, "run_openscad", fake_run_openscad)
+    monkeypatch.setattr(model_renderer, "find_openscad_executable", lambda _: Path("openscad"))
+
+    kwargs = dict(
+        config=config, scad_file=None, projection=None, fov=None, angles=None, output_dir=None,
+        scad_source="cube(3);", quality="draft",
+    )
+    small, large, framed = await asyncio.gather(
+        render_model(**kwargs, img_width=40, img_height=30),
+        render_model(**kwargs, img_width=80, img_height=60),
+        render_model(**kwargs, img_width=40, img_height=30, framing="bbox",
+                     bounds=BoundingBox(minimum=(0.0, 0.0, 0.0), maximum=(3.0, 3.0, 3.0))),
+    )
+    assert len({small["image_path"], large["image_path"], framed["image_path"]}) == 3
+    assert Path(small["image_path"]).read_text(encoding="utf-8") == "--imgsize=40,30"
+    assert Path(large["image_path"]).read_text(encoding="utf-8") == "--imgsize=80,60"
+
+
+def test_output_name_with_defines() -> None:
+    """Distinguish parameter sets in output names and pass them with -D."""
+    base = renderer.output_name(Path("demo.scad"), "perspective", 45.0, ["front"], {})
+    first = renderer.output_name(Path("demo.scad"), "perspective", 45.0, ["front"], {"width": 10})
+    second = renderer.output_name(Path("demo.scad"), "perspective", 45.0, ["front"], {"width": 12})
+    assert base == "demo_perspective_fov45_front.png"
+    assert len({base, first, second}) == 3
+    assert renderer.define_args({"width": 10, "label": "a", "hollow": True}) == [
+        "-D", "hollow=true", "-D", 'label="a"', "-D", "width=10",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_render_model_full_size_png_uses_compress_level(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Re-encode a full-size PNG copy at the configured compression level."""
+    image_module = pytest.importorskip("PIL.Image")
+    config = AppConfig(
+        openscad=OpenScadConfig(path=Path("openscad")),
+        render=RenderConfig(output_dir=tmp_path / "renders", png_compress_level=0),
+        cache=CacheConfig(directory=tmp_path / "cache"),
+    )
+
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        image_module.new("RGB", (64, 48), (255, 255, 255)).save(command[2], compress_level=9)
+        return 0, "ok", ""
+
+    monkeypatch.setattr(renderer, "run_openscad", fake_run_openscad)
+    monkeypatch.setattr(model_renderer, "find_openscad_executable", lambda _: Path("openscad"))
+
+    result = await render_model(
+        config=config, scad_file=None, projection=None, fov=None, angles=["top"], output_dir=None,
+        scad_source="cube(1);", image_format="png",
+    )
+    encoded = Path(str(result["encoded_path"]))
+    assert encoded.name.endswith(".full.z0.png")
+    assert encoded.stat().st_size > Path(str(result["image_path"])).stat().st_size
+    with image_module.open(encoded) as image:
+        assert image.size == (64, 48)
+
+
+def fake_scene(monkeypatch: pytest.MonkeyPatch, image_module: object) -> list[list[str]]:
+    """Stub OpenSCAD with cubes whose edge is the size define, or 2 for scaled sources.
+
+    Renders draw the cube as a square sized by its distance from the camera;
+    with --viewall the cube is refitted to the same size, as OpenSCAD does.
+    """
+    import json
+
+    from scad_mcp.models import OpenScadCapabilities
+    from scad_mcp.openscad import camera
+
+    renders: list[list[str]] = []
+
+    def edge(command: list[str]) -> float:
+        if "scale(2)" in Path(command[3]).read_text(encoding="utf-8"):
+            return 2.0
+        return float(next((arg.split("=")[1] for arg in command if arg.startswith("size=")), 1))
+
+    async def fake_probe_run(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        summary = {"geometry": {"bounding_box": {"min": [0, 0, 0], "max": [edge(command)] * 3}}}
+        Path(command[command.index("--summary-file") + 1]).write_text(json.dumps(summary), encoding="utf-8")
+        return 0, "", ""
+
+    async def fake_render_run(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        renders.append(command)
+        if "--viewall" in command:
+            side = 24
+        else:
+            values = [float(value) for value in next(
+                arg for arg in command if arg.startswith("--camera=")
+            ).removeprefix("--camera=").split(",")]
+            side = round(60 * edge(command) / math.dist(values[:3], values[3:]))
+        image = image_module.new("RGB", (64, 48), (255, 255, 255))
+        image.paste((0, 0, 0), (0, 0, side, side))
+        image.save(command[2])
+        return 0, "ok", ""
+
+    async def fake_capabilities(path: Path) -> OpenScadCapabilities:
+        return OpenScadCapabilities(summary=True)
+
+    monkeypatch.setattr(camera, "run_openscad", fake_probe_run)
+    monkeypatch.setattr(renderer, "run_openscad", fake_render_run)
+    monkeypatch.setattr(model_renderer, "find_openscad_executable", lambda _: Path("openscad"))
+    monkeypatch.setattr(model_renderer, "probe_capabilities", fake_capabilities)
+    return renders
+
+
+@pytest.mark.asyncio
+async def test_diff_renders_parameter_sets(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Compare two parameter sets of one source rendered with the same camera."""
+    image_module = pytest.importorskip("PIL.Image")
+    pytest.importorskip("numpy")
+    config = AppConfig(
+        openscad=OpenScadConfig(path=Path("openscad")),
+        render=RenderConfig(output_dir=tmp_path / "renders"),
+        cache=CacheConfig(directory=tmp_path / "cache"),
+    )
+    renders = fake_scene(monkeypatch, image_module)
+
+    result = await diff_renders(
+        config=config,
+        scad_source_a="cube(size);",
+        defines_a={"size": 1},
+        defines_b={"size": 2},
+    )
+    cameras = [next(arg for arg in command if arg.startswith("--camera=")) for command in renders]
+    assert len(cameras) == 2 and cameras[0] == cameras[1]
+    assert result["changed"] is True
+    assert Path(str(result["heatmap_path"])).exists()
+
+
+@pytest.mark.asyncio
+async def test_diff_renders_detects_scaled_copy(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Frame both variants around their combined bounds so a pure scale is a change."""
+    image_module = pytest.importorskip("PIL.Image")
+    pytest.importorskip("numpy")
+    config = AppConfig(
+        openscad=OpenScadConfig(path=Path("openscad")),
+        render=RenderConfig(output_dir=tmp_path / "renders"),
+        cache=CacheConfig(directory=tmp_path / "cache"),
+    )
+    renders = fake_scene(monkeypatch, image_module)
+
+    result = await diff_renders(config=config, scad_source_a="cube(1);", scad_source_b="scale(2) cube(1);")
+    assert not any("--viewall" in command for command in renders)
+    assert result["changed"] is True
+    assert result["bbox"][2] > result["bbox"][0]
+
+
+def test_orbit_camera_and_name() -> None:
+    """Place orbit cameras by azimuth and elevation and name renders after them."""
+    assert renderer.orbit_camera(0.0, 0.0, 45.0) == "0,-155,0,0,0,0"
+    assert renderer.orbit_camera(90.0, 0.0, 45.0).startswith("155,")
+    assert renderer.orbit_camera(0.0, 90.0, 45.0) == "0,0,155,0,0,0"
+    name = renderer.output_name(Path("demo.scad"), "perspective", 45.0, ["front"], orbit=(45.0, 30.0))
+    assert name == "demo_perspective_fov45_az45_el30.png"
+
+
+def test_canonical_views_and_framed_camera() -> None:
+    """Map equivalent views to one orbit and frame a bounding box."""
+    from scad_mcp.models import BoundingBox
+    from scad_mcp.openscad import camera
+
+    isometric = camera.canonical_orbit(*camera.VIEW_PRESETS["isometric"])
+    assert camera.canonical_orbit(*camera.orbit_from_angles(["top", "front", "right"])) == isometric
+    assert camera.canonical_orbit(*camera.orbit_from_angles(["left"])) == (270.0, 0.0)
+    assert camera.canonical_orbit(-90.0, 0.0) == (270.0, 0.0)
+    assert camera.canonical_orbit(123.0, 90.0) == (0.0, 90.0)
+
+    bounds = BoundingBox(minimum=(0.0, 0.0, 0.0), maximum=(10.0, 10.0, 10.0))
+    values = [float(value) for value in camera.framed_camera(0.0, 0.0, bounds).split(",")]
+    assert values[3:] == [5.0, 5.0, 5.0]
+    assert values[0] == 5.0 and values[2] == 5.0
+    # The bounding sphere just fits OpenSCAD's default 22.5 degree lens, with the margin.
+    radius = math.dist(bounds.minimum, bounds.maximum) / 2
+    expected = radius * camera.FRAME_MARGIN / math.sin(math.radians(22.5) / 2)
+    assert 5.0 - values[1] == pytest.approx(expected, abs=1e-5)
+    narrow = [float(value) for value in camera.framed_camera(0.0, 0.0, bounds, aspect=0.5).split(",")]
+    assert narrow[1] < values[1]
+
+
+@pytest.mark.asyncio
+async def test_model_bounds_tracks_library_edits(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Re-probe a file's bounds when a library it uses changes, and only then."""
+    import json
+
+    from scad_mcp.models import OpenScadCapabilities
+    from scad_mcp.openscad import camera
+    from scad_mcp.tools.model_renderer import model_bounds
+
+    library = tmp_path / "lib.scad"
+    library.write_text("module part() cube(2);\n", encoding="utf-8")
+    scad_file = tmp_path / "part.scad"
+    scad_file.write_text("use <lib.scad>\npart();\n", encoding="utf-8")
+    config = AppConfig(openscad=OpenScadConfig(path=Path("openscad")), cache=CacheConfig(directory=tmp_path / "cache"))
+    probes: list[list[str]] = []
+
+    async def fake_probe_run(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        probes.append(command)
+        # The box grows with the library, so a stale entry would be visible.
+        edge = len(library.read_text(encoding="utf-8"))
+        summary = {"geometry": {"bounding_box": {"min": [0, 0, 0], "max": [edge] * 3}}}
+        Path(command[command.index("--summary-file") + 1]).write_text(json.dumps(summary), encoding="utf-8")
+        return 0, "", ""
+
+    async def fake_capabilities(path: Path) -> OpenScadCapabilities:
+        return OpenScadCapabilities(summary=True)
+
+    monkeypatch.setattr(camera, "run_openscad", fake_probe_run)
+    monkeypatch.setattr(model_renderer, "find_openscad_executable", lambda _: Path("openscad"))
+    monkeypatch.setattr(model_renderer, "probe_capabilities", fake_capabilities)
+
+    first = await model_bounds(config, str(scad_file))
+    assert await model_bounds(config, str(scad_file)) == first
+    assert len(probes) == 1
+    library.write_text("module part() cube([20, 20, 20]);\n", encoding="utf-8")
+    edited = await model_bounds(config, str(scad_file))
+    assert len(probes) == 2
+    assert edited.maximum[0] > first.maximum[0]
+
+
+@pytest.mark.asyncio
+async def test_render_model_bbox_framing_probes_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Share one bounding box probe across views and skip OpenSCAD's framing passes."""
+    import asyncio
+    import json
+
+    from scad_mcp.execution import WORKER_POOL
+    from scad_mcp.models import OpenScadCapabilities
+    from scad_mcp.openscad import camera
+
+    scad_file = tmp_path / "box.scad"
+    scad_file.write_text("cube([4, 2, 1]);", encoding="utf-8")
+    config = AppConfig(
+        openscad=OpenScadConfig(path=Path("openscad")),
+        render=RenderConfig(output_dir=tmp_path / "renders", framing="bbox"),
+        cache=CacheConfig(directory=tmp_path / "cache"),
+    )
+    probes: list[list[str]] = []
+    renders: list[list[str]] = []
+
+    async def fake_probe_run(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        probes.append(command)
+        await asyncio.sleep(0.01)
+        summary = {"geometry": {"bounding_box": {"min": [0, 0, 0], "max": [4, 2, 1]}}}
+        Path(command[command.index("--summary-file") + 1]).write_text(json.dumps(summary), encoding="utf-8")
+        return 0, "", ""
+
+    async def fake_render_run(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        renders.append(command)
+        Path(command[2]).write_text("image", encoding="utf-8")
+        return 0, "", ""
+
+    async def fake_capabilities(path: Path) -> OpenScadCapabilities:
+        return OpenScadCapabilities(summary=True)
+
+    monkeypatch.setattr(camera, "run_openscad", fake_probe_run)
+    monkeypatch.setattr(renderer, "run_openscad", fake_render_run)
+    monkeypatch.setattr(model_renderer, "find_openscad_executable", lambda _: Path("openscad"))
+    monkeypatch.setattr(model_renderer, "probe_capabilities", fake_capabilities)
+    view = dict(config=config, scad_file=str(scad_file), projection=None, fov=None, output_dir=None)
+    WORKER_POOL.resize(3)
+    try:
+        await asyncio.gather(
+            render_model(**view, angles=["front"]),
+            render_model(**view, angles=["top"]),
+            render_model(**view, angles=[], view="isometric"),
+        )
+    finally:
+        WORKER_POOL.resize(1)
+
+    assert len(probes) == 1 and len(renders) == 3
+    assert all("--autocenter" not in command and "--viewall" not in command for command in renders)
+    cameras = [next(arg for arg in command if arg.startswith("--camera=")) for command in renders]
+    assert all(value.endswith(",2,1,0.5") for value in cameras)
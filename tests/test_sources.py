@@ -0,0 +1,71 @@
+"""Tests for inline source storage and the result cache."""
+
+from pathlib import Path
+
+import pytest
+
+from scad_mcp.cache import CacheEntry, ResultCache
+from scad_mcp.config.models import AppConfig, CacheConfig
+from scad_mcp.sources import resolve_scad_input, store_source
+
+
+def test_store_source_is_content_addressed(tmp_path: Path) -> None:
+    """Identical sources map to one stored file."""
+    first = store_source("cube([1,1,1]);", tmp_path)
+    second = store_source("cube([1,1,1]);", tmp_path)
+    other = store_source("sphere(1);", tmp_path)
+    assert first == second
+    assert first != other
+    assert first.suffix == ".scad"
+    assert first.read_text(encoding="utf-8") == "cube([1,1,1]);"
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+@pytest.mark.asyncio
+async def test_resolve_scad_input(tmp_path: Path) -> None:
+    """Resolve inline sources into the cache directory and pass paths through."""
+    config = AppConfig(cache=CacheConfig(directory=tmp_path))
+    path, digest = await resolve_scad_input(config, None, "cube(2);")
+    assert path.parent == tmp_path / "sources"
+    assert digest == path.stem
+    assert await resolve_scad_input(config, "model.scad", None) == (Path("model.scad"), None)
+
+
+@pytest.mark.asyncio
+async def test_resolve_scad_input_requires_one_input(tmp_path: Path) -> None:
+    """Reject missing, duplicate, and empty inputs."""
+    config = AppConfig(cache=CacheConfig(directory=tmp_path))
+    with pytest.raises(ValueError):
+        await resolve_scad_input(config, None, None)
+    with pytest.raises(ValueError):
+        await resolve_scad_input(config, "model.scad", "cube(1);")
+    with pytest.raises(ValueError):
+        await resolve_scad_input(config, None, "   ")
+
+
+def test_result_cache_eviction(tmp_path: Path) -> None:
+    """Evict least recently used entries and drop entries whose artifact is gone."""
+    cache = ResultCache(max_entries=2)
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"{index}.png"
+        path.write_text("image", encoding="utf-8")
+        paths.append(path)
+        cache.put(cache.key("render", index), CacheEntry(path=path, command=["openscad"]))
+    assert cache.get(cache.key("render", 0)) is None
+    assert cache.get(cache.key("render", 2)).path == paths[2]
+    paths[1].unlink()
+    assert cache.get(cache.key("render", 1)) is None
+
+
+def test_result_cache_drops_overwritten_paths(tmp_path: Path) -> None:
+    """Forget a request whose artifact path was rewritten by another request."""
+    cache = ResultCache()
+    path = tmp_path / "model.stl"
+    path.write_text("solid", encoding="utf-8")
+    cache.put(cache.key("convert", "ascii"), CacheEntry(path=path, command=["openscad", "asciistl"]))
+    cache.put(cache.key("mesh", "ascii"), CacheEntry(path=path, command=["openscad", "asciistl"]))
+    cache.put(cache.key("convert", "binary"), CacheEntry(path=path, command=["openscad", "binstl"]))
+    assert cache.get(cache.key("convert", "ascii")) is None
+    assert cache.get(cache.key("mesh", "ascii")) is None
+    assert cache.get(cache.key("convert", "binary")) is not None
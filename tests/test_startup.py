@@ -0,0 +1,120 @@
+"""Startup time budget for the stdio MCP server."""
+
+import asyncio
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+import time
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+# Self time of scad_mcp modules while importing the server, in microseconds.
+# The MCP SDK itself is excluded; it dominates and is outside our control.
+IMPORT_BUDGET_US = 150_000
+# Wall time from spawning the stdio server to its initialize response.
+COLD_START_BUDGET_SECONDS = 5.0
+# Modules that must only load on first tool use.
+DEFERRED_MODULES = {
+    "numpy",
+    "PIL",
+    "scipy",
+    "sqlite3",
+    "tomllib",
+    "scad_mcp.imaging",
+    "scad_mcp.mesh",
+    "scad_mcp.normalize",
+    "scad_mcp.openscad",
+    "scad_mcp.tools.model_renderer",
+    "scad_mcp.tools.model_converter",
+    "scad_mcp.tools.render_diff",
+    "scad_mcp.tools.mesh_diff",
+    "scad_mcp.tools.assembly_export",
+    "scad_mcp.tools.backend_benchmark",
+    "scad_mcp.tools.job_history",
+    "scad_mcp.tools.animation",
+    "scad_mcp.tools.library_index",
+    "scad_mcp.assembly",
+    "scad_mcp.libraries",
+}
+
+
+def server_env() -> dict[str, str]:
+    env = {name: value for name, value in os.environ.items() if not name.startswith("SCAD_MCP_")}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    return env
+
+
+def test_server_import_time(tmp_path: Path) -> None:
+    """Keep heavy modules out of the server import and its own cost within budget."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import scad_mcp.server"],
+        cwd=tmp_path,
+        env=server_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported: dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        imported[name.strip()] = int(self_us)
+
+    top_level = {name.split(".")[0] for name in imported}
+    loaded_early = {name for name in DEFERRED_MODULES if name in imported or name in top_level}
+    assert not loaded_early
+    own_time = sum(us for name, us in imported.items() if name.startswith("scad_mcp"))
+    assert own_time < IMPORT_BUDGET_US
+
+
+async def initialize(cwd: Path, *args: str) -> tuple[dict, float]:
+    """Start the stdio server and return its initialize response and the time it took."""
+    request = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "startup-test", "version": "0"},
+        },
+    }
+    started = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "scad_mcp.server", *args,
+        cwd=cwd,
+        env=server_env(),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        process.stdin.write((json.dumps(request) + "\n").encode("utf-8"))
+        await process.stdin.drain()
+        line = await asyncio.wait_for(process.stdout.readline(), COLD_START_BUDGET_SECONDS * 2)
+        elapsed = time.perf_counter() - started
+    finally:
+        process.kill()
+        await process.wait()
+    return json.loads(line), elapsed
+
+
+@pytest.mark.asyncio
+async def test_stdio_cold_start(tmp_path: Path) -> None:
+    """Answer the MCP initialize request within the cold start budget."""
+    response, elapsed = await initialize(tmp_path)
+    assert response["id"] == 1
+    assert response["result"]["serverInfo"]["name"] == "scad-mcp"
+    assert elapsed < COLD_START_BUDGET_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_stdio_reports_configured_name(tmp_path: Path) -> None:
+    """Report the configured server name to clients."""
+    response, _ = await initialize(tmp_path, "--set", "server.name=custom-scad")
+    assert response["result"]["serverInfo"]["name"] == "custom-scad"
@@ -4,10 +4,14 @@ from pathlib import Path
 import pytest
 
 from scad_mcp.validation import (
+    parse_cpu_list,
     validate_angles,
     validate_fov,
+    validate_image_format,
+    validate_ionice,
     validate_projection,
     validate_scad_file,
+    validate_thumbnail_size,
 )
 
 def test_validate_scad_file_requires_scad_extension(tmp_path: Path) -> None:
@@ -71,3 +75,24 @@ def test_validate_angles_empty() -> None:
     """Reject empty angle lists."""
     with pytest.raises(ValueError):
         validate_angles([])
+
+def test_validate_image_options() -> None:
+    """Validate encoded image format and thumbnail size."""
+    validate_image_format("webp")
+    validate_thumbnail_size(512)
+    with pytest.raises(ValueError):
+        validate_image_format("jpeg")
+    with pytest.raises(ValueError):
+        validate_thumbnail_size(0)
+
+def test_parse_cpu_list_and_ionice() -> None:
+    """Parse Linux CPU lists and accept supported I/O classes."""
+    assert parse_cpu_list("0-3, 8,2") == (0, 1, 2, 3, 8)
+    for bad in ["", "3-1", "a", "1-"]:
+        with pytest.raises(ValueError):
+            parse_cpu_list(bad)
+    for value in ["none", "idle", "best-effort", "best-effort:7"]:
+        validate_ionice(value)
+    for bad in ["realtime:0", "best-effort:8", "idle:3"]:
+        with pytest.raises(ValueError):
+            validate_ionice(bad)
@@ -0,0 +1,84 @@
+"""Tests for scratch workspaces and artifact promotion."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from scad_mcp import workspace
+from scad_mcp.models import ConvertRequest
+from scad_mcp.openscad import converter
+from scad_mcp.workspace import job_workspace, partial_file, promote
+
+
+def test_job_workspace_is_isolated_and_removed(tmp_path: Path) -> None:
+    """Give each job its own directory and delete it afterwards."""
+    with job_workspace(tmp_path) as first, job_workspace(tmp_path) as second:
+        assert first != second
+        (first / "wrapper.scad").write_text("cube(1);", encoding="utf-8")
+    assert not first.exists()
+    assert not second.exists()
+
+
+def test_promote_across_filesystems(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fall back to copy-then-rename when a plain rename crosses devices."""
+    source = tmp_path / "scratch" / "model.stl"
+    source.parent.mkdir()
+    source.write_text("solid", encoding="utf-8")
+    target = tmp_path / "out" / "model.stl"
+    real_replace = os.replace
+    calls: list[Path] = []
+
+    def replace(src: Path, dst: Path) -> None:
+        calls.append(Path(src))
+        if Path(src) == source:
+            raise OSError(18, "Invalid cross-device link")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(workspace.os, "replace", replace)
+    assert promote(source, target) == target
+    assert target.read_text(encoding="utf-8") == "solid"
+    assert not source.exists()
+    assert len(calls) == 2
+    assert list(target.parent.iterdir()) == [target]
+
+
+def test_partial_file_is_unique_and_cleaned_up(tmp_path: Path) -> None:
+    """Give concurrent writers separate temporary files and drop them on failure."""
+    target = tmp_path / "model.stl"
+    with partial_file(target) as first, partial_file(target) as second:
+        assert first != second and first.parent == second.parent == tmp_path
+        first.write_text("first", encoding="utf-8")
+        second.write_text("second", encoding="utf-8")
+    assert target.read_text(encoding="utf-8") == "first"
+    with pytest.raises(RuntimeError):
+        with partial_file(target) as partial:
+            partial.write_text("broken", encoding="utf-8")
+            raise RuntimeError("writer failed")
+    assert target.read_text(encoding="utf-8") == "first"
+    assert list(tmp_path.iterdir()) == [target]
+
+
+@pytest.mark.asyncio
+async def test_convert_scad_writes_through_scratch(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Export into the job workspace and move only the finished file."""
+    scad_file = tmp_path / "model.scad"
+    scad_file.write_text("cube(1);", encoding="utf-8")
+    output_file = tmp_path / "out" / "model.stl"
+    written: list[Path] = []
+
+    async def fake_run_openscad(command: list[str], **kwargs: object) -> tuple[int, str, str]:
+        written.append(Path(command[2]))
+        Path(command[2]).write_text("stl data", encoding="utf-8")
+        return 0, "ok", ""
+
+    monkeypatch.setattr(converter, "run_openscad", fake_run_openscad)
+    with job_workspace(tmp_path / "scratch") as scratch:
+        result = await converter.convert_scad(
+            request=ConvertRequest(scad_file=scad_file, output_file=output_file),
+            openscad_path=Path("openscad"),
+            scratch_dir=scratch,
+        )
+        assert written[0].parent == scratch
+    assert result.output_path == output_file
+    assert output_file.read_text(encoding="utf-8") == "stl data"